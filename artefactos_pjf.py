@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Artefactos del catálogo federal (PJF) para la app web de docs/
+
+A partir de docs/data/pjf_catalogos_completos.json se generan en docs/data/pjf/
+(fetch_catalogos_pjf.py actualiza primero los tipos de asunto de esa fuente
+con el crawl y después llama a generar()):
+
+- indice.<huella>.json: todos los órganos en forma compacta (filas y tablas de
+  circuitos, tipos de órgano y estados); es lo que la app necesita para los
+  selects y la búsqueda por nombre.
+- tipos.<huella>.json: tipos de asunto por tipo de órgano (unión ya hecha).
+- circuito-<n>.<huella>.json: registros completos de los órganos de un circuito.
+- Variantes .gz (y .br si está instalado el paquete brotli) de cada archivo,
+  para servidores que sirven archivos precomprimidos (gzip_static / brotli_static).
+  Sin brotli, los .br que ya existen se conservan en lugar de borrarse.
+- manifest.json: nombres vigentes, tamaños y huellas.
+
+Los nombres llevan la huella del contenido, así que se pueden cachear sin
+fecha de caducidad; solo manifest.json debe revalidarse. Un archivo que ya
+existe no se reescribe y los que dejan de aparecer en el manifiesto se borran.
+
+Uso:
+    python3 artefactos_pjf.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+from catalogo_pjf import CatalogoPJF
+from persistencia import escribir_bytes_atomico, escribir_bytes_si_cambia, serializar_json
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_ORIGEN = os.path.join(SCRIPT_DIR, 'docs', 'data', 'pjf_catalogos_completos.json')
+DIRECTORIO_DESTINO = os.path.join(SCRIPT_DIR, 'docs', 'data', 'pjf')
+MANIFIESTO = 'manifest.json'
+
+VERSION_FORMATO = 1
+CAMPOS_INDICE = ['id', 'nombre', 'circuitoId', 'tipoOrganismoId', 'estado', 'ciudad']
+
+
+def _serializar(data):
+    """JSON sin espacios (los artefactos no se leen a mano)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _huella(contenido):
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def _variantes(contenido):
+    """Versiones precomprimidas: extensión -> bytes (deterministas: sin fecha en gzip)"""
+    variantes = {'.gz': gzip.compress(contenido, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass  # Opcional: sin brotli solo se publica gzip
+    else:
+        variantes['.br'] = brotli.compress(contenido, quality=11)
+    return variantes
+
+
+def indice_compacto(organos):
+    """Órganos como filas (ver CAMPOS_INDICE) con los textos repetidos en tablas"""
+    circuitos = {}
+    tipos_organismo = {}
+    estados = []
+    posicion_estado = {}
+    filas = []
+    for o in sorted(organos, key=lambda o: o['id']):
+        circuitos.setdefault(str(o['circuitoId']), o.get('circuito') or '')
+        tipos_organismo.setdefault(str(o['tipoOrganismoId']), o.get('tipoOrganismo') or '')
+        estado = o.get('estado') or ''
+        if estado not in posicion_estado:
+            posicion_estado[estado] = len(estados)
+            estados.append(estado)
+        filas.append([o['id'], o['nombre'], o['circuitoId'], o['tipoOrganismoId'],
+                      posicion_estado[estado], o.get('ciudad') or ''])
+    return {
+        'campos': CAMPOS_INDICE,
+        'circuitos': circuitos,
+        'tiposOrganismo': tipos_organismo,
+        'estados': estados,
+        'organos': filas,
+    }
+
+
+def tipos_por_organo(tipos_organo, tipos_asunto):
+    """Una entrada por TipoOrganismoId con la unión de sus tipos de asunto"""
+    unidos = {}
+    for entrada in tipos_organo:
+        tid = entrada['TipoOrganismoId']
+        destino = unidos.setdefault(tid, {'TipoOrganismoId': tid, 'TipoOrganismo': entrada['TipoOrganismo'],
+                                          'tiposAsunto': []})
+        vistos = {t['id'] for t in destino['tiposAsunto']}
+        for t in entrada.get('tiposAsunto', []):
+            if t['id'] not in vistos:
+                destino['tiposAsunto'].append(t)
+                vistos.add(t['id'])
+    for destino in unidos.values():
+        destino['tiposAsunto'].sort(key=lambda t: t['id'])
+    return {'tiposAsunto': tipos_asunto, 'tiposOrgano': [unidos[tid] for tid in sorted(unidos)]}
+
+
+def _publicar(directorio, base, data, escritos):
+    """Escribe el artefacto `base`.<huella>.json y sus variantes si aún no existen"""
+    contenido = _serializar(data)
+    huella = _huella(contenido)
+    archivo = f'{base}.{huella[:12]}.json'
+    entrada = {'archivo': archivo, 'sha256': huella, 'bytes': len(contenido)}
+
+    ruta = os.path.join(directorio, archivo)
+    if not os.path.exists(ruta):
+        escribir_bytes_atomico(ruta, contenido)
+        escritos.append(archivo)
+    variantes = _variantes(contenido)
+    for extension, comprimido in variantes.items():
+        entrada[extension.lstrip('.')] = len(comprimido)
+        if not os.path.exists(ruta + extension):
+            escribir_bytes_atomico(ruta + extension, comprimido)
+            escritos.append(archivo + extension)
+    # Sin brotli instalado se conserva el .br ya publicado: el nombre lleva la
+    # huella del contenido, así que sigue correspondiendo a este archivo
+    if '.br' not in variantes and os.path.exists(ruta + '.br'):
+        entrada['br'] = os.path.getsize(ruta + '.br')
+    return entrada
+
+
+def _referenciados(manifiesto):
+    entradas = [manifiesto['indice'], manifiesto['tipos']] + list(manifiesto['circuitos'].values())
+    nombres = {MANIFIESTO}
+    for entrada in entradas:
+        nombres.add(entrada['archivo'])
+        nombres.update(entrada['archivo'] + '.' + ext for ext in ('gz', 'br') if ext in entrada)
+    return nombres
+
+
+def generar(origen=ARCHIVO_ORIGEN, destino=DIRECTORIO_DESTINO):
+    """
+    Genera los artefactos y el manifiesto
+
+    Returns:
+        (manifiesto, archivos escritos, archivos borrados)
+    """
+    with open(origen, 'rb') as f:
+        crudo = f.read()
+    datos = json.loads(crudo)
+    os.makedirs(destino, exist_ok=True)
+
+    escritos = []
+    # Mismo formato que lee catalogo_pjf.cargar(); los fragmentos llevan los registros completos
+    catalogo = CatalogoPJF(datos['organos'])
+
+    manifiesto = {
+        'version': VERSION_FORMATO,
+        'fuente_sha256': _huella(crudo),
+        'resumen': datos.get('resumen', {}),
+        'indice': _publicar(destino, 'indice', indice_compacto(datos['organos']), escritos),
+        'tipos': _publicar(destino, 'tipos', tipos_por_organo(datos['tiposOrgano'], datos['tiposAsunto']), escritos),
+        'circuitos': {
+            str(num): _publicar(destino, f'circuito-{num}',
+                                [catalogo.registros[o['id']] for o in sorted(organos, key=lambda o: o['id'])], escritos)
+            for num, organos in sorted(catalogo.por_circuito.items())
+        },
+    }
+    if escribir_bytes_si_cambia(os.path.join(destino, MANIFIESTO), serializar_json(manifiesto) + b'\n'):
+        escritos.append(MANIFIESTO)
+
+    vigentes = _referenciados(manifiesto)
+    borrados = []
+    for nombre in sorted(os.listdir(destino)):
+        if nombre not in vigentes and nombre.endswith(('.json', '.json.gz', '.json.br')):
+            os.remove(os.path.join(destino, nombre))
+            borrados.append(nombre)
+    return manifiesto, escritos, borrados
+
+
+def resumen(manifiesto, escritos, borrados):
+    completo = os.path.getsize(ARCHIVO_ORIGEN)
+    inicial = manifiesto['indice']['gz'] + manifiesto['tipos']['gz']
+    print(f"📦 Artefactos PJF: índice {manifiesto['indice']['bytes'] / 1024:.0f} KB, "
+          f"{len(manifiesto['circuitos'])} circuitos")
+    print(f"   Carga inicial (índice + tipos, gzip): {inicial / 1024:.0f} KB "
+          f"(antes {completo / 1024:.0f} KB sin comprimir)")
+    print(f"   {len(escritos)} archivos escritos, {len(borrados)} obsoletos borrados")
+
+
+def main():
+    resumen(*generar())
+
+
+if __name__ == '__main__':
+    main()
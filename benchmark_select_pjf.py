@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la extracción de <select id="ddlTipoAsunto">.
+
+Compara el análisis original (HTMLParser sobre la respuesta completa, con un
+dict de atributos por etiqueta) con la extracción por bloques de
+fetch_catalogos_pjf.extract_select_options, que se detiene al cerrar el
+<select>.
+
+Uso:
+    python3 benchmark_select_pjf.py --descargar 20        # Guarda 20 respuestas reales en bench_payloads/
+    python3 benchmark_select_pjf.py                       # Usa bench_payloads/ (o un HTML sintético si no hay)
+    python3 benchmark_select_pjf.py respuesta1.html ...   # Usa archivos concretos
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+from html.parser import HTMLParser
+
+import fetch_catalogos_pjf as pjf
+
+PAYLOAD_DIR = os.path.join(pjf.SCRIPT_DIR, 'bench_payloads')
+SELECT_ID = 'ddlTipoAsunto'
+
+
+class FullSelectParser(HTMLParser):
+    """El analizador original: recorre todo el documento"""
+    def __init__(self, select_id):
+        super().__init__()
+        self.target_id = select_id
+        self.in_target = False
+        self.in_option = False
+        self.current_value = None
+        self.current_text = ''
+        self.options = []
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == 'select' and a.get('id') == self.target_id:
+            self.in_target = True
+        elif tag == 'option' and self.in_target:
+            self.in_option = True
+            self.current_value = a.get('value', '')
+            self.current_text = ''
+
+    def handle_endtag(self, tag):
+        if tag == 'select' and self.in_target:
+            self.in_target = False
+        elif tag == 'option' and self.in_option:
+            self.in_option = False
+            v = self.current_value.strip() if self.current_value else ''
+            if v:
+                self.options.append({'id': int(v) if v.isdigit() else v, 'nombre': self.current_text.strip()})
+
+    def handle_data(self, data):
+        if self.in_option:
+            self.current_text += data
+
+
+def parse_full(html):
+    p = FullSelectParser(SELECT_ID)
+    p.feed(html)
+    return p.options
+
+
+def parse_chunks(html, chunk_size=pjf.CHUNK_SIZE):
+    return pjf.extract_select_options((html[i:i + chunk_size] for i in range(0, len(html), chunk_size)), SELECT_ID)
+
+
+def synthetic_payload():
+    """Formulario parecido a ObtenerDatosExpediente, para cuando no hay respuestas guardadas"""
+    def campos(desde, hasta):
+        return ''.join(
+            f'<div class="form-group col-md-4"><label for="c{i}">Campo {i}</label>'
+            f'<input type="text" class="form-control" id="c{i}" name="c{i}" data-val="true"></div>'
+            for i in range(desde, hasta)
+        )
+    opciones = ''.join(f'<option value="{i}">Tipo de asunto {i}</option>' for i in range(1, 40))
+    return (f'<div class="panel">{campos(0, 50)}'
+            f'<select class="form-control" id="{SELECT_ID}" name="IdTipoAsunto">'
+            f'<option value="">Seleccione</option>{opciones}</select>{campos(50, 200)}</div>')
+
+
+def download_payloads(n):
+    session = pjf.create_session(1)
+    os.makedirs(PAYLOAD_DIR, exist_ok=True)
+    for org in pjf.select_organos(pjf.obtener_catalogo_pjf(), max_samples=max(1, n // 6))[:n]:
+        resp = session.post(
+            pjf.PJF_BASE + pjf.DATOS_EXPEDIENTE,
+            data=f'IdOrgano={org["id"]}&IdTipoAsunto=1&IdTipoPropiedad=&IdSubNivel=&IdSubNivelInc=',
+            headers=pjf.HEADERS, timeout=30
+        )
+        resp.raise_for_status()
+        with open(os.path.join(PAYLOAD_DIR, f'organo_{org["id"]}.html'), 'w', encoding='utf-8') as f:
+            f.write(resp.text)
+        time.sleep(1 / pjf.RATE)
+    print(f'{n} respuestas guardadas en {PAYLOAD_DIR}')
+
+
+def measure(func, payloads, repeat):
+    """Mediana de microsegundos por respuesta"""
+    tiempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        for html in payloads:
+            func(html)
+        tiempos.append((time.perf_counter() - inicio) / len(payloads) * 1e6)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la extracción del <select> de tipos de asunto')
+    parser.add_argument('archivos', nargs='*', help='Respuestas HTML de ObtenerDatosExpediente')
+    parser.add_argument('--descargar', type=int, metavar='N', help='Descarga N respuestas reales a bench_payloads/')
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.descargar:
+        download_payloads(args.descargar)
+
+    archivos = args.archivos or sorted(glob.glob(os.path.join(PAYLOAD_DIR, '*.html')))
+    if archivos:
+        payloads = []
+        for ruta in archivos:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                payloads.append(f.read())
+        origen = f'{len(payloads)} respuestas reales'
+    else:
+        payloads = [synthetic_payload()]
+        origen = 'HTML sintético (usa --descargar N para respuestas reales)'
+
+    for html in payloads:
+        assert parse_full(html) == parse_chunks(html) == pjf.parse_select(html, SELECT_ID)
+
+    tam = statistics.mean(len(h) for h in payloads)
+    print(f'{origen}, {tam / 1024:.1f} KB en promedio, {args.repeticiones} repeticiones\n')
+    base = measure(parse_full, payloads, args.repeticiones)
+    for nombre, func in (('HTMLParser completo (original)', parse_full),
+                         ('parse_select (texto completo)', lambda h: pjf.parse_select(h, SELECT_ID)),
+                         (f'por bloques de {pjf.CHUNK_SIZE // 1024} KB', parse_chunks)):
+        us = base if func is parse_full else measure(func, payloads, args.repeticiones)
+        print(f'  {nombre:<32} {us:9.1f} µs/respuesta  ({base / us:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
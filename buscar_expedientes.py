@@ -16,126 +16,36 @@ VERSIÓN 6.2 - FIX CRÍTICO:
 - 🐛 FIX: Endpoint correcto para Salas (buscador_segunda.php + areaId)
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+# Selenium y openpyxl se importan solo donde se usan (navegador y Excel), para
+# que validar, listar juzgados o exportar CSV arranquen sin cargarlos
 import time
 import csv
 import json
 from datetime import datetime, timedelta
 import os
+import argparse
 import threading
+from collections import deque
+
+import estrados_http
+import navegador
+from catalogo_juzgados import obtener_catalogo
+from historial_resultados import HistorialResultados
+from planificador import HistorialBusquedas, interpretar_limite, planificar, preparar_lote
 
 class TSJExpedientesBot:
     
-    # IDs exactos del sistema TSJ (extraídos del sidebar.php)
-    JUZGADOS = {
-        # ===== CANCÚN =====
-        'JUZGADO PRIMERO FAMILIAR ORAL CANCUN': 109,
-        'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN': 158,
-        'JUZGADO SEGUNDO DE LO FAMILIAR CANCUN': 115,
-        'JUZGADO FAMILIAR DE PRIMERA INSTANCIA CANCUN': 114,
-        'JUZGADO PRIMERO CIVIL CANCUN': 111,
-        'JUZGADO SEGUNDO CIVIL CANCUN': 112,
-        'JUZGADO TERCERO CIVIL CANCUN': 113,
-        'JUZGADO CUARTO CIVIL CANCUN': 182,
-        'JUZGADO ORAL CIVIL CANCUN': 110,
-        'JUZGADO PRIMERO MERCANTIL CANCUN': 105,
-        'JUZGADO SEGUNDO MERCANTIL CANCUN': 106,
-        'JUZGADO TERCERO MERCANTIL CANCUN': 107,
-        'JUZGADO ORAL MERCANTIL CANCUN': 108,
-        'TRIBUNAL PRIMERO LABORAL CANCUN': 164,
-        'TRIBUNAL SEGUNDO LABORAL CANCUN': 165,
-        
-        # ===== PLAYA DEL CARMEN / SOLIDARIDAD =====
-        'JUZGADO FAMILIAR ORAL PLAYA': 88,
-        'JUZGADO FAMILIAR PRIMERA INSTANCIA PLAYA': 84,
-        'JUZGADO PRIMERO CIVIL PLAYA': 83,
-        'JUZGADO SEGUNDO CIVIL PLAYA': 161,
-        'JUZGADO ORAL CIVIL PLAYA': 87,
-        'JUZGADO MERCANTIL PLAYA': 85,
-        'TRIBUNAL LABORAL PLAYA': 166,
-        
-        # ===== CHETUMAL =====
-        'JUZGADO FAMILIAR ORAL CHETUMAL': 93,
-        'JUZGADO FAMILIAR PRIMERA INSTANCIA CHETUMAL': 94,
-        'JUZGADO CIVIL CHETUMAL': 95,
-        'JUZGADO MERCANTIL CHETUMAL': 96,
-        'JUZGADO CIVIL ORAL CHETUMAL': 97,
-        'TRIBUNAL LABORAL CHETUMAL': 163,
-        
-        # ===== COZUMEL =====
-        'JUZGADO FAMILIAR COZUMEL': 89,
-        'JUZGADO CIVIL COZUMEL': 90,
-        'JUZGADO FAMILIAR ORAL COZUMEL': 91,
-        'JUZGADO ORAL CIVIL COZUMEL': 92,
-        
-        # ===== FELIPE CARRILLO PUERTO =====
-        'JUZGADO CIVIL ORAL CARRILLO PUERTO': 136,
-        'JUZGADO FAMILIAR ORAL CARRILLO PUERTO': 137,
-        'JUZGADO CIVIL PRIMERA INSTANCIA CARRILLO PUERTO': 153,
-        'JUZGADO FAMILIAR PRIMERA INSTANCIA CARRILLO PUERTO': 154,
-        
-        # ===== ISLA MUJERES =====
-        'JUZGADO CIVIL ORAL ISLA MUJERES': 131,
-        'JUZGADO FAMILIAR ORAL ISLA MUJERES': 132,
-        
-        # ===== TULUM =====
-        'JUZGADO CIVIL ORAL TULUM': 144,
-        'JUZGADO FAMILIAR ORAL TULUM': 145,
-        
-        # ===== BACALAR =====
-        'JUZGADO FAMILIAR PRIMERA INSTANCIA BACALAR': 188,
-
-        # ===== SALAS DE SEGUNDA INSTANCIA =====
-        # IDs obtenidos del sistema de estrados electrónicos TSJ QRoo
-        'PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR': 170,
-        'SEGUNDA SALA PENAL ORAL': 171,
-        'TERCERA SALA PENAL ORAL': 173,
-        'CUARTA SALA CIVIL MERCANTIL Y FAMILIAR': 183,
-        'QUINTA SALA CIVIL MERCANTIL Y FAMILIAR': 175,
-        'SEXTA SALA CIVIL MERCANTIL Y FAMILIAR': 176,
-        'SEPTIMA SALA PENAL TRADICIONAL': 177,
-        'OCTAVA SALA PENAL ORAL': 178,
-        'NOVENA SALA PENAL ORAL': 179,
-        'DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA': 172,
-        'SALA CONSTITUCIONAL': 184,
-
-        # Salas históricas y especializadas (opcionales)
-        'SALA CONSTITUCIONAL HISTORICO': 143,
-        'SALA CONSTITUCIONAL SISTEMA CARA': 129,
-        '1A SALA ESPECIALIZADA CIVIL Y MERCANTIL': 101,
-        '2A SALA ESPECIALIZADA FAMILIAR Y FAMILIAR ORAL': 103,
-        '3A SALA ESPECIALIZADA PENAL TRADICIONAL': 102,
-        '4A SALA ESPECIALIZADA PENAL ORAL': 142,
-        '7A SALA ESPECIALIZADA FAMILIAR Y FAMILIAR ORAL': 117,
-        '8A SALA ESPECIALIZADA PENAL': 116
-    }
+    # IDs exactos del sistema TSJ (extraídos del sidebar.php), desde el catálogo
+    # compilado (fuente: catalogo_juzgados_tsj.csv, ver catalogo_juzgados.py)
+    JUZGADOS = obtener_catalogo().ids
 
     # Mapeo de IDs de Sala a areaId (para buscador_segunda.php)
     # Las Salas de Segunda Instancia requieren el parámetro areaId
-    AREA_IDS_SALAS = {
-        170: 145,  # PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR
-        171: 146,  # SEGUNDA SALA PENAL ORAL
-        172: 147,  # DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA
-        173: 148,  # TERCERA SALA PENAL ORAL
-        175: 150,  # QUINTA SALA CIVIL MERCANTIL Y FAMILIAR
-        176: 151,  # SEXTA SALA CIVIL MERCANTIL Y FAMILIAR
-        177: 152,  # SEPTIMA SALA PENAL TRADICIONAL
-        178: 153,  # OCTAVA SALA PENAL ORAL
-        179: 154,  # NOVENA SALA PENAL ORAL (confirmado del HAR)
-        183: 158,  # CUARTA SALA CIVIL MERCANTIL Y FAMILIAR
-        184: 159,  # SALA CONSTITUCIONAL
-    }
-
-    def __init__(self, max_pestanas=5, dias_acuerdos_nuevos=5):
-        self.base_url = "https://www.tsjqroo.gob.mx/estrados"
+    AREA_IDS_SALAS = obtener_catalogo().area_ids
+
+    def __init__(self, max_pestanas=5, dias_acuerdos_nuevos=5, arranque_rapido=True, limites_navegador=None,
+                 extraccion_red=True, sincronizar_catalogo=True):
+        self.base_url = estrados_http.BASE_URL
         self.driver = None
         self.resultados = []
         self.debug_mode = True
@@ -143,6 +53,19 @@ class TSJExpedientesBot:
         self.max_pestanas = max_pestanas  # Número máximo de pestañas simultáneas
         self.dias_acuerdos_nuevos = dias_acuerdos_nuevos  # Días para marcar como "nuevo"
         self.resultados_lock = threading.Lock()  # Para thread-safety
+        self.duraciones = []  # (expediente, segundos) de cada búsqueda completada
+        self.omitidos_por_plazo = []  # Expedientes no procesados al vencer el plazo
+        self.cancelado = threading.Event()  # Cancelación cooperativa (p. ej. desde la GUI)
+        self.al_completar = None  # Callback opcional (exp, resultado, hechos, total) por búsqueda
+        self.arranque_rapido = arranque_rapido  # Rutas de Chrome en caché + perfil persistente
+        self.perfil_persistente = False  # Si el navegador actual usa perfil_chrome/
+        self.cronometro = navegador.Cronometro()
+        self.salud = navegador.SaludNavegador(**(limites_navegador or {}))  # Reciclaje en sesiones largas
+        self.extraccion_red = extraccion_red  # Leer el HTML del registro de red en vez del DOM
+        self.captura = navegador.CapturaRed()
+        self.sincronizar_catalogo = sincronizar_catalogo  # Verificar IDs contra sidebar.php antes de buscar
+        self.correcciones_ids = {}  # ID del catálogo -> ID vigente en sidebar.php
+        self.ids_inexistentes = {}  # ID -> nombre de los que ya no aparecen en sidebar.php
 
         if self.debug_mode and not os.path.exists(self.screenshot_dir):
             os.makedirs(self.screenshot_dir)
@@ -176,14 +99,13 @@ class TSJExpedientesBot:
         if self.es_sala_segunda_instancia(id_juzgado):
             # Sala de Segunda Instancia - usar buscador_segunda.php
             area_id = self.AREA_IDS_SALAS[id_juzgado]
-            url = f"{self.base_url}/buscador_segunda.php?findexp={termino}&int={id_juzgado}&areaId={area_id}&metodo={metodo}"
             self.log(f"🏛️  Sala de 2ª Instancia detectada - usando buscador_segunda.php (areaId={area_id})", "DEBUG")
         else:
             # Primera Instancia - usar buscador_primera.php
-            url = f"{self.base_url}/buscador_primera.php?int={id_juzgado}&metodo={metodo}&findexp={termino}"
+            area_id = None
             self.log(f"📍 Juzgado de 1ª Instancia - usando buscador_primera.php", "DEBUG")
 
-        return url
+        return estrados_http.url_busqueda(id_juzgado, termino, metodo, area_id, base_url=self.base_url)
     
     def screenshot(self, nombre):
         if self.debug_mode and self.driver:
@@ -234,6 +156,66 @@ class TSJExpedientesBot:
             self.log(f"Error cargando expedientes: {e}", "ERROR")
             return []
 
+    def preparar_expedientes(self, expedientes):
+        """
+        Valida y deduplica el lote antes de abrir el navegador
+
+        Los juzgados se resuelven una sola vez y las búsquedas quedan agrupadas
+        por juzgado; las entradas inválidas se reportan aquí y no consumen pestañas.
+        """
+        validos, descartados, duplicados, avisos = preparar_lote(expedientes, self.obtener_id_juzgado)
+
+        if self.sincronizar_catalogo:
+            self.verificar_catalogo()
+        vigentes = []
+        for exp in validos:
+            if exp['id_juzgado'] in self.ids_inexistentes:
+                descartados.append((exp, f"ID {exp['id_juzgado']} ya no aparece en sidebar.php: {exp['juzgado']}"))
+                continue
+            exp['id_juzgado'] = self.correcciones_ids.get(exp['id_juzgado'], exp['id_juzgado'])
+            vigentes.append(exp)
+        validos = vigentes
+
+        self.log(f"📋 Lote preparado: {len(validos)} búsquedas válidas, "
+                 f"{duplicados} duplicados fusionados, {len(descartados)} descartados",
+                 "OK" if not descartados else "WARN")
+        for exp, motivo in descartados:
+            self.log(f"   ⏭️  {motivo} ({exp.get('comentario', exp.get('numero', exp.get('nombre', '')))})", "WARN")
+        for exp, motivo in avisos:
+            self.log(f"   ⚠️  {motivo} ({exp.get('comentario', exp['juzgado'])})", "WARN")
+
+        return validos
+
+    def verificar_catalogo(self):
+        """
+        Compara el catálogo con sidebar.php (copia de a lo más un día) y aplica
+        las diferencias a esta ejecución: IDs renumerados y areaId corregidos se
+        usan en las búsquedas, y los IDs inexistentes se descartan al preparar el lote
+
+        Para corregir el CSV de forma permanente: python3 sincronizar_catalogo.py --aplicar
+        """
+        import sincronizar_catalogo
+
+        organos, fecha = sincronizar_catalogo.obtener_sidebar()
+        if organos is None:
+            return
+        catalogo = obtener_catalogo()
+        diferencias = sincronizar_catalogo.comparar(catalogo, organos)
+        if diferencias is None:
+            self.log(f"sidebar.php ({fecha}) no tiene el formato esperado; se usa el catálogo sin verificar", "WARN")
+            return
+
+        self.correcciones_ids = diferencias['ids']
+        self.ids_inexistentes = diferencias['inexistentes']
+        # Copia propia: el mapeo de la clase es el del catálogo compartido
+        self.AREA_IDS_SALAS = sincronizar_catalogo.area_ids_vigentes(catalogo, diferencias)
+
+        if sincronizar_catalogo.hay_diferencias(diferencias):
+            self.log(f"El catálogo difiere de sidebar.php ({fecha}):", "WARN")
+            for linea in sincronizar_catalogo.describir(diferencias, catalogo):
+                self.log(f"   {linea}", "WARN")
+            self.log("   Corrígelo con: python3 sincronizar_catalogo.py --aplicar", "WARN")
+
     def es_acuerdo_nuevo(self, fecha_publicacion_str):
         """Determina si un acuerdo es nuevo (últimos N días)"""
         try:
@@ -257,9 +239,9 @@ class TSJExpedientesBot:
         except Exception as e:
             return False
     
-    def iniciar_navegador(self):
-        self.log("Iniciando navegador Chrome...")
-        
+    def opciones_chrome(self, perfil=None):
+        from selenium import webdriver
+
         opciones = webdriver.ChromeOptions()
         opciones.add_argument('--start-maximized')
         opciones.add_argument('--disable-notifications')
@@ -268,30 +250,67 @@ class TSJExpedientesBot:
         opciones.add_experimental_option("excludeSwitches", ["enable-automation"])
         opciones.add_experimental_option('useAutomationExtension', False)
         opciones.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        self.driver = webdriver.Chrome(options=opciones)
+        if perfil:
+            # Perfil propio del robot: su caché HTTP se conserva entre ejecuciones
+            opciones.add_argument(f'--user-data-dir={perfil}')
+            opciones.add_argument(f'--disk-cache-size={navegador.TAM_CACHE_DISCO}')
+        if self.extraccion_red:
+            navegador.activar_registro_red(opciones)
+        return opciones
+
+    def iniciar_navegador(self, medir=True):
+        self.log("Iniciando navegador Chrome...")
+        inicio = time.time()
+        if medir:
+            self.cronometro.iniciar()
+
+        self.perfil_persistente = False
+        if self.arranque_rapido:
+            try:
+                self.driver = navegador.crear_driver(self.opciones_chrome(navegador.DIRECTORIO_PERFIL), log=self.log)
+                self.perfil_persistente = True
+            except Exception as e:
+                # Perfil ocupado por otro Chrome del robot o dañado: seguir con uno temporal
+                self.log(f"No se pudo usar el perfil persistente ({e.__class__.__name__}), se usa uno temporal", "WARN")
+                self.driver = navegador.crear_driver(self.opciones_chrome(), log=self.log)
+        else:
+            self.driver = navegador.crear_driver(self.opciones_chrome(), usar_cache=False)
+
         self.driver.implicitly_wait(10)
-        self.log("Navegador iniciado", "OK")
-    
+        self.salud.reiniciar()
+        self.captura.reiniciar()
+        if medir:
+            self.cronometro.navegador_listo()
+        self.log(f"Navegador iniciado en {time.time() - inicio:.1f}s", "OK")
+
+    def abrir_pestanas(self, num_pestanas):
+        """Abre las pestañas que falten (las ya abiertas se reutilizan)"""
+        faltantes = num_pestanas - len(self.driver.window_handles)
+        if faltantes > 0:
+            self.log(f"Abriendo {faltantes} pestañas...")
+        for i in range(faltantes):
+            self.driver.execute_script("window.open('');")
+            time.sleep(0.5)
+
+    def reciclar_navegador(self, motivo, num_pestanas):
+        """Cierra Chrome y abre uno nuevo con las mismas pestañas"""
+        self.log(f"♻️  Reiniciando navegador ({motivo})", "WARN")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass  # Driver ya caído
+        self.driver = None
+        self.salud.reciclajes += 1
+        self.iniciar_navegador(medir=False)
+        self.abrir_pestanas(num_pestanas)
+
     def obtener_id_juzgado(self, nombre_juzgado):
-        """Obtiene el ID interno del juzgado"""
-        nombre_upper = nombre_juzgado.upper().strip()
-        
-        # Búsqueda exacta primero
-        for nombre, id_juzgado in self.JUZGADOS.items():
-            if nombre.upper() == nombre_upper:
-                return id_juzgado
-        
-        # Búsqueda parcial flexible
-        for nombre, id_juzgado in self.JUZGADOS.items():
-            nombre_norm = nombre.upper()
-            # Si coinciden las palabras clave principales
-            if all(palabra in nombre_norm for palabra in nombre_upper.split()[:3]):
-                return id_juzgado
-        
-        self.log(f"⚠️  Juzgado no encontrado: {nombre_juzgado}", "WARN")
-        return None
-    
+        """Obtiene el ID interno del juzgado (exacto sin acentos, o por palabras clave)"""
+        id_juzgado = obtener_catalogo().id_juzgado(nombre_juzgado)
+        if id_juzgado is None:
+            self.log(f"⚠️  Juzgado no encontrado: {nombre_juzgado}", "WARN")
+        return id_juzgado
+
     def buscar(self, termino, id_juzgado, metodo=1):
         """
         Realiza una búsqueda en el sistema
@@ -318,6 +337,8 @@ class TSJExpedientesBot:
     
     def extraer_resultados(self, busqueda, juzgado, tipo_busqueda="expediente", driver=None):
         """Extrae los resultados de la tabla de publicaciones"""
+        from selenium.webdriver.common.by import By
+
         if driver is None:
             driver = self.driver
 
@@ -328,19 +349,8 @@ class TSJExpedientesBot:
 
             # Verificar si no hay resultados
             page_source = driver.page_source
-            if "No se encontr" in page_source or "ningun resultado" in page_source.lower():
-                self.log(f"Sin publicaciones para: {busqueda}", "WARN")
-                resultado = {
-                    'busqueda': busqueda,
-                    'tipo_busqueda': tipo_busqueda,
-                    'juzgado': juzgado,
-                    'estado': 'Sin publicaciones',
-                    'fecha_busqueda': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'publicaciones': []
-                }
-                with self.resultados_lock:
-                    self.resultados.append(resultado)
-                return resultado
+            if estrados_http.sin_resultados(page_source):
+                return self.registrar_resultado(busqueda, juzgado, tipo_busqueda, [])
 
             # Buscar filas de la tabla (las filas de datos tienen clase 'odd' o 'even')
             filas = driver.find_elements(By.CSS_SELECTOR, "tr.odd, tr.even")
@@ -371,34 +381,59 @@ class TSJExpedientesBot:
                     self.log(f"Error en fila: {e}", "DEBUG")
                     continue
 
-            resultado = {
-                'busqueda': busqueda,
-                'tipo_busqueda': tipo_busqueda,
-                'juzgado': juzgado,
-                'estado': 'Con publicaciones' if publicaciones else 'Sin publicaciones',
-                'fecha_busqueda': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'publicaciones': publicaciones
-            }
-
-            with self.resultados_lock:
-                self.resultados.append(resultado)
-
-            nuevos = sum(1 for p in publicaciones if p.get('es_nuevo', False))
-            self.log(f"✅ Encontradas {len(publicaciones)} publicaciones ({nuevos} nuevas)", "OK")
-            return resultado
+            return self.registrar_resultado(busqueda, juzgado, tipo_busqueda, publicaciones)
 
         except Exception as e:
             self.log(f"Error extrayendo resultados: {e}", "ERROR")
             return None
+
+    def extraer_resultados_html(self, html, busqueda, juzgado, tipo_busqueda="expediente"):
+        """Extrae los resultados del HTML devuelto por el buscador (sin recorrer el DOM)"""
+        publicaciones = estrados_http.extraer_publicaciones(html)
+        for publicacion in publicaciones:
+            publicacion['es_nuevo'] = self.es_acuerdo_nuevo(publicacion['fecha_publicacion'])
+        return self.registrar_resultado(busqueda, juzgado, tipo_busqueda, publicaciones)
+
+    def registrar_resultado(self, busqueda, juzgado, tipo_busqueda, publicaciones):
+        """Arma el resultado de una búsqueda y lo agrega a self.resultados"""
+        if not publicaciones:
+            self.log(f"Sin publicaciones para: {busqueda}", "WARN")
+
+        resultado = {
+            'busqueda': busqueda,
+            'tipo_busqueda': tipo_busqueda,
+            'juzgado': juzgado,
+            'estado': 'Con publicaciones' if publicaciones else 'Sin publicaciones',
+            'fecha_busqueda': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'publicaciones': publicaciones
+        }
+
+        with self.resultados_lock:
+            self.resultados.append(resultado)
+
+        if publicaciones:
+            nuevos = sum(1 for p in publicaciones if p.get('es_nuevo', False))
+            self.log(f"✅ Encontradas {len(publicaciones)} publicaciones ({nuevos} nuevas)", "OK")
+        return resultado
     
     def procesar_expediente_en_pestana(self, exp, pestana_idx):
-        """Procesa un expediente en una pestaña específica del navegador"""
+        """Procesa un expediente en una pestaña específica del navegador (búsqueda y extracción)"""
+        pendiente = self.iniciar_busqueda(exp, pestana_idx)
+        return self.completar_busqueda(pendiente) if pendiente else None
+
+    def iniciar_busqueda(self, exp, pestana_idx):
+        """
+        Lanza la búsqueda de un expediente en una pestaña sin esperar a que cargue
+
+        Returns:
+            Datos de la búsqueda en curso para completar_busqueda(), o None si no se pudo lanzar
+        """
         try:
             termino = exp.get('numero', exp.get('nombre', 'N/A'))
             self.log(f"[Pestaña {pestana_idx}] Procesando: {termino}")
 
-            # Obtener ID del juzgado
-            id_juzgado = self.obtener_id_juzgado(exp['juzgado'])
+            # Obtener ID del juzgado (ya resuelto si el lote pasó por preparar_expedientes)
+            id_juzgado = exp.get('id_juzgado') or self.obtener_id_juzgado(exp['juzgado'])
             if not id_juzgado:
                 self.log(f"[Pestaña {pestana_idx}] Juzgado no encontrado: {exp['juzgado']}", "ERROR")
                 return None
@@ -419,30 +454,81 @@ class TSJExpedientesBot:
             # Construir URL correcta según tipo de juzgado (1ª o 2ª Instancia)
             url = self.construir_url_busqueda(id_juzgado, termino_busqueda, metodo)
 
-            # Cambiar a la pestaña correspondiente
+            # Cambiar a la pestaña correspondiente y lanzar la carga sin bloquear
             self.driver.switch_to.window(self.driver.window_handles[pestana_idx])
+            navegador.navegar_sin_esperar(self.driver, url)
 
-            # Realizar búsqueda
-            self.driver.get(url)
-            time.sleep(4)  # Esperar carga
+            return {
+                'pestana': pestana_idx,
+                'url': url,
+                'termino': termino,
+                'termino_busqueda': termino_busqueda,
+                'tipo_busqueda': tipo_busqueda,
+                'juzgado': exp['juzgado'],
+            }
 
-            # Extraer resultados
-            resultado = self.extraer_resultados(
-                termino_busqueda,
-                exp['juzgado'],
-                tipo_busqueda,
-                driver=self.driver
-            )
+        except Exception as e:
+            self.log(f"[Pestaña {pestana_idx}] Error: {e}", "ERROR")
+            return None
+
+    def completar_busqueda(self, pendiente):
+        """Espera a que cargue la búsqueda lanzada con iniciar_busqueda() y extrae sus resultados"""
+        pestana_idx = pendiente['pestana']
+        try:
+            self.driver.switch_to.window(self.driver.window_handles[pestana_idx])
+            if not navegador.esperar_carga(self.driver):
+                self.log(f"[Pestaña {pestana_idx}] La página no terminó de cargar: {pendiente['termino']}", "ERROR")
+                return None
 
-            self.log(f"[Pestaña {pestana_idx}] ✅ Completado: {termino}", "OK")
+            self.salud.registrar_pagina(self.driver)
+            primera = self.cronometro.busqueda_cargada()
+            if primera is not None:
+                self.log(f"⏱️  Tiempo hasta la primera búsqueda: {primera:.1f}s", "INFO")
+                navegador.registrar_medicion(self.cronometro.arranque, primera, self.perfil_persistente)
+
+            # Extracción por red: la página ya cargó, no hace falta esperar a que
+            # se pinte la tabla
+            html = self.captura.cuerpo(self.driver, pendiente['url']) if self.extraccion_red else None
+            if html is not None:
+                resultado = self.extraer_resultados_html(
+                    html, pendiente['termino_busqueda'], pendiente['juzgado'], pendiente['tipo_busqueda'])
+            else:
+                if self.extraccion_red:
+                    self.log(f"[Pestaña {pestana_idx}] Respuesta no capturada, se lee el DOM", "DEBUG")
+                time.sleep(4)  # Esperar carga
+                resultado = self.extraer_resultados(
+                    pendiente['termino_busqueda'],
+                    pendiente['juzgado'],
+                    pendiente['tipo_busqueda'],
+                    driver=self.driver
+                )
+
+            self.log(f"[Pestaña {pestana_idx}] ✅ Completado: {pendiente['termino']}", "OK")
             return resultado
 
         except Exception as e:
             self.log(f"[Pestaña {pestana_idx}] Error: {e}", "ERROR")
             return None
 
-    def procesar_expedientes(self, expedientes):
-        """Procesa expedientes en paralelo usando múltiples pestañas"""
+    def procesar_expedientes(self, expedientes, limite=None):
+        """
+        Procesa expedientes en paralelo usando múltiples pestañas
+
+        La navegación va en tubería: cada pestaña tiene siempre una búsqueda en
+        curso. Mientras se extrae la pestaña más antigua, las demás ya están
+        cargando, y en cuanto una termina se le asigna la siguiente búsqueda.
+
+        Args:
+            expedientes: Lista de expedientes a buscar
+            limite: Timestamp (time.time()) a partir del cual ya no se inician
+                    búsquedas; las pendientes quedan en self.omitidos_por_plazo
+
+        Si se activa self.cancelado, termina después de la búsqueda en curso y
+        devuelve lo completado hasta ese momento.
+
+        Returns:
+            Lista de tuplas (expediente, resultado); resultado es None si la búsqueda falló
+        """
         total = len(expedientes)
         self.log(f"\n{'='*60}")
         self.log(f"PROCESANDO {total} BÚSQUEDAS EN PARALELO")
@@ -451,39 +537,83 @@ class TSJExpedientesBot:
 
         if not expedientes:
             self.log("No hay expedientes para procesar", "WARN")
-            return
+            return []
 
-        # Abrir pestañas necesarias
+        # Abrir pestañas necesarias (las ya abiertas se reutilizan entre llamadas)
         num_pestanas = min(self.max_pestanas, total)
-        self.log(f"Abriendo {num_pestanas} pestañas...")
-
-        for i in range(num_pestanas - 1):  # -1 porque ya tenemos una pestaña abierta
-            self.driver.execute_script("window.open('');")
-            time.sleep(0.5)
-
+        self.abrir_pestanas(num_pestanas)
         self.log(f"✅ {num_pestanas} pestañas abiertas", "OK")
 
-        # Procesar expedientes en lotes
-        procesados = 0
-        lote_idx = 0
-
-        while procesados < total:
-            lote = expedientes[procesados:procesados + num_pestanas]
-            lote_size = len(lote)
-
-            self.log(f"\n--- LOTE {lote_idx + 1} ({lote_size} búsquedas) ---")
-
-            # Procesar cada expediente del lote en una pestaña diferente
-            for idx, exp in enumerate(lote):
-                self.procesar_expediente_en_pestana(exp, idx)
+        # Cola de trabajo: las búsquedas que fallan con un navegador degradado
+        # se vuelven a encolar (una vez) después de reiniciarlo
+        cola = deque(expedientes)
+        reintentados = set()
+        fallidos_recientes = []  # Fallos desde la última búsqueda exitosa
+        completados = []
+        terminados = set()  # Expedientes ya informados a al_completar (el progreso no retrocede al reencolar)
+        self.omitidos_por_plazo = []
+        en_curso = deque()  # (pestaña, expediente, búsqueda lanzada), en el orden en que se lanzaron
+        libres = deque(range(num_pestanas))
+        ultima = time.time()  # Fin de la última búsqueda completada
+
+        while cola or en_curso:
+            if self.cancelado.is_set():
+                self.log(f"⏹️  Búsqueda cancelada: {len(completados)}/{total} completadas", "WARN")
+                return completados
+            if cola and limite is not None and time.time() >= limite:
+                # Las que ya están cargando se terminan; las demás no se inician
+                self.omitidos_por_plazo = list(cola)
+                cola.clear()
+                self.log(f"⏰ Plazo agotado: {len(self.omitidos_por_plazo)} búsquedas sin iniciar", "WARN")
+
+            # El navegador se reinicia cuando no queda nada en curso; mientras
+            # tanto no se lanzan búsquedas nuevas
+            motivo = self.salud.necesita_reciclar()
+            if motivo and not en_curso:
+                self.reciclar_navegador(motivo, num_pestanas)
+                for exp in reversed(fallidos_recientes):
+                    if id(exp) not in reintentados:
+                        reintentados.add(id(exp))
+                        completados = [(e, r) for e, r in completados if e is not exp]
+                        cola.appendleft(exp)
+                fallidos_recientes = []
+                motivo = None
+
+            while not motivo and libres and cola:
+                pestana = libres.popleft()
+                exp = cola.popleft()
+                en_curso.append((pestana, exp, self.iniciar_busqueda(exp, pestana)))
+
+            if not en_curso:
+                continue
+
+            pestana, exp, pendiente = en_curso.popleft()
+            resultado = self.completar_busqueda(pendiente) if pendiente else None
+            libres.append(pestana)
+            if resultado is not None:
+                self.salud.registrar_exito()
+                fallidos_recientes = []
+                # Costo en tiempo de reloj: con la tubería, lo que tarda en salir
+                # cada resultado, no la latencia de su página
+                self.duraciones.append((exp, time.time() - ultima))
+            else:
+                self.salud.registrar_error()
+                fallidos_recientes.append(exp)
+            ultima = time.time()
+            completados.append((exp, resultado))
+            terminados.add(id(exp))
 
-            procesados += lote_size
-            lote_idx += 1
+            if self.al_completar:
+                self.al_completar(exp, resultado, len(terminados), total)
 
-            self.log(f"Progreso: {procesados}/{total} búsquedas completadas\n")
+            if len(completados) % num_pestanas == 0 or not (cola or en_curso):
+                self.log(f"Progreso: {len(terminados)}/{total} búsquedas completadas\n")
 
+        if self.omitidos_por_plazo:
+            return completados
         self.log(f"✅ Todas las búsquedas completadas", "OK")
-    
+        return completados
+
     def guardar_csv(self, archivo='resultados_expedientes.csv'):
         """Guarda resultados en CSV"""
         self.log(f"Guardando en {archivo}...")
@@ -530,6 +660,10 @@ class TSJExpedientesBot:
 
     def guardar_excel(self, archivo='resultados_expedientes.xlsx'):
         """Guarda resultados en Excel con formato y marcado de acuerdos nuevos"""
+        from openpyxl import Workbook
+        from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+        from openpyxl.utils import get_column_letter
+
         self.log(f"Generando archivo Excel: {archivo}...")
 
         wb = Workbook()
@@ -637,6 +771,18 @@ class TSJExpedientesBot:
 
         return total_nuevos
 
+    def contar_nuevos(self):
+        """Número de acuerdos nuevos en los resultados (sin generar el Excel)"""
+        return sum(1 for r in self.resultados for p in r['publicaciones'] if p.get('es_nuevo'))
+
+    def guardar_historial(self, archivo=None):
+        """Agrega los resultados de esta ejecución al historial paginado (visor de la GUI)"""
+        try:
+            historial = HistorialResultados(archivo) if archivo else HistorialResultados()
+            historial.agregar(self.resultados)
+        except Exception as e:
+            self.log(f"Error guardando historial de resultados: {e}", "ERROR")
+
     def resumen(self):
         """Muestra resumen de resultados"""
         print(f"\n{'='*60}")
@@ -679,11 +825,77 @@ def main():
     - max_pestanas: Número de pestañas simultáneas (default: 5)
     - dias_acuerdos_nuevos: Días para marcar como nuevo (default: 5)
 
+    USO:
+        python3 buscar_expedientes.py [archivo.json] [--vigilar] [--deadline HH:MM|45m] [--solo-csv]
+        python3 buscar_expedientes.py [archivo.json] --validar
+        python3 buscar_expedientes.py --listar-juzgados
+        python3 buscar_expedientes.py --historial [N]
+
+    --vigilar: Modo continuo; cada expediente se revisa con su propio intervalo
+               (30 min si tiene actividad reciente, hasta 24 h si está inactivo)
+    --deadline: Termina antes del plazo indicado; procesa primero los expedientes
+                de mayor 'prioridad' y los revisados hace más tiempo, y reporta
+                los que quedaron fuera
+    --solo-csv: Guarda solo el CSV (no requiere openpyxl)
+    --validar: Revisa expedientes.json (números, juzgados, duplicados) sin abrir el navegador
+    --listar-juzgados: Muestra los juzgados y salas del catálogo
+    --historial: Muestra los últimos N resultados guardados (default: 20)
+
     NUEVO EN v6.1:
     - ✅ 11 Salas de Segunda Instancia completamente configuradas
     - ✅ Soporte para apelaciones y recursos en Salas
     """
 
+    parser = argparse.ArgumentParser(description="Robot de Búsqueda Automática de Expedientes - TSJ QRoo")
+    parser.add_argument('archivo', nargs='?', default='expedientes.json',
+                        help="Archivo JSON con los expedientes (default: expedientes.json)")
+    parser.add_argument('--vigilar', action='store_true',
+                        help="Modo vigilancia: revisión continua con intervalos por expediente")
+    parser.add_argument('--deadline', metavar='PLAZO',
+                        help="Hora límite (HH:MM) o duración (45m, 1h30m) para terminar la ejecución")
+    parser.add_argument('--solo-csv', action='store_true',
+                        help="Guardar solo el CSV de resultados (sin Excel)")
+    parser.add_argument('--validar', action='store_true',
+                        help="Validar el archivo de expedientes sin abrir el navegador")
+    parser.add_argument('--listar-juzgados', action='store_true',
+                        help="Mostrar los juzgados y salas disponibles")
+    parser.add_argument('--historial', nargs='?', type=int, const=20, metavar='N',
+                        help="Mostrar los últimos N resultados guardados")
+    args = parser.parse_args()
+
+    # Rutas rápidas: no abren el navegador ni cargan Selenium/openpyxl
+    if args.listar_juzgados:
+        for grupo, nombres in obtener_catalogo().grupos:
+            print(f"\n{grupo}")
+            for nombre in nombres:
+                print(f"  {obtener_catalogo().ids[nombre]:>4}  {nombre}")
+        return
+
+    if args.historial is not None:
+        filas, _ = HistorialResultados().pagina(0, tam=args.historial)
+        if not filas:
+            print("No hay resultados guardados")
+        for fila in filas:
+            marca = "⭐" if fila['Nuevo'] else "  "
+            print(f"{marca} {fila['Fecha Consulta']:19} | {fila['Búsqueda']:15} | {fila['Juzgado'][:38]:38} | "
+                  f"{fila['Fecha Publicación']:10} | {fila['Documento'][:40]}")
+        return
+
+    if args.validar:
+        # Misma verificación del catálogo que una ejecución normal (sidebar.php, sin navegador)
+        config = TSJExpedientesBot.cargar_configuracion('config.json')
+        bot = TSJExpedientesBot(sincronizar_catalogo=config.get('sincronizar_catalogo', True))
+        expedientes = bot.preparar_expedientes(bot.cargar_expedientes_json(args.archivo))
+        print(f"\n{len(expedientes)} búsquedas listas para ejecutar")
+        return
+
+    limite = None
+    if args.deadline:
+        try:
+            limite = interpretar_limite(args.deadline)
+        except ValueError as e:
+            parser.error(str(e))
+
     print("=" * 70)
     print("🤖 Robot de Búsqueda Automática de Expedientes v6.1")
     print("    TSJ Quintana Roo - Lista Electrónica")
@@ -700,15 +912,33 @@ def main():
     print(f"   - Días para marcar como nuevo: {dias_nuevos}")
     print("")
 
-    bot = TSJExpedientesBot(max_pestanas=max_pestanas, dias_acuerdos_nuevos=dias_nuevos)
+    bot = TSJExpedientesBot(max_pestanas=max_pestanas, dias_acuerdos_nuevos=dias_nuevos,
+                            arranque_rapido=config.get('arranque_rapido', True),
+                            limites_navegador=navegador.limites_desde_config(config),
+                            extraccion_red=config.get('extraccion_red', True),
+                            sincronizar_catalogo=config.get('sincronizar_catalogo', True))
+
+    if args.vigilar:
+        from vigilancia import ProgramadorVigilancia, vigilar
+
+        programador = ProgramadorVigilancia(
+            intervalo_min=config.get('vigilancia_intervalo_min_minutos', 30) * 60,
+            intervalo_max=config.get('vigilancia_intervalo_max_horas', 24) * 3600
+        )
+        try:
+            bot.iniciar_navegador()
+            vigilar(bot, args.archivo, programador)
+        finally:
+            bot.cerrar()
+        return
 
     try:
         # Intentar cargar expedientes desde JSON
-        expedientes = bot.cargar_expedientes_json('expedientes.json')
+        expedientes = bot.cargar_expedientes_json(args.archivo)
 
         # Si no hay archivo JSON, usar expedientes por defecto
         if not expedientes:
-            print("\n⚠️  No se encontró 'expedientes.json', usando expedientes por defecto...")
+            print(f"\n⚠️  No se encontró '{args.archivo}', usando expedientes por defecto...")
             expedientes = [
                 # ===== JUZGADO SEGUNDO FAMILIAR ORAL CANCÚN =====
                 {'numero': '2358/2025', 'juzgado': 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'},
@@ -724,21 +954,52 @@ def main():
                 {'nombre': 'samanta', 'juzgado': 'JUZGADO FAMILIAR ORAL PLAYA'},
             ]
 
+        expedientes = bot.preparar_expedientes(expedientes)
+
+        historial = HistorialBusquedas()
+        omitidos = []
+        if limite is not None:
+            disponible = (limite - datetime.now()).total_seconds()
+            expedientes, omitidos = planificar(expedientes, historial, disponible)
+            print(f"⏰ Plazo: {limite.strftime('%H:%M')} ({disponible / 60:.0f} min disponibles)")
+            print(f"   - Búsquedas planificadas: {len(expedientes)}")
+            print(f"   - Omitidas por falta de tiempo: {len(omitidos)}\n")
+
         # Iniciar navegador y procesar
+        inicio = time.time()
         bot.iniciar_navegador()
-        bot.procesar_expedientes(expedientes)
+        historial.registrar_arranque(time.time() - inicio)
+        bot.procesar_expedientes(expedientes, limite=limite.timestamp() if limite else None)
+
+        for exp, duracion in bot.duraciones:
+            historial.registrar(exp, duracion)
+        historial.guardar()
+
         bot.resumen()
+        omitidos += bot.omitidos_por_plazo
+        if omitidos:
+            print(f"\n⏰ EXPEDIENTES OMITIDOS POR PLAZO ({len(omitidos)}):")
+            for exp in omitidos:
+                termino = exp.get('numero', exp.get('nombre', 'N/A'))
+                print(f"  ⏭️  {termino:15} | {exp.get('juzgado', 'N/A')}")
 
         # Guardar resultados en Excel
-        total_nuevos = bot.guardar_excel('resultados_expedientes.xlsx')
+        if args.solo_csv:
+            total_nuevos = bot.contar_nuevos()
+        else:
+            total_nuevos = bot.guardar_excel('resultados_expedientes.xlsx')
 
         # También guardar CSV como respaldo
         bot.guardar_csv('resultados_expedientes.csv')
 
+        # Acumular en el historial que consulta el visor de resultados de la GUI
+        bot.guardar_historial()
+
         print(f"\n{'='*70}")
         print(f"✅ PROCESO COMPLETADO")
         print(f"{'='*70}")
-        print(f"📊 Archivo Excel: resultados_expedientes.xlsx")
+        if not args.solo_csv:
+            print(f"📊 Archivo Excel: resultados_expedientes.xlsx")
         print(f"📄 Archivo CSV: resultados_expedientes.csv")
         print(f"⭐ Acuerdos nuevos (últimos {dias_nuevos} días): {total_nuevos}")
         print(f"{'='*70}")
@@ -3,10 +3,29 @@
 """
 Buscador Múltiple de Expedientes
 Busca un expediente en múltiples juzgados/salas automáticamente
+
+Flujo:
+1. Sondeo concurrente por HTTP en todos los juzgados de la categoría
+   (solo verifica si hay filas, sin extraer publicaciones)
+2. Opcionalmente se cancelan los sondeos pendientes al primer hallazgo
+3. Extracción completa con el bot únicamente en los juzgados con resultados
+
+Los juzgados se sondean en orden de probabilidad de acierto, aprendida de
+búsquedas anteriores (ver estadisticas_juzgados.py).
 """
 
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import estrados_http
+from catalogo_juzgados import obtener_catalogo
+from estadisticas_juzgados import EstadisticasJuzgados
+
+# Categorías de juzgados para la búsqueda múltiple (columna busqueda_multiple del catálogo)
+CATEGORIAS = obtener_catalogo().categorias
+
 
 def buscar_expediente_multiple(numero_expediente, categoria_juzgados):
     """
@@ -17,64 +36,11 @@ def buscar_expediente_multiple(numero_expediente, categoria_juzgados):
         categoria_juzgados: "PENAL", "CIVIL", "FAMILIAR", "MERCANTIL", "TODAS_SALAS"
     """
 
-    categorias = {
-        "PENAL": [
-            "SEGUNDA SALA PENAL ORAL",
-            "TERCERA SALA PENAL ORAL",
-            "SEPTIMA SALA PENAL TRADICIONAL",
-            "OCTAVA SALA PENAL ORAL",
-            "NOVENA SALA PENAL ORAL"
-        ],
-        "CIVIL": [
-            "JUZGADO PRIMERO CIVIL CANCUN",
-            "JUZGADO SEGUNDO CIVIL CANCUN",
-            "JUZGADO TERCERO CIVIL CANCUN",
-            "JUZGADO CUARTO CIVIL CANCUN",
-            "JUZGADO ORAL CIVIL CANCUN",
-            "JUZGADO PRIMERO CIVIL PLAYA",
-            "JUZGADO SEGUNDO CIVIL PLAYA",
-            "JUZGADO ORAL CIVIL PLAYA",
-            "JUZGADO CIVIL CHETUMAL",
-            "JUZGADO CIVIL ORAL CHETUMAL"
-        ],
-        "FAMILIAR": [
-            "JUZGADO PRIMERO FAMILIAR ORAL CANCUN",
-            "JUZGADO SEGUNDO FAMILIAR ORAL CANCUN",
-            "JUZGADO SEGUNDO DE LO FAMILIAR CANCUN",
-            "JUZGADO FAMILIAR DE PRIMERA INSTANCIA CANCUN",
-            "JUZGADO FAMILIAR ORAL PLAYA",
-            "JUZGADO FAMILIAR PRIMERA INSTANCIA PLAYA",
-            "JUZGADO FAMILIAR ORAL CHETUMAL",
-            "JUZGADO FAMILIAR PRIMERA INSTANCIA CHETUMAL"
-        ],
-        "MERCANTIL": [
-            "JUZGADO PRIMERO MERCANTIL CANCUN",
-            "JUZGADO SEGUNDO MERCANTIL CANCUN",
-            "JUZGADO TERCERO MERCANTIL CANCUN",
-            "JUZGADO ORAL MERCANTIL CANCUN",
-            "JUZGADO MERCANTIL PLAYA",
-            "JUZGADO MERCANTIL CHETUMAL"
-        ],
-        "TODAS_SALAS": [
-            "PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR",
-            "SEGUNDA SALA PENAL ORAL",
-            "TERCERA SALA PENAL ORAL",
-            "CUARTA SALA CIVIL MERCANTIL Y FAMILIAR",
-            "QUINTA SALA CIVIL MERCANTIL Y FAMILIAR",
-            "SEXTA SALA CIVIL MERCANTIL Y FAMILIAR",
-            "SEPTIMA SALA PENAL TRADICIONAL",
-            "OCTAVA SALA PENAL ORAL",
-            "NOVENA SALA PENAL ORAL",
-            "DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA",
-            "SALA CONSTITUCIONAL"
-        ]
-    }
-
-    if categoria_juzgados not in categorias:
-        print(f"❌ Categoría inválida. Usa: {', '.join(categorias.keys())}")
+    if categoria_juzgados not in CATEGORIAS:
+        print(f"❌ Categoría inválida. Usa: {', '.join(CATEGORIAS.keys())}")
         return
 
-    juzgados = categorias[categoria_juzgados]
+    juzgados = CATEGORIAS[categoria_juzgados]
 
     print(f"🔍 Buscando expediente {numero_expediente} en {len(juzgados)} ubicaciones")
     print(f"📋 Categoría: {categoria_juzgados}\n")
@@ -94,6 +60,147 @@ def buscar_expediente_multiple(numero_expediente, categoria_juzgados):
     print("\n💡 Después de ejecutar el bot, revisa el Excel para ver dónde aparece.")
 
 
+def sondear_juzgados(numero_expediente, juzgados, parar_al_encontrar=False, max_simultaneos=None):
+    """
+    Sondea en paralelo si el expediente tiene publicaciones en cada juzgado
+
+    Args:
+        numero_expediente: Número del expediente (ej: "615/2019")
+        juzgados: Lista de nombres de juzgados/salas
+        parar_al_encontrar: Si es True, cancela los sondeos restantes al primer hallazgo
+        max_simultaneos: Peticiones simultáneas (default: todas a la vez)
+
+    Returns:
+        dict juzgado -> True (hay publicaciones), False (no hay),
+        None (error o cancelado, no se pudo descartar)
+    """
+    catalogo = obtener_catalogo()
+    cancelado = threading.Event()
+    resultados = {juzgado: None for juzgado in juzgados}
+
+    urls = {}
+    for juzgado in juzgados:
+        id_juzgado = catalogo.ids.get(juzgado)
+        if id_juzgado is None:
+            print(f"   ⚠️  Juzgado no encontrado: {juzgado}")
+            continue
+        area_id = catalogo.area_id(id_juzgado)
+        urls[juzgado] = estrados_http.url_busqueda(id_juzgado, numero_expediente, 1, area_id)
+
+    with ThreadPoolExecutor(max_workers=max_simultaneos or max(len(urls), 1)) as executor:
+        futuros = {
+            executor.submit(estrados_http.sondear, url, cancelado=cancelado): juzgado
+            for juzgado, url in urls.items()
+        }
+
+        for futuro in as_completed(futuros):
+            juzgado = futuros[futuro]
+            if futuro.cancelled():
+                continue
+            try:
+                encontrado = futuro.result()
+            except Exception as e:
+                print(f"   ⚠️  {juzgado}: error en sondeo ({e})")
+                continue
+
+            resultados[juzgado] = encontrado
+            if encontrado:
+                print(f"   🎯 {juzgado}: CON publicaciones")
+                if parar_al_encontrar and not cancelado.is_set():
+                    cancelado.set()
+                    for f in futuros:
+                        f.cancel()
+            elif encontrado is False:
+                print(f"   ⚪ {juzgado}: sin publicaciones")
+
+    return resultados
+
+
+def ejecutar_busqueda_multiple(numero_expediente, categoria_juzgados, parar_al_encontrar=False, extraer=True):
+    """
+    Ejecuta la búsqueda múltiple: sondeo concurrente + extracción de aciertos
+
+    Args:
+        numero_expediente: Número del expediente (ej: "615/2019")
+        categoria_juzgados: "PENAL", "CIVIL", "FAMILIAR", "MERCANTIL", "TODAS_SALAS"
+        parar_al_encontrar: Cancela los sondeos pendientes al localizar el expediente
+        extraer: Si es True, extrae las publicaciones de los juzgados con aciertos
+
+    Returns:
+        Lista de juzgados donde se localizó el expediente
+    """
+    if categoria_juzgados not in CATEGORIAS:
+        print(f"❌ Categoría inválida. Usa: {', '.join(CATEGORIAS.keys())}")
+        return []
+
+    estadisticas = EstadisticasJuzgados()
+    juzgados = estadisticas.ordenar(numero_expediente, CATEGORIAS[categoria_juzgados])
+
+    # Con parada temprana, se sondea en una ventana deslizante en orden de
+    # probabilidad: los juzgados menos probables solo se consultan si hace falta
+    max_simultaneos = None
+    if parar_al_encontrar:
+        max_simultaneos = estadisticas.tam_oleada(numero_expediente, juzgados)
+
+    print(f"🔍 Sondeando expediente {numero_expediente} en {len(juzgados)} ubicaciones")
+    print(f"📋 Categoría: {categoria_juzgados}")
+    if max_simultaneos:
+        print(f"📈 Sondeos simultáneos: {max_simultaneos} (por probabilidad de acierto)")
+    print()
+
+    sondeos = sondear_juzgados(numero_expediente, juzgados, parar_al_encontrar, max_simultaneos)
+
+    for juzgado, encontrado in sondeos.items():
+        if encontrado is not None:
+            estadisticas.registrar(numero_expediente, juzgado, encontrado)
+    estadisticas.guardar()
+
+    aciertos = [j for j, encontrado in sondeos.items() if encontrado]
+    if not aciertos:
+        # Sin aciertos confirmados: no se pueden descartar los juzgados con error
+        # (sin aciertos tampoco hubo parada temprana, así que ninguno se canceló)
+        aciertos = [j for j, encontrado in sondeos.items() if encontrado is None]
+        if aciertos:
+            print(f"\n⚠️  {len(aciertos)} sondeos sin respuesta, se revisarán completos")
+
+    print(f"\n✅ Localizado en {sum(1 for v in sondeos.values() if v)} de {len(juzgados)} ubicaciones")
+
+    if not aciertos or not extraer:
+        return aciertos
+
+    import navegador
+    from buscar_expedientes import TSJExpedientesBot
+
+    config = TSJExpedientesBot.cargar_configuracion('config.json')
+    bot = TSJExpedientesBot(
+        max_pestanas=config.get('max_pestanas', 5),
+        dias_acuerdos_nuevos=config.get('dias_acuerdos_nuevos', 5),
+        arranque_rapido=config.get('arranque_rapido', True),
+        limites_navegador=navegador.limites_desde_config(config),
+        extraccion_red=config.get('extraccion_red', True),
+        sincronizar_catalogo=config.get('sincronizar_catalogo', True)
+    )
+    expedientes = [
+        {
+            "comentario": f"Búsqueda múltiple: {numero_expediente}",
+            "numero": numero_expediente,
+            "juzgado": juzgado
+        }
+        for juzgado in aciertos
+    ]
+
+    try:
+        bot.iniciar_navegador()
+        bot.procesar_expedientes(expedientes)
+        bot.resumen()
+        bot.guardar_excel('resultados_busqueda_multiple.xlsx')
+        bot.guardar_csv('resultados_busqueda_multiple.csv')
+    finally:
+        bot.cerrar()
+
+    return aciertos
+
+
 def main():
     print("=" * 70)
     print("🔍 Buscador Múltiple de Expedientes")
@@ -101,9 +208,12 @@ def main():
     print("=" * 70)
     print()
 
-    if len(sys.argv) < 3:
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    opciones = {a for a in sys.argv[1:] if a.startswith('--')}
+
+    if len(args) < 2:
         print("Uso:")
-        print("  python3 buscar_multiple.py <numero_expediente> <categoria>")
+        print("  python3 buscar_multiple.py <numero_expediente> <categoria> [opciones]")
         print()
         print("Categorías disponibles:")
         print("  PENAL          - Busca en todas las salas penales")
@@ -112,17 +222,30 @@ def main():
         print("  MERCANTIL      - Busca en todos los juzgados mercantiles")
         print("  TODAS_SALAS    - Busca en todas las salas de segunda instancia")
         print()
+        print("Opciones:")
+        print("  --parar        - Detiene los sondeos restantes al localizar el expediente")
+        print("  --sin-extraer  - Solo sondea, sin abrir Chrome para extraer publicaciones")
+        print("  --solo-json    - Solo imprime el JSON para pegar en expedientes.json")
+        print()
         print("Ejemplos:")
         print("  python3 buscar_multiple.py 615/2019 PENAL")
         print("  python3 buscar_multiple.py 2358/2025 FAMILIAR")
-        print("  python3 buscar_multiple.py 123/2024 TODAS_SALAS")
+        print("  python3 buscar_multiple.py 123/2024 TODAS_SALAS --parar")
         print()
         sys.exit(1)
 
-    numero = sys.argv[1]
-    categoria = sys.argv[2].upper()
-
-    buscar_expediente_multiple(numero, categoria)
+    numero = args[0]
+    categoria = args[1].upper()
+
+    if '--solo-json' in opciones:
+        buscar_expediente_multiple(numero, categoria)
+    else:
+        ejecutar_busqueda_multiple(
+            numero,
+            categoria,
+            parar_al_encontrar='--parar' in opciones,
+            extraer='--sin-extraer' not in opciones
+        )
 
 
 if __name__ == "__main__":
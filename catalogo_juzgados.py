@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo único de juzgados y salas del TSJ Quintana Roo
+
+Fuente editable: catalogo_juzgados_tsj.csv (una fila por juzgado o sala con
+su ID, areaId, instancia, ciudad, materia, grupo de la GUI y categorías de
+búsqueda múltiple).
+
+La fuente se compila a catalogo_juzgados.json con todas las tablas de consulta
+ya calculadas (nombres normalizados, areaId por ID, grupos, categorías). El
+compilado guarda la huella SHA-256 de la fuente y se regenera solo cuando la
+fuente cambia; cada herramienta lo carga una sola vez y bajo demanda con
+obtener_catalogo().
+
+Uso:
+    python catalogo_juzgados.py                         # Compila y muestra un resumen
+    python catalogo_juzgados.py --actualizar-expedientes # Reescribe juzgados_disponibles en expedientes.json
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from persistencia import escribir_json_atomico
+from planificador import normalizar_nombre
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_FUENTE = os.path.join(SCRIPT_DIR, 'catalogo_juzgados_tsj.csv')
+ARCHIVO_COMPILADO = os.path.join(SCRIPT_DIR, 'catalogo_juzgados.json')
+
+VERSION_FORMATO = 1  # Cambiarla obliga a recompilar aunque la fuente no cambie
+
+
+def _huella(ruta):
+    with open(ruta, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compilar(archivo_fuente=ARCHIVO_FUENTE):
+    """Lee la fuente CSV y calcula todas las tablas de consulta"""
+    juzgados = []
+    with open(archivo_fuente, 'r', encoding='utf-8-sig', newline='') as f:
+        for fila in csv.DictReader(f):
+            juzgados.append({
+                'id': int(fila['id']),
+                'nombre': fila['nombre'].strip(),
+                'clave': normalizar_nombre(fila['nombre']),
+                'area_id': int(fila['area_id']) if fila['area_id'].strip() else None,
+                'instancia': int(fila['instancia']),
+                'ciudad': fila['ciudad'].strip(),
+                'materia': fila['materia'].strip(),
+                'historica': fila['historica'].strip() == '1',
+                'grupo': fila['grupo'].strip(),
+                'categorias': fila['busqueda_multiple'].split(),
+            })
+
+    # Grupos de la GUI: segunda instancia primero, después en orden de aparición
+    grupos = {}
+    for j in sorted(juzgados, key=lambda j: -j['instancia']):
+        grupos.setdefault(j['grupo'], []).append(j['nombre'])
+
+    categorias = {}
+    disponibles = {}
+    for j in juzgados:
+        for categoria in j['categorias']:
+            categorias.setdefault(categoria, []).append(j['nombre'])
+        if j['instancia'] == 2:
+            seccion = 'SALAS_HISTORICAS_ESPECIALIZADAS' if j['historica'] else 'SEGUNDA_INSTANCIA'
+        else:
+            seccion = j['ciudad']
+        disponibles.setdefault(seccion, []).append(j['nombre'])
+
+    return {
+        'version': VERSION_FORMATO,
+        'fuente': {'sha256': _huella(archivo_fuente)},
+        'juzgados': juzgados,
+        'por_clave': {j['clave']: j['id'] for j in juzgados},
+        'grupos': list(grupos.items()),
+        'categorias': categorias,
+        'juzgados_disponibles': disponibles,
+    }
+
+
+class CatalogoJuzgados:
+    """Consultas sobre el catálogo compilado"""
+
+    def __init__(self, datos):
+        self.version = datos['version']
+        self.huella = datos['fuente']['sha256']
+        self.juzgados = datos['juzgados']
+        self.por_id = {j['id']: j for j in self.juzgados}
+        self.por_clave = datos['por_clave']
+        self.grupos = [(grupo, nombres) for grupo, nombres in datos['grupos']]
+        self.categorias = datos['categorias']
+        self.juzgados_disponibles = datos['juzgados_disponibles']
+
+        # Vistas equivalentes a las tablas que tenía el bot
+        self.ids = {j['nombre']: j['id'] for j in self.juzgados}
+        self.area_ids = {j['id']: j['area_id'] for j in self.juzgados if j['area_id'] is not None}
+
+    def nombres(self):
+        return [j['nombre'] for j in self.juzgados]
+
+    def id_juzgado(self, nombre):
+        """
+        ID del juzgado a partir de su nombre
+
+        Primero la coincidencia exacta (sin acentos ni mayúsculas); si no, el
+        primero que contiene las tres primeras palabras escritas.
+        """
+        clave = normalizar_nombre(nombre)
+        if clave in self.por_clave:
+            return self.por_clave[clave]
+        palabras = clave.split()[:3]
+        for j in self.juzgados:
+            if palabras and all(p in j['clave'] for p in palabras):
+                return j['id']
+        return None
+
+    def area_id(self, id_juzgado):
+        return self.area_ids.get(id_juzgado)
+
+
+def cargar(archivo_fuente=ARCHIVO_FUENTE, archivo_compilado=ARCHIVO_COMPILADO):
+    """
+    Carga el catálogo compilado, recompilándolo si la fuente cambió
+
+    Si el compilado no se puede escribir (p. ej. carpeta de solo lectura) se
+    usa la versión recién compilada en memoria.
+    """
+    huella = _huella(archivo_fuente)
+    try:
+        with open(archivo_compilado, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        if datos.get('version') == VERSION_FORMATO and datos.get('fuente', {}).get('sha256') == huella:
+            return CatalogoJuzgados(datos)
+    except (OSError, ValueError):
+        pass
+
+    datos = compilar(archivo_fuente)
+    try:
+        escribir_json_atomico(archivo_compilado, datos)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar el catálogo compilado: {e}")
+    return CatalogoJuzgados(datos)
+
+
+_catalogo = None
+_lock = threading.Lock()
+
+
+def obtener_catalogo():
+    """Catálogo compartido del proceso (se carga la primera vez que se pide)"""
+    global _catalogo
+    if _catalogo is None:
+        with _lock:
+            if _catalogo is None:
+                _catalogo = cargar()
+    return _catalogo
+
+
+def actualizar_expedientes(archivo):
+    """Reescribe la sección informativa juzgados_disponibles de expedientes.json"""
+    with open(archivo, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    anterior = data.get('juzgados_disponibles', {})
+    nuevos = dict(obtener_catalogo().juzgados_disponibles)
+    # Se conservan las notas escritas a mano (entradas que no son listas)
+    nuevos.update({k: v for k, v in anterior.items() if not isinstance(v, list)})
+    data['juzgados_disponibles'] = nuevos
+    escribir_json_atomico(archivo, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila el catálogo de juzgados y salas")
+    parser.add_argument('--actualizar-expedientes', nargs='?', const=os.path.join(SCRIPT_DIR, 'expedientes.json'),
+                        metavar='ARCHIVO', help="Actualiza juzgados_disponibles en expedientes.json")
+    args = parser.parse_args()
+
+    catalogo = obtener_catalogo()
+    salas = sum(1 for j in catalogo.juzgados if j['instancia'] == 2)
+    print(f"✅ Catálogo v{catalogo.version} ({catalogo.huella[:12]}): "
+          f"{len(catalogo.juzgados)} juzgados y salas ({salas} salas, {len(catalogo.area_ids)} con areaId)")
+    for grupo, nombres in catalogo.grupos:
+        print(f"   {grupo}: {len(nombres)}")
+
+    if args.actualizar_expedientes:
+        actualizar_expedientes(args.actualizar_expedientes)
+        print(f"💾 juzgados_disponibles actualizado en {args.actualizar_expedientes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo de órganos jurisdiccionales federales (PJF) con índices
+
+Se carga una sola vez desde docs/data/organismos.json (o desde
+catalogo_organismos_completo.csv, o desde docs/data/pjf_catalogos_completos.json,
+la fuente de los artefactos de la app web) y deja calculados:
+
+- la categoría de cada órgano (juzgado de distrito, tribunal colegiado, ...)
+- su nombre normalizado (sin acentos ni mayúsculas)
+- índices por ID, por circuito y por categoría
+
+Las herramientas que trabajan con el catálogo federal lo piden con
+obtener_catalogo_pjf() en lugar de leer y recorrer la lista cada vez.
+"""
+
+import csv
+import json
+import os
+import threading
+
+from planificador import normalizar_nombre
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_JSON = os.path.join(SCRIPT_DIR, 'docs', 'data', 'organismos.json')
+ARCHIVO_CSV = os.path.join(SCRIPT_DIR, 'catalogo_organismos_completo.csv')
+ARCHIVO_COMPLETO = os.path.join(SCRIPT_DIR, 'docs', 'data', 'pjf_catalogos_completos.json')
+
+CATEGORY_LABELS = {
+    'juzgado_distrito': 'Juzgados de Distrito',
+    'tribunal_colegiado': 'Tribunales Colegiados de Circuito',
+    'tribunal_unitario': 'Tribunales Unitarios de Circuito',
+    'centro_justicia_penal': 'Centros de Justicia Penal Federal',
+    'tribunal_laboral': 'Tribunales Laborales Federales',
+    'pleno_regional': 'Plenos Regionales',
+    'otro': 'Otros',
+}
+
+
+def detect_category(nombre):
+    n = nombre.lower()
+    if 'tribunal laboral' in n:
+        return 'tribunal_laboral'
+    if 'centro de justicia penal' in n:
+        return 'centro_justicia_penal'
+    if 'tribunal colegiado' in n:
+        return 'tribunal_colegiado'
+    if 'tribunal unitario' in n:
+        return 'tribunal_unitario'
+    if 'pleno regional' in n or 'pleno de circuito' in n:
+        return 'pleno_regional'
+    if 'juzgado' in n:
+        return 'juzgado_distrito'
+    return 'otro'
+
+
+class CatalogoPJF:
+    """
+    Órganos federales con sus índices
+
+    Args:
+        organismos: Iterable de dicts con 'id', 'nombre' y 'circuito_id' (o 'circuitoId',
+                    como en pjf_catalogos_completos.json). Cada órgano se guarda con
+                    'categoria' y 'clave' (nombre normalizado); el dict original queda
+                    en registros.
+    """
+
+    def __init__(self, organismos):
+        self.organismos = []
+        self.por_id = {}
+        self.registros = {}       # ID -> dict tal como venía en la fuente
+        self.por_circuito = {}    # circuito -> órganos, en el orden del catálogo
+        self.por_categoria = {}   # categoría -> órganos
+        self.por_clave = {}       # nombre normalizado -> órgano
+
+        for org in organismos:
+            organo = {
+                'id': int(org['id']),
+                'nombre': org['nombre'],
+                'circuito_id': int(org['circuito_id'] if 'circuito_id' in org else org['circuitoId']),
+                'categoria': detect_category(org['nombre']),
+                'clave': normalizar_nombre(org['nombre']),
+            }
+            if organo['id'] in self.por_id:
+                continue
+            self.organismos.append(organo)
+            self.por_id[organo['id']] = organo
+            self.registros[organo['id']] = org
+            self.por_circuito.setdefault(organo['circuito_id'], []).append(organo)
+            self.por_categoria.setdefault(organo['categoria'], []).append(organo)
+            self.por_clave.setdefault(organo['clave'], organo)
+
+    def __len__(self):
+        return len(self.organismos)
+
+    def __iter__(self):
+        return iter(self.organismos)
+
+    def circuitos(self):
+        return sorted(self.por_circuito)
+
+    def organismo(self, organo_id):
+        return self.por_id.get(int(organo_id))
+
+    def de_circuito(self, circuito_id):
+        return self.por_circuito.get(int(circuito_id), [])
+
+    def de_categoria(self, categoria):
+        return self.por_categoria.get(categoria, [])
+
+    def por_nombre(self, nombre):
+        """Órgano cuyo nombre coincide (sin importar acentos ni mayúsculas), o None"""
+        return self.por_clave.get(normalizar_nombre(nombre))
+
+
+def cargar(ruta=ARCHIVO_JSON):
+    """
+    Carga el catálogo desde organismos.json, desde un CSV (id, nombre, circuito_id)
+    o desde pjf_catalogos_completos.json (los órganos de su lista 'organos')
+    """
+    if ruta.lower().endswith('.csv'):
+        with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+            return CatalogoPJF(list(csv.DictReader(f)))
+    with open(ruta, 'r', encoding='utf-8') as f:
+        datos = json.load(f)
+    return CatalogoPJF(datos['organos'] if isinstance(datos, dict) else datos)
+
+
+_catalogo = None
+_lock = threading.Lock()
+
+
+def obtener_catalogo_pjf():
+    """Catálogo federal compartido del proceso (se carga la primera vez que se pide)"""
+    global _catalogo
+    if _catalogo is None:
+        with _lock:
+            if _catalogo is None:
+                _catalogo = cargar(ARCHIVO_JSON if os.path.exists(ARCHIVO_JSON) else ARCHIVO_CSV)
+    return _catalogo
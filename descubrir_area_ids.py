@@ -2,121 +2,222 @@
 # -*- coding: utf-8 -*-
 """
 Script para descubrir los areaId de las Salas de Segunda Instancia
-Prueba diferentes combinaciones para encontrar los areaId correctos
+
+Prueba combinaciones int/areaId en buscador_segunda.php por HTTP directo
+(sin Chrome) y en paralelo:
+
+- Los candidatos se ordenan por probabilidad: primero los que resultan de
+  aplicar a cada Sala las diferencias int→areaId ya conocidas en el catálogo
+  (hoy todas son areaId = int - 25), después los vecinos de esa predicción.
+- Cada Sala deja de probarse en cuanto un areaId se confirma.
+- Las combinaciones que no funcionaron se guardan en area_ids_cache.json y no
+  se vuelven a probar durante DIAS_CACHE días.
+
+Con las diferencias conocidas, revalidar las 11 Salas toma unos segundos.
+
+Uso:
+    python3 descubrir_area_ids.py                 # Salas vigentes del catálogo
+    python3 descubrir_area_ids.py --rango 100 250 # Ampliar el rango de areaId
+    python3 descubrir_area_ids.py --sin-cache     # Volver a probar todo
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+import argparse
+import json
+import os
 import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import estrados_http
+from catalogo_juzgados import obtener_catalogo
+from persistencia import escribir_json_atomico
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_CACHE = os.path.join(SCRIPT_DIR, 'area_ids_cache.json')
+
+EXPEDIENTE_PRUEBA = "1/2024"
+RANGO = (120, 200)      # areaId mínimo y máximo a probar
+HILOS = 6               # Peticiones simultáneas en total
+POR_SALA = 2            # Peticiones simultáneas por Sala (lo que se desperdicia al acertar)
+DIAS_CACHE = 30         # Vigencia de un resultado negativo
+
+
+def probar_area_id(id_sala, area_id, timeout=15):
+    """
+    Consulta buscador_segunda.php con un areaId
+
+    Returns:
+        True si responde con la página de resultados, False si responde con una
+        página completa de otro tipo, None si hubo error de red o la respuesta
+        llegó vacía o cortada (no se puede descartar)
+    """
+    url = estrados_http.url_busqueda(id_sala, EXPEDIENTE_PRUEBA, 1, area_id)
+    try:
+        html = estrados_http.obtener_html(url, timeout=timeout)
+    except Exception:
+        return None
+    if estrados_http.pagina_de_resultados(html):
+        return True
+    return False if estrados_http.pagina_completa(html) else None
+
 
-def probar_area_id(driver, id_sala, nombre_sala, area_id_inicial=150, area_id_final=200):
+def candidatos(id_sala, conocidos, rango=RANGO):
     """
-    Prueba diferentes areaIds para una Sala específica
+    areaIds a probar para una Sala, del más al menos probable
+
+    Args:
+        id_sala: ID (int) de la Sala
+        conocidos: dict int -> areaId ya confirmados
+        rango: (mínimo, máximo) de areaId
     """
-    print(f"\n{'='*70}")
-    print(f"🔍 Probando: {nombre_sala}")
-    print(f"   ID Sala (int): {id_sala}")
-    print(f"{'='*70}")
+    minimo, maximo = rango
+    diferencias = Counter(area - sala for sala, area in conocidos.items())
+    orden = []
+
+    # La areaId ya registrada para esta Sala, después las predicciones por diferencia
+    if id_sala in conocidos:
+        orden.append(conocidos[id_sala])
+    orden.extend(id_sala + d for d, _ in diferencias.most_common())
+
+    # Después, hacia afuera desde la predicción principal (o el centro del rango)
+    centro = orden[0] if orden else (minimo + maximo) // 2
+    # Hasta cubrir el rango completo, aunque la predicción quede fuera de él
+    for paso in range(1, max(centro - minimo, maximo - centro) + 1):
+        orden.extend((centro + paso, centro - paso))
+    orden.append(centro)
+
+    vistos = set()
+    return [a for a in orden if minimo <= a <= maximo and not (a in vistos or vistos.add(a))]
+
+
+# ---------- Caché de resultados ----------
+
+def cargar_cache(archivo=ARCHIVO_CACHE):
+    try:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    base_url = "https://www.tsjqroo.gob.mx/estrados"
-    expediente_prueba = "1/2024"  # Expediente de prueba
 
-    for area_id in range(area_id_inicial, area_id_final + 1):
-        try:
-            # Construir URL con buscador_segunda.php
-            url = f"{base_url}/buscador_segunda.php?findexp={expediente_prueba}&int={id_sala}&areaId={area_id}&metodo=1"
+def negativo_vigente(cache, id_sala, area_id, dias=DIAS_CACHE, ahora=None):
+    entrada = cache.get(f"{id_sala}:{area_id}")
+    if not entrada or entrada['valido']:
+        return False
+    return datetime.fromisoformat(entrada['fecha']) >= (ahora or datetime.now()) - timedelta(days=dias)
 
-            driver.get(url)
-            time.sleep(2)
 
-            # Verificar si la página cargó correctamente
-            page_source = driver.page_source
+def registrar(cache, id_sala, area_id, valido):
+    cache[f"{id_sala}:{area_id}"] = {'valido': valido, 'fecha': datetime.now().isoformat(timespec='seconds')}
 
-            # Verificar si NO hay error de página o redirección
-            if "error" not in page_source.lower() and "not found" not in page_source.lower():
-                # Verificar si hay una tabla de resultados (aunque esté vacía)
-                if "table" in page_source.lower() or "tbody" in page_source.lower():
-                    print(f"   ✅ areaId={area_id} - Página válida (tiene tabla)")
 
-                    # Verificar si hay resultados o mensaje de "no resultados"
-                    if "No se encontr" in page_source or "ningun resultado" in page_source.lower():
-                        print(f"      → Sin resultados para expediente {expediente_prueba}")
-                    else:
-                        # Intentar contar filas
-                        try:
-                            filas = driver.find_elements(By.CSS_SELECTOR, "tr.odd, tr.even")
-                            if len(filas) > 0:
-                                print(f"      → ¡ENCONTRÓ {len(filas)} RESULTADOS! ✨")
-                        except:
-                            pass
+# ---------- Descubrimiento ----------
 
-                    return area_id  # Retorna el primer areaId válido
+def descubrir(salas, conocidos, cache, rango=RANGO, hilos=HILOS, por_sala=POR_SALA, dias_cache=DIAS_CACHE,
+              probar=probar_area_id):
+    """
+    Busca el areaId de cada Sala en paralelo
 
-        except Exception as e:
-            # Silenciar errores, solo nos interesan los areaIds que funcionan
-            pass
+    Args:
+        salas: dict nombre -> ID (int) de la Sala
+        conocidos: dict int -> areaId que se usan para ordenar los candidatos
+        cache: dict de resultados (se actualiza)
+        probar: función (id_sala, area_id) -> True/False/None
 
-    print(f"   ❌ No se encontró areaId válido en rango {area_id_inicial}-{area_id_final}")
-    return None
+    Returns:
+        (dict nombre -> areaId o None, número de peticiones hechas)
+    """
+    pendientes = {}
+    for nombre, id_sala in salas.items():
+        lista = [a for a in candidatos(id_sala, conocidos, rango)
+                 if not negativo_vigente(cache, id_sala, a, dias_cache)]
+        pendientes[nombre] = deque(enumerate(lista))
+
+    aciertos = {}   # nombre -> (posición del candidato, areaId)
+    en_curso = {}   # futuro -> (nombre, posición, areaId)
+    peticiones = 0
+
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        def lanzar(nombre):
+            nonlocal peticiones
+            activos = sum(1 for n, _, _ in en_curso.values() if n == nombre)
+            while nombre not in aciertos and pendientes[nombre] and activos < por_sala:
+                posicion, area_id = pendientes[nombre].popleft()
+                en_curso[pool.submit(probar, salas[nombre], area_id)] = (nombre, posicion, area_id)
+                peticiones += 1
+                activos += 1
+
+        for nombre in salas:
+            lanzar(nombre)
+
+        while en_curso:
+            hechos, _ = wait(list(en_curso), return_when=FIRST_COMPLETED)
+            terminadas = set()
+            for futuro in hechos:
+                nombre, posicion, area_id = en_curso.pop(futuro)
+                terminadas.add(nombre)
+                valido = futuro.result()
+                if valido is None:
+                    continue  # Error de red o respuesta dudosa: no se guarda como negativo
+                registrar(cache, salas[nombre], area_id, valido)
+                if valido and (nombre not in aciertos or posicion < aciertos[nombre][0]):
+                    aciertos[nombre] = (posicion, area_id)
+                    print(f"   ✅ {nombre}: areaId={area_id}")
+            # Se relanza después de revisar todo el lote, para no probar de más tras un acierto
+            for nombre in terminadas:
+                lanzar(nombre)
+
+    return {nombre: aciertos[nombre][1] if nombre in aciertos else None for nombre in salas}, peticiones
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Descubre los areaId de las Salas de Segunda Instancia")
+    parser.add_argument('--rango', nargs=2, type=int, default=RANGO, metavar=('MIN', 'MAX'),
+                        help=f"Rango de areaId a probar (default {RANGO[0]}-{RANGO[1]})")
+    parser.add_argument('--hilos', type=int, default=HILOS, help=f"Peticiones simultáneas (default {HILOS})")
+    parser.add_argument('--sin-cache', action='store_true', help="Volver a probar los areaId ya descartados")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("🔍 DESCUBRIDOR DE AREA IDs")
     print("   Salas de Segunda Instancia - TSJ Quintana Roo")
     print("=" * 70)
     print()
 
-    # Configurar Chrome
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')  # Ejecutar sin interfaz gráfica
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-
-    driver = webdriver.Chrome(options=chrome_options)
-
-    # Diccionario de Salas a probar
-    salas = {
-        'PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR': 170,
-        'SEGUNDA SALA PENAL ORAL': 171,
-        'TERCERA SALA PENAL ORAL': 173,
-        'CUARTA SALA CIVIL MERCANTIL Y FAMILIAR': 183,
-        'QUINTA SALA CIVIL MERCANTIL Y FAMILIAR': 175,
-        'SEXTA SALA CIVIL MERCANTIL Y FAMILIAR': 176,
-        'SEPTIMA SALA PENAL TRADICIONAL': 177,
-        'OCTAVA SALA PENAL ORAL': 178,
-        'NOVENA SALA PENAL ORAL': 179,  # Ya sabemos que areaId=154
-        'DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA': 172,
-        'SALA CONSTITUCIONAL': 184,
-    }
-
-    resultados = {}
+    catalogo = obtener_catalogo()
+    salas = {j['nombre']: j['id'] for j in catalogo.juzgados if j['instancia'] == 2 and not j['historica']}
+    cache = {} if args.sin_cache else cargar_cache()
 
+    inicio = time.time()
+    resultados, peticiones = descubrir(salas, catalogo.area_ids, cache, rango=tuple(args.rango), hilos=args.hilos)
     try:
-        for nombre_sala, id_sala in salas.items():
-            area_id = probar_area_id(driver, id_sala, nombre_sala)
-            if area_id:
-                resultados[nombre_sala] = {
-                    'int': id_sala,
-                    'areaId': area_id
-                }
-
-    finally:
-        driver.quit()
+        escribir_json_atomico(ARCHIVO_CACHE, cache)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar la caché: {e}")
 
     # Mostrar resultados finales
     print("\n" + "=" * 70)
-    print("📊 RESULTADOS FINALES")
+    print(f"📊 RESULTADOS FINALES ({peticiones} peticiones en {time.time() - inicio:.1f}s)")
     print("=" * 70)
     print()
-    print("Copia este diccionario en buscar_expedientes.py:")
-    print()
-    print("AREA_IDS_SALAS = {")
-    for nombre, datos in resultados.items():
-        print(f"    {datos['int']}: {datos['areaId']},  # {nombre}")
-    print("}")
+    cambios = 0
+    for nombre, area_id in resultados.items():
+        id_sala = salas[nombre]
+        actual = catalogo.area_id(id_sala)
+        if area_id is None:
+            print(f"   ❌ {id_sala} {nombre}: sin areaId válido en {args.rango[0]}-{args.rango[1]}")
+        elif area_id != actual:
+            cambios += 1
+            print(f"   ⚠️  {id_sala} {nombre}: areaId {actual} → {area_id}")
+        else:
+            print(f"   ✅ {id_sala} {nombre}: areaId {area_id}")
+
     print()
+    if cambios:
+        print(f"Corrige la columna area_id de {cambios} fila(s) en catalogo_juzgados_tsj.csv")
+    else:
+        print("El catálogo (catalogo_juzgados_tsj.csv) está al día")
     print("=" * 70)
 
 
@@ -1,152 +1,168 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Script para descubrir IDs de Salas en el sistema de Estrados Electrónicos
-TSJ Quintana Roo
+Script para descubrir IDs de juzgados y Salas en el sistema de Estrados
+Electrónicos TSJ Quintana Roo
 
-Uso: python3 descubrir_ids_salas.py
+Consulta buscador_primera.php?int=N por HTTP directo (sin Chrome) con varias
+peticiones simultáneas. De cada respuesta extrae el nombre del órgano
+(estrados_http.nombre_organo), lo clasifica como primera o segunda instancia
+y lo compara con catalogo_juzgados_tsj.csv.
+
+El resultado se guarda en ids_estrados.json, una entrada por ID válido:
+
+    {"id": 170, "nombre": "PRIMERA SALA ...", "instancia": 2,
+     "catalogo": "coincide" | "distinto" | "nuevo", "nombre_catalogo": ...}
+
+Con 12 hilos, los IDs 1-300 se revisan en menos de un minuto.
+
+Uso:
+    python3 descubrir_ids_salas.py                  # IDs 1-300
+    python3 descubrir_ids_salas.py --rango 1 400    # Otro rango
+    python3 descubrir_ids_salas.py --hilos 6        # Menos carga para el servidor
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+import argparse
+import os
 import time
-
-def probar_id_sala(driver, id_sala, nombre_sala):
-    """Prueba si un ID de sala es válido"""
-    url = f"https://www.tsjqroo.gob.mx/estrados/buscador_primera.php?int={id_sala}&metodo=1&findexp=1/2025"
-
-    try:
-        driver.get(url)
-        time.sleep(2)
-
-        # Verificar si la página cargó correctamente
-        page_source = driver.page_source.lower()
-
-        # Buscar señales de que el ID es válido
-        if "error" in page_source or "no encontrado" in page_source:
-            return None
-
-        # Buscar el nombre del juzgado/sala en la página
-        if any(palabra.lower() in page_source for palabra in nombre_sala.split()):
-            print(f"✅ ID {id_sala}: {nombre_sala} - ENCONTRADO")
-            return id_sala
-        else:
-            # Intentar extraer el nombre real del juzgado de la página
-            try:
-                # Aquí puedes agregar lógica para extraer el nombre del juzgado
-                print(f"⚠️  ID {id_sala}: Responde pero no coincide con '{nombre_sala}'")
-            except:
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import estrados_http
+from catalogo_juzgados import obtener_catalogo
+from persistencia import escribir_json_atomico
+from planificador import normalizar_nombre
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_SALIDA = os.path.join(SCRIPT_DIR, 'ids_estrados.json')
+
+EXPEDIENTE_PRUEBA = "1/2025"
+RANGO = (1, 300)
+HILOS = 12
+REINTENTOS = 2
+
+
+def clasificar_instancia(nombre):
+    """2 para Salas y Pleno, 1 para juzgados y tribunales"""
+    palabras = normalizar_nombre(nombre).split()
+    return 2 if 'SALA' in palabras or 'PLENO' in palabras else 1
+
+
+def consultar_id(id_juzgado, reintentos=REINTENTOS, timeout=15):
+    """
+    Consulta un ID y extrae el órgano que muestra la página
+
+    Returns:
+        dict {'id', 'nombre', 'instancia'}, None si el ID no corresponde a
+        ningún órgano, o {'id', 'error'} si la red falló en todos los intentos
+    """
+    url = estrados_http.url_busqueda(id_juzgado, EXPEDIENTE_PRUEBA, 1)
+    for intento in range(reintentos + 1):
+        try:
+            html = estrados_http.obtener_html(url, timeout=timeout)
+            break
+        except Exception as e:
+            if intento == reintentos:
+                return {'id': id_juzgado, 'error': str(e)}
+            time.sleep(1 + intento)
+
+    nombre = estrados_http.nombre_organo(html)
+    if not nombre:
+        return None
+    return {'id': id_juzgado, 'nombre': nombre, 'instancia': clasificar_instancia(nombre)}
+
+
+def comparar_con_catalogo(organo, catalogo):
+    """Agrega 'catalogo' (coincide, distinto o nuevo) y 'nombre_catalogo' al órgano"""
+    registrado = catalogo.por_id.get(organo['id'])
+    if registrado is None:
+        organo['catalogo'] = 'nuevo'
+        organo['nombre_catalogo'] = None
+    else:
+        igual = registrado['clave'] == normalizar_nombre(organo['nombre'])
+        organo['catalogo'] = 'coincide' if igual else 'distinto'
+        organo['nombre_catalogo'] = registrado['nombre']
+    return organo
+
+
+def escanear(ids, hilos=HILOS, consultar=consultar_id, progreso=None):
+    """
+    Consulta los IDs en paralelo
+
+    Returns:
+        (órganos encontrados ordenados por ID, IDs que fallaron por red)
+    """
+    encontrados = []
+    errores = []
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        for hechos, resultado in enumerate(pool.map(consultar, ids), 1):
+            if resultado is None:
                 pass
-            return None
+            elif 'error' in resultado:
+                errores.append(resultado['id'])
+            else:
+                encontrados.append(resultado)
+            if progreso:
+                progreso(hechos, resultado)
+    return encontrados, errores
 
-    except Exception as e:
-        print(f"❌ ID {id_sala}: Error - {e}")
-        return None
 
 def main():
+    parser = argparse.ArgumentParser(description="Descubre los IDs de juzgados y Salas de los Estrados")
+    parser.add_argument('--rango', nargs=2, type=int, default=RANGO, metavar=('MIN', 'MAX'),
+                        help=f"IDs a consultar (default {RANGO[0]}-{RANGO[1]})")
+    parser.add_argument('--hilos', type=int, default=HILOS, help=f"Peticiones simultáneas (default {HILOS})")
+    parser.add_argument('--salida', default=ARCHIVO_SALIDA, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
     print("=" * 70)
-    print("🔍 Descubridor de IDs de Salas - TSJ Quintana Roo")
+    print("🔍 Descubridor de IDs - TSJ Quintana Roo")
     print("=" * 70)
     print()
 
-    # Salas a buscar (según la lista proporcionada)
-    salas_a_buscar = [
-        "PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR",
-        "SEGUNDA SALA PENAL ORAL",
-        "TERCERA SALA PENAL ORAL",
-        "CUARTA SALA CIVIL MERCANTIL Y FAMILIAR",
-        "QUINTA SALA CIVIL MERCANTIL Y FAMILIAR",
-        "SEXTA SALA CIVIL MERCANTIL Y FAMILIAR",
-        "SEPTIMA SALA PENAL TRADICIONAL",
-        "OCTAVA SALA PENAL ORAL",
-        "NOVENA SALA PENAL ORAL",
-        "DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA",
-        "SALA CONSTITUCIONAL",
-    ]
-
-    # Iniciar navegador
-    print("Iniciando Chrome...")
-    options = webdriver.ChromeOptions()
-    # options.add_argument('--headless')  # Descomenta para modo invisible
-    driver = webdriver.Chrome(options=options)
-
-    resultados = {}
-
-    try:
-        print("\nProbando IDs comunes para Salas de Segunda Instancia...")
-        print("(Esto puede tomar varios minutos)\n")
-
-        # Probar rangos comunes de IDs para salas
-        # Las salas suelen tener IDs en rangos específicos
-        rangos_a_probar = [
-            range(1, 30),      # IDs bajos comunes para salas
-            range(98, 105),    # Rango antes de juzgados de Cancún
-            range(116, 131),   # Rango entre juzgados
-            range(138, 144),   # Otro rango intermedio
-            range(167, 188),   # Rango alto
-            range(189, 210),   # Rango muy alto
-        ]
-
-        for rango in rangos_a_probar:
-            for id_sala in rango:
-                print(f"Probando ID {id_sala}...", end='\r')
-
-                url = f"https://www.tsjqroo.gob.mx/estrados/buscador_primera.php?int={id_sala}&metodo=1&findexp=1/2025"
-                driver.get(url)
-                time.sleep(1.5)
-
-                # Intentar extraer el nombre del órgano jurisdiccional
-                try:
-                    page_source = driver.page_source
-
-                    # Buscar patrones que indiquen que es una sala
-                    if "SALA" in page_source.upper():
-                        # Intentar extraer el nombre exacto
-                        print(f"\n🎯 ID {id_sala}: Posible SALA encontrada")
-                        print(f"   URL: {url}")
-
-                        # Guardar screenshot para revisión manual
-                        driver.save_screenshot(f"sala_id_{id_sala}.png")
-                        print(f"   Screenshot guardado: sala_id_{id_sala}.png")
-
-                        resultados[id_sala] = "SALA - Revisar manualmente"
-
-                except Exception as e:
-                    pass
-
-        print("\n")
-        print("=" * 70)
-        print("📊 RESULTADOS")
-        print("=" * 70)
-
-        if resultados:
-            print("\nPosibles IDs de Salas encontrados:")
-            for id_sala, nombre in resultados.items():
-                print(f"  ID {id_sala}: {nombre}")
-            print(f"\nRevisa los screenshots generados (sala_id_XXX.png)")
-            print("para identificar qué sala corresponde a cada ID.\n")
-        else:
-            print("\n⚠️  No se encontraron IDs de Salas en los rangos probados.")
-            print("Intenta buscar manualmente en el sistema de estrados.\n")
-
-        print("\n💡 MÉTODO MANUAL para encontrar IDs:")
-        print("1. Abre: https://www.tsjqroo.gob.mx/estrados/main.php")
-        print("2. Click en 'Segunda Instancia'")
-        print("3. Click en cada sala")
-        print("4. En la URL verás: buscador_primera.php?int=XXX")
-        print("5. El número XXX es el ID de esa sala")
-
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-
-    finally:
-        input("\n⏸️  Presiona ENTER para cerrar...")
-        driver.quit()
+    ids = list(range(args.rango[0], args.rango[1] + 1))
+    print(f"Consultando IDs {ids[0]}-{ids[-1]} con {args.hilos} hilos...\n")
+
+    def progreso(hechos, resultado):
+        if resultado and 'nombre' in resultado:
+            print(f"   ✅ ID {resultado['id']}: {resultado['nombre']}")
+        print(f"   {hechos}/{len(ids)}", end='\r')
+
+    inicio = time.time()
+    encontrados, errores = escanear(ids, hilos=args.hilos, progreso=progreso)
+    catalogo = obtener_catalogo()
+    for organo in encontrados:
+        comparar_con_catalogo(organo, catalogo)
+
+    escribir_json_atomico(args.salida, {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'rango': list(args.rango),
+        'organos': encontrados,
+        'errores': errores,
+    })
+
+    print("\n")
+    print("=" * 70)
+    print(f"📊 RESULTADOS ({time.time() - inicio:.1f}s)")
+    print("=" * 70)
+    for instancia, titulo in ((2, "Segunda instancia"), (1, "Primera instancia")):
+        grupo = [o for o in encontrados if o['instancia'] == instancia]
+        print(f"\n{titulo}: {len(grupo)}")
+        for o in grupo:
+            marca = {'coincide': '✅', 'distinto': '⚠️ ', 'nuevo': '🆕'}[o['catalogo']]
+            print(f"  {marca} {o['id']:>4}  {o['nombre']}")
+            if o['catalogo'] == 'distinto':
+                print(f"         catálogo: {o['nombre_catalogo']}")
+
+    nuevos = [o for o in encontrados if o['catalogo'] == 'nuevo']
+    if nuevos:
+        print("\n🆕 Filas para catalogo_juzgados_tsj.csv (completa ciudad, materia y grupo):")
+        for o in nuevos:
+            print(f"{o['id']},{o['nombre']},,{o['instancia']},,,0,,")
+    if errores:
+        print(f"\n❌ Sin respuesta ({len(errores)}): {', '.join(map(str, errores))}")
+    print(f"\n💾 Resultados guardados en {args.salida}")
+
 
 if __name__ == "__main__":
     main()
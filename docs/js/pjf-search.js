@@ -26,6 +26,61 @@ function detectarCategoriaOrgano(nombre) {
 
 // ==================== INICIALIZACIÓN ====================
 
+const PJF_ARTEFACTOS = 'data/pjf/';
+
+async function obtenerJSONPJF(url, opciones) {
+    var res = await fetch(url, opciones);
+    if (!res.ok) throw new Error('HTTP ' + res.status + ' al cargar ' + url);
+    return res.json();
+}
+
+/**
+ * Órganos en el formato de pjf_catalogos_completos.json a partir del índice
+ * compacto (filas + tablas de circuitos, tipos de órgano y estados).
+ */
+function expandirIndicePJF(indice) {
+    return indice.organos.map(function(f) {
+        return {
+            id: f[0],
+            nombre: f[1],
+            circuitoId: f[2],
+            circuito: indice.circuitos[f[2]] || '',
+            tipoOrganismoId: f[3],
+            tipoOrganismo: indice.tiposOrganismo[f[3]] || '',
+            estado: indice.estados[f[4]] || '',
+            ciudad: f[5]
+        };
+    });
+}
+
+/**
+ * Catálogo federal: { organos, tiposOrgano }.
+ * Se cargan el índice compacto y los tipos de asunto listados en
+ * data/pjf/manifest.json (archivos con huella en el nombre, cacheables sin
+ * caducidad); solo el manifiesto se revalida. Si no hay artefactos
+ * generados, se usa el catálogo completo de siempre.
+ */
+async function obtenerCatalogoPJF() {
+    try {
+        var manifiesto = await obtenerJSONPJF(PJF_ARTEFACTOS + 'manifest.json', { cache: 'no-cache' });
+        var partes = await Promise.all([
+            obtenerJSONPJF(PJF_ARTEFACTOS + manifiesto.indice.archivo),
+            obtenerJSONPJF(PJF_ARTEFACTOS + manifiesto.tipos.archivo)
+        ]);
+        return { organos: expandirIndicePJF(partes[0]), tiposOrgano: partes[1].tiposOrgano };
+    } catch (err) {
+        console.warn('[PJF] Sin artefactos del catálogo, se usa el archivo completo:', err.message);
+        return obtenerJSONPJF('data/pjf_catalogos_completos.json');
+    }
+}
+
+/** Registros completos (materia, estadoId, ...) de los órganos de un circuito. */
+async function cargarCircuitoPJF(numCircuito) {
+    var manifiesto = await obtenerJSONPJF(PJF_ARTEFACTOS + 'manifest.json');
+    var entrada = manifiesto.circuitos[String(numCircuito)];
+    return entrada ? obtenerJSONPJF(PJF_ARTEFACTOS + entrada.archivo) : [];
+}
+
 async function cargarCatalogosPJF() {
     if (pjfDatosCargados) return;
 
@@ -33,10 +88,7 @@ async function cargarCatalogosPJF() {
     if (spinner) spinner.style.display = 'flex';
 
     try {
-        var res = await fetch('data/pjf_catalogos_completos.json');
-        if (!res.ok) throw new Error('HTTP ' + res.status + ' al cargar catálogo PJF');
-
-        var data = await res.json();
+        var data = await obtenerCatalogoPJF();
 
         // ── Organos (1 195) ───────────────────────────────────────────────
         pjfOrganismos = (data.organos || []).map(function(o) {
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estadísticas de aciertos por juzgado para la búsqueda múltiple
+
+Registra en qué juzgados aparecieron publicaciones según el patrón del número
+de expediente y su año, para sondear primero los juzgados más probables.
+Modelo: Bayes ingenuo con suavizado de Laplace sobre (año, patrón).
+"""
+
+import json
+import os
+import re
+
+from persistencia import escribir_json_atomico
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_ESTADISTICAS = os.path.join(SCRIPT_DIR, 'estadisticas_juzgados.json')
+
+_RE_NUMERO = re.compile(r'^\s*(\d+)\s*/\s*(\d{2,4})(.*)$')
+
+
+def caracteristicas(numero):
+    """
+    Extrae las características de un número de expediente
+
+    Ejemplos:
+        "615/2019"      -> {'anio': '2019', 'patron': '3d'}
+        "1234/2025-II"  -> {'anio': '2025', 'patron': '4d+'}
+
+    Returns:
+        dict con 'anio' y 'patron' (vacío si el número no tiene el formato NUM/AÑO)
+    """
+    m = _RE_NUMERO.match(str(numero))
+    if not m:
+        return {}
+    num, anio, sufijo = m.groups()
+    if len(anio) == 2:
+        anio = '20' + anio
+    patron = f"{len(num.lstrip('0') or '0')}d" + ('+' if sufijo.strip() else '')
+    return {'anio': anio, 'patron': patron}
+
+
+class EstadisticasJuzgados:
+    """Historial de sondeos por juzgado, persistido en JSON"""
+
+    def __init__(self, archivo=ARCHIVO_ESTADISTICAS):
+        self.archivo = archivo
+        self.juzgados = {}
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo):
+                with open(self.archivo, 'r', encoding='utf-8') as f:
+                    self.juzgados = json.load(f).get('juzgados', {})
+        except Exception as e:
+            print(f"⚠️  Error cargando estadísticas: {e}")
+            self.juzgados = {}
+
+    def guardar(self):
+        try:
+            escribir_json_atomico(self.archivo, {'version': 1, 'juzgados': self.juzgados})
+        except Exception as e:
+            print(f"⚠️  Error guardando estadísticas: {e}")
+
+    def registrar(self, numero, juzgado, encontrado):
+        """Registra el resultado de un sondeo (True = hubo publicaciones)"""
+        datos = self.juzgados.setdefault(juzgado, {'sondeos': 0, 'aciertos': 0, 'anio': {}, 'patron': {}})
+        datos['sondeos'] += 1
+        if not encontrado:
+            return
+        datos['aciertos'] += 1
+        for clave, valor in caracteristicas(numero).items():
+            datos[clave][valor] = datos[clave].get(valor, 0) + 1
+
+    def probabilidades(self, numero, juzgados):
+        """
+        Probabilidad de que el expediente esté en cada juzgado candidato
+
+        Returns:
+            dict juzgado -> probabilidad (suman 1 entre los candidatos)
+        """
+        rasgos = caracteristicas(numero)
+        vacio = {'sondeos': 0, 'aciertos': 0, 'anio': {}, 'patron': {}}
+        datos_candidatos = {j: self.juzgados.get(j, vacio) for j in juzgados}
+
+        # Tamaño del vocabulario de cada característica (para el suavizado)
+        vocabulario = {
+            clave: len({v for d in datos_candidatos.values() for v in d[clave]} | {valor})
+            for clave, valor in rasgos.items()
+        }
+
+        pesos = {}
+        for juzgado, datos in datos_candidatos.items():
+            # Tasa de aciertos del juzgado, penaliza los sondeos fallidos
+            peso = (datos['aciertos'] + 1) / (datos['sondeos'] + 2)
+            for clave, valor in rasgos.items():
+                peso *= (datos[clave].get(valor, 0) + 1) / (datos['aciertos'] + vocabulario[clave])
+            pesos[juzgado] = peso
+
+        suma = sum(pesos.values()) or 1
+        return {j: p / suma for j, p in pesos.items()}
+
+    def ordenar(self, numero, juzgados):
+        """Ordena los juzgados de mayor a menor probabilidad (estable ante empates)"""
+        probs = self.probabilidades(numero, juzgados)
+        return sorted(juzgados, key=lambda j: -probs[j])
+
+    def tam_oleada(self, numero, juzgados, cobertura=0.8):
+        """
+        Número de sondeos simultáneos necesarios para cubrir la probabilidad indicada
+
+        Recorriendo los juzgados de mayor a menor probabilidad, devuelve el menor k
+        tal que los primeros k acumulan al menos `cobertura` de la probabilidad total.
+        """
+        probs = self.probabilidades(numero, juzgados)
+        acumulado = 0.0
+        for k, juzgado in enumerate(sorted(juzgados, key=lambda j: -probs[j]), 1):
+            acumulado += probs[juzgado]
+            if acumulado >= cobertura - 1e-9:  # Tolerancia al redondeo de la suma
+                return k
+        return max(len(juzgados), 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Acceso HTTP directo a los Estrados Electrónicos del TSJ Quintana Roo
+
+Funciones ligeras (solo biblioteca estándar) para consultar los buscadores
+sin abrir Chrome. Se usan para sondeos rápidos de existencia: basta saber si
+la tabla de publicaciones trae filas, sin extraer su contenido.
+
+extraer_publicaciones() lee la tabla completa a partir del HTML que devuelve
+el buscador; el bot la usa con el cuerpo de la respuesta capturado en Chrome
+(ver navegador.CapturaRed), sin esperar a que se pinte la página.
+"""
+
+import html
+import re
+from urllib.parse import quote
+
+BASE_URL = "https://www.tsjqroo.gob.mx/estrados"
+URL_SIDEBAR = f"{BASE_URL}/sidebar.php"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+}
+
+# Filas de datos de la tabla de publicaciones (clase 'odd' o 'even')
+_RE_FILA_DATOS = re.compile(r'<tr[^>]*class=["\'][^"\']*\b(?:odd|even)\b', re.IGNORECASE)
+_RE_FILA = re.compile(r'<tr\b(.*?)</tr>', re.IGNORECASE | re.DOTALL)
+_RE_CELDA = re.compile(r'<td\b', re.IGNORECASE)
+_RE_CONTENIDO_CELDA = re.compile(r'<td\b[^>]*>(.*?)(?:</td>|(?=<td\b)|$)', re.IGNORECASE | re.DOTALL)
+_RE_SALTO = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_RE_ETIQUETA = re.compile(r'<[^>]+>')
+_RE_ESPACIOS = re.compile(r'[ \t\r\f\v\xa0]+')
+# Encabezados y título donde el buscador muestra el órgano consultado
+_RE_ENCABEZADO = re.compile(r'<(h[1-6]|title|caption|legend)\b[^>]*>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+_RE_NOMBRE_ORGANO = re.compile(
+    r'(?:\b(?:PRIMER|SEGUND|TERCER|CUART|QUINT|SEXT|S[EÉ]PTIM|OCTAV|NOVEN|D[EÉ]CIM)[AO]? )?'
+    r'\b(?:JUZGADO|SALA|TRIBUNAL|PLENO)\b[A-ZÁÉÍÓÚÜÑ0-9 ,.\-]*[A-ZÁÉÍÓÚÜÑ0-9]'
+)
+# Enlaces del menú lateral: <a href="buscador_segunda.php?...int=170&areaId=145">NOMBRE</a>
+_RE_ENLACE_ORGANO = re.compile(r'<(a|li|option|button)\b([^>]*?\bint=\d+[^>]*)>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+_RE_PARAM_INT = re.compile(r'\bint=(\d+)')
+_RE_PARAM_AREA = re.compile(r'\bareaId=(\d+)', re.IGNORECASE)
+_RE_SCRIPT = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+
+CAMPOS_PUBLICACION = ('id_acuerdo', 'documento', 'juicio', 'promoventes', 'demandados', 'extracto',
+                      'fecha_publicacion')
+
+TAM_BLOQUE = 16 * 1024
+
+
+def url_busqueda(id_juzgado, termino, metodo=1, area_id=None, base_url=BASE_URL):
+    """
+    Construye la URL de búsqueda
+    - Primera Instancia: buscador_primera.php
+    - Segunda Instancia (Salas): buscador_segunda.php + areaId
+    """
+    termino = quote(str(termino), safe='/')
+    if area_id is not None:
+        return f"{base_url}/buscador_segunda.php?findexp={termino}&int={id_juzgado}&areaId={area_id}&metodo={metodo}"
+    return f"{base_url}/buscador_primera.php?int={id_juzgado}&metodo={metodo}&findexp={termino}"
+
+
+def _decodificar(datos, charset):
+    return datos.decode(charset or 'utf-8', errors='replace')
+
+
+def obtener_html(url, timeout=20):
+    """Descarga una página completa y la devuelve como texto"""
+    import urllib.request  # Diferido: cuesta ~40 ms y no se usa al solo construir URLs
+
+    req = urllib.request.Request(url, headers=HEADERS)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        charset = resp.headers.get_content_charset()
+        return _decodificar(resp.read(), charset)
+
+
+def sin_resultados(html):
+    """Detecta el aviso que muestra el sitio cuando la búsqueda no tiene resultados"""
+    return "No se encontr" in html or "ningun resultado" in html.lower()
+
+
+def pagina_de_resultados(html):
+    """
+    Determina si el buscador respondió con su página de resultados (con o sin
+    publicaciones), en lugar de un error o una página vacía
+
+    Es la señal que se usa para validar combinaciones int/areaId. Los <script>
+    y <style> se quitan antes, porque suelen mencionar tablas o errores.
+    """
+    sin_codigo = _RE_SCRIPT.sub('', html)
+    texto = sin_codigo.lower()
+    return sin_resultados(sin_codigo) or '<table' in texto or '<tbody' in texto
+
+
+def pagina_completa(html):
+    """
+    Determina si la respuesta es un documento HTML entero con texto visible
+
+    Una página así que no es de resultados es un rechazo fiable; una vacía o
+    cortada puede ser un fallo pasajero del servidor.
+    """
+    sin_codigo = _RE_SCRIPT.sub('', html)
+    return '</html>' in sin_codigo.lower() and bool(_RE_ETIQUETA.sub('', sin_codigo).strip())
+
+
+def hay_publicaciones(html):
+    """
+    Determina si el HTML de un buscador contiene filas de publicaciones
+
+    Returns:
+        True si hay al menos una fila de datos, False en caso contrario
+    """
+    if sin_resultados(html):
+        return False
+    if _RE_FILA_DATOS.search(html):
+        return True
+    # Respaldo: cualquier fila con las 7 columnas de una publicación
+    return any(len(_RE_CELDA.findall(fila)) >= 7 for fila in _RE_FILA.findall(html))
+
+
+def _texto_celda(contenido):
+    """Texto visible de una celda, como lo devuelve .text en Selenium"""
+    texto = html.unescape(_RE_ETIQUETA.sub('', _RE_SALTO.sub('\n', contenido)))
+    lineas = (_RE_ESPACIOS.sub(' ', linea).strip() for linea in texto.split('\n'))
+    return '\n'.join(linea for linea in lineas if linea)
+
+
+def extraer_publicaciones(html_pagina):
+    """
+    Publicaciones de la tabla de resultados de un buscador
+
+    Equivale a recorrer el DOM: toma las filas con al menos 7 celdas de datos
+    (los encabezados usan <th>) y asigna las columnas en el orden del sitio.
+
+    Returns:
+        Lista de dicts con las llaves de CAMPOS_PUBLICACION (vacía si no hay resultados)
+    """
+    if sin_resultados(html_pagina):
+        return []
+
+    publicaciones = []
+    for fila in _RE_FILA.findall(html_pagina):
+        celdas = _RE_CONTENIDO_CELDA.findall(fila)
+        if len(celdas) >= len(CAMPOS_PUBLICACION):
+            publicaciones.append({campo: _texto_celda(celda) for campo, celda in zip(CAMPOS_PUBLICACION, celdas)})
+    return publicaciones
+
+
+def nombre_organo(html_pagina):
+    """
+    Nombre del juzgado o sala que muestra la página de un buscador
+
+    Busca primero en los encabezados y el título, después en todo el texto,
+    la primera frase en mayúsculas que empiece con JUZGADO, SALA, TRIBUNAL o PLENO.
+
+    Returns:
+        El nombre (espacios normalizados) o None si la página no lo trae
+    """
+    html_pagina = _RE_SCRIPT.sub('', html_pagina)
+    textos = [_texto_celda(contenido) for _, contenido in _RE_ENCABEZADO.findall(html_pagina)]
+    textos.append(_texto_celda(html_pagina))
+    for texto in textos:
+        encontrado = _RE_NOMBRE_ORGANO.search(texto.replace('\n', ' '))
+        if encontrado:
+            return ' '.join(encontrado.group(0).split())
+    return None
+
+
+def extraer_sidebar(html_pagina):
+    """
+    Juzgados y Salas del menú lateral de los Estrados (sidebar.php)
+
+    Returns:
+        Lista de dicts {'id', 'area_id', 'nombre'} en el orden del menú
+        (area_id es None para los buscadores de primera instancia)
+    """
+    organos = {}
+    for _, atributos, contenido in _RE_ENLACE_ORGANO.findall(_RE_SCRIPT.sub('', html_pagina)):
+        nombre = ' '.join(_texto_celda(contenido).split())
+        id_juzgado = int(_RE_PARAM_INT.search(atributos).group(1))
+        if not nombre or id_juzgado in organos:
+            continue
+        area = _RE_PARAM_AREA.search(atributos)
+        organos[id_juzgado] = {'id': id_juzgado, 'area_id': int(area.group(1)) if area else None, 'nombre': nombre}
+    return list(organos.values())
+
+
+def sondear(url, timeout=15, cancelado=None):
+    """
+    Sondeo barato de existencia: lee la respuesta por bloques y se detiene
+    en cuanto aparece la primera fila de datos (o un aviso de sin resultados).
+
+    Args:
+        url: URL del buscador
+        timeout: Segundos máximos por petición
+        cancelado: threading.Event opcional; si se activa, se aborta la lectura
+
+    Returns:
+        True si hay publicaciones, False si no, None si se canceló
+    """
+    import urllib.request  # Diferido (ver obtener_html)
+
+    req = urllib.request.Request(url, headers=HEADERS)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        charset = resp.headers.get_content_charset()
+        recibido = b''
+        while True:
+            if cancelado is not None and cancelado.is_set():
+                return None
+            bloque = resp.read(TAM_BLOQUE)
+            if not bloque:
+                break
+            recibido += bloque
+            texto = _decodificar(recibido, charset)
+            if _RE_FILA_DATOS.search(texto):
+                return True
+            if sin_resultados(texto):
+                return False
+        return hay_publicaciones(_decodificar(recibido, charset))
@@ -6,28 +6,53 @@ Consulta la API pública de serviciosenlinea.pjf.gob.mx para extraer los
 tipos de asunto disponibles por categoría de órgano jurisdiccional y
 guarda el resultado en docs/data/tipos_asunto.json.
 
+Se consultan todos los órganos de organismos.json en paralelo (varios hilos
+sobre la misma sesión), con un límite de peticiones por segundo compartido
+(token bucket) y reintentos con espera creciente.
+
+La actualización es incremental: la respuesta de cada órgano se guarda en
+cache_tipos_asunto_pjf.json con su huella SHA-256 y la fecha de consulta, y
+solo se vuelven a consultar los órganos nuevos o con datos más viejos que
+--max-edad días. Si el catálogo resultante es idéntico al anterior, el
+archivo de salida no se reescribe; si cambió, se muestran los tipos de
+asunto agregados y quitados por categoría.
+
 Requisitos:
     pip install requests
 
 Uso:
     python3 fetch_catalogos_pjf.py
+    python3 fetch_catalogos_pjf.py --hilos 8 --tasa 4      # 8 hilos, máx. 4 peticiones/s
+    python3 fetch_catalogos_pjf.py --muestras 3            # Solo 3 órganos por categoría (rápido)
+    python3 fetch_catalogos_pjf.py --max-edad 1            # Reconsultar lo que tenga más de un día
+    python3 fetch_catalogos_pjf.py --forzar                # Ignorar la caché
+
+Al final se actualizan los tipos de asunto por tipo de órgano de
+docs/data/pjf_catalogos_completos.json con el mismo crawl y se regeneran a
+partir de él los artefactos de docs/data/pjf/ (ver artefactos_pjf.py).
 
 Salida:
     docs/data/tipos_asunto.json (actualizado con IDs reales del SISE)
+    docs/data/pjf_catalogos_completos.json (tiposOrgano y tiposAsunto)
+    docs/data/pjf/ (índice, tipos y circuitos con huella en el nombre + manifest.json)
 """
 
+import argparse
+import codecs
+import hashlib
 import json
 import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from html.parser import HTMLParser
 
-try:
-    import requests
-except ImportError:
-    print('Error: Se requiere la librería "requests".')
-    print('Instálala con: pip install requests')
-    sys.exit(1)
+import artefactos_pjf
+from catalogo_pjf import CATEGORY_LABELS, CatalogoPJF, detect_category, obtener_catalogo_pjf  # noqa: F401 (re-exportados)
+from persistencia import escribir_bytes_si_cambia, escribir_json_atomico, serializar_json
 
 PJF_BASE = 'https://www.serviciosenlinea.pjf.gob.mx'
 DATOS_EXPEDIENTE = '/juicioenlinea/juicioenlinea/Expediente/ObtenerDatosExpediente'
@@ -40,33 +65,44 @@ HEADERS = {
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(SCRIPT_DIR, 'docs', 'data')
+CACHE_PATH = os.path.join(SCRIPT_DIR, 'cache_tipos_asunto_pjf.json')
+
+MAX_WORKERS = 6        # Hilos simultáneos
+RATE = 4.0             # Peticiones por segundo (entre todos los hilos)
+BURST = 4              # Peticiones que se permiten de golpe al inicio
+MAX_RETRIES = 3        # Reintentos por órgano ante error de red, 429 o 5xx
+BACKOFF = 2.0          # Segundos de espera antes del primer reintento (se duplica)
+MAX_AGE_DAYS = 7       # Antigüedad a partir de la cual se reconsulta un órgano
+CHUNK_SIZE = 8 * 1024  # Bytes por bloque al leer la respuesta
 
 
 # ==================== HTML PARSER ====================
 
 class SelectParser(HTMLParser):
-    """Extrae opciones de un <select> por su id."""
+    """Extrae opciones de un <select> por su id (done=True al cerrarse ese <select>)."""
     def __init__(self, select_id):
         super().__init__()
         self.target_id = select_id
         self.in_target = False
         self.in_option = False
+        self.done = False
         self.current_value = None
         self.current_text = ''
         self.options = []
 
     def handle_starttag(self, tag, attrs):
-        a = dict(attrs)
-        if tag == 'select' and a.get('id') == self.target_id:
+        # Solo se arma el dict de atributos para las etiquetas que importan
+        if tag == 'select' and not self.done and dict(attrs).get('id') == self.target_id:
             self.in_target = True
         elif tag == 'option' and self.in_target:
             self.in_option = True
-            self.current_value = a.get('value', '')
+            self.current_value = dict(attrs).get('value', '')
             self.current_text = ''
 
     def handle_endtag(self, tag):
         if tag == 'select' and self.in_target:
             self.in_target = False
+            self.done = True
         elif tag == 'option' and self.in_option:
             self.in_option = False
             v = self.current_value.strip() if self.current_value else ''
@@ -81,128 +117,414 @@ class SelectParser(HTMLParser):
             self.current_text += data
 
 
-def parse_select(html, select_id):
-    p = SelectParser(select_id)
-    p.feed(html)
-    return p.options
-
-
-# ==================== CATEGORÍA ====================
-
-def detect_category(nombre):
-    n = nombre.lower()
-    if 'tribunal laboral' in n:
-        return 'tribunal_laboral'
-    if 'centro de justicia penal' in n:
-        return 'centro_justicia_penal'
-    if 'tribunal colegiado' in n:
-        return 'tribunal_colegiado'
-    if 'tribunal unitario' in n:
-        return 'tribunal_unitario'
-    if 'pleno regional' in n or 'pleno de circuito' in n:
-        return 'pleno_regional'
-    if 'juzgado' in n:
-        return 'juzgado_distrito'
-    return 'otro'
-
-
-CATEGORY_LABELS = {
-    'juzgado_distrito': 'Juzgados de Distrito',
-    'tribunal_colegiado': 'Tribunales Colegiados de Circuito',
-    'tribunal_unitario': 'Tribunales Unitarios de Circuito',
-    'centro_justicia_penal': 'Centros de Justicia Penal Federal',
-    'tribunal_laboral': 'Tribunales Laborales Federales',
-    'pleno_regional': 'Plenos Regionales',
-    'otro': 'Otros',
-}
+_RE_SELECT_TAG = re.compile(r'<select\b[^>]*>', re.IGNORECASE)
+_RE_SELECT_END = re.compile(r'</select\s*>', re.IGNORECASE)
+MAX_TAG = 2048  # Lo más que se guarda de una etiqueta partida entre dos bloques
+
+
+def _find_select(text, select_id):
+    """Posición del <select id=select_id> en `text`, o None"""
+    patron_id = re.compile(r'\bid\s*=\s*(["\']?)' + re.escape(select_id) + r'\1(?=[\s>/])', re.IGNORECASE)
+    for m in _RE_SELECT_TAG.finditer(text):
+        if patron_id.search(m.group(0)):
+            return m.start()
+    return None
+
+
+def extract_select_options(chunks, select_id):
+    """
+    Opciones de un <select> leyendo el HTML por bloques
+
+    Hasta encontrar el <select> buscado solo se revisa el texto con una
+    expresión regular (sin analizar etiquetas ni guardar lo ya leído); desde
+    ahí los bloques pasan a SelectParser, y se deja de leer en cuanto se
+    cierra el </select>.
+
+    Args:
+        chunks: Iterable de fragmentos de texto (p. ej. una respuesta en streaming)
+        select_id: id del <select>
+
+    Returns:
+        Lista de {'id', 'nombre'}
+    """
+    parser = SelectParser(select_id)
+    pending = ''
+    found = False
+    for chunk in chunks:
+        if not found:
+            pending += chunk
+            start = _find_select(pending, select_id)
+            if start is None:
+                # Solo puede faltar el final de una etiqueta que empezó en este bloque
+                cut = pending.rfind('<')
+                pending = pending[cut:] if cut != -1 and len(pending) - cut <= MAX_TAG else ''
+                continue
+            found = True
+            chunk, pending = pending[start:], ''
+        # Lo que sigue al primer </select> no se analiza (no hay <select> anidados)
+        end = _RE_SELECT_END.search(chunk)
+        parser.feed(chunk[:end.end()] if end else chunk)
+        if parser.done:
+            break
+    return parser.options
 
 
-# ==================== FETCH ====================
+def parse_select(html, select_id):
+    return extract_select_options((html,), select_id)
 
-def fetch_tipos(organo_id, session):
-    """Obtiene tipos de asunto para un órgano específico."""
-    try:
-        resp = session.post(
-            PJF_BASE + DATOS_EXPEDIENTE,
-            data=f'IdOrgano={organo_id}&IdTipoAsunto=1&IdTipoPropiedad=&IdSubNivel=&IdSubNivelInc=',
-            headers=HEADERS,
-            timeout=30
-        )
-        resp.raise_for_status()
-        return parse_select(resp.text, 'ddlTipoAsunto')
-    except Exception as e:
-        print(f'    Error para órgano {organo_id}: {e}')
-        return []
 
+def iter_text(raw_chunks, encoding=None):
+    """Fragmentos de bytes (resp.iter_content con stream=True) como fragmentos de texto"""
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    for raw in raw_chunks:
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
 
-# ==================== MAIN ====================
 
-def main():
-    circuitos_path = os.path.join(DATA_DIR, 'circuitos.json')
-    organismos_path = os.path.join(DATA_DIR, 'organismos.json')
-    output_path = os.path.join(DATA_DIR, 'tipos_asunto.json')
+# ==================== FETCH ====================
 
-    with open(circuitos_path, 'r', encoding='utf-8') as f:
-        circuitos = json.load(f)
-    with open(organismos_path, 'r', encoding='utf-8') as f:
-        organismos = json.load(f)
+class TokenBucket:
+    """
+    Límite de peticiones por segundo compartido entre hilos
+
+    Se acumulan `rate` fichas por segundo hasta `burst`; cada petición
+    consume una y espera si no hay.
+    """
+    def __init__(self, rate=RATE, burst=BURST):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryableError(Exception):
+    """Respuesta que vale la pena reintentar (429 o 5xx)"""
+
+
+def fetch_tipos(organo_id, session, bucket=None, retries=MAX_RETRIES, backoff=BACKOFF):
+    """
+    Obtiene tipos de asunto para un órgano específico.
+
+    Returns:
+        Lista de {'id', 'nombre'}, o None si falló después de los reintentos
+    """
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            with session.post(
+                PJF_BASE + DATOS_EXPEDIENTE,
+                data=f'IdOrgano={organo_id}&IdTipoAsunto=1&IdTipoPropiedad=&IdSubNivel=&IdSubNivelInc=',
+                headers=HEADERS,
+                timeout=30,
+                stream=True
+            ) as resp:
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    raise RetryableError(f'HTTP {resp.status_code}')
+                resp.raise_for_status()
+                raw_chunks = resp.iter_content(CHUNK_SIZE)
+                tipos = extract_select_options(iter_text(raw_chunks, resp.encoding), 'ddlTipoAsunto')
+                for _ in raw_chunks:
+                    pass  # El resto se lee sin decodificar para que la conexión vuelva al pool
+                return tipos
+        except Exception as e:
+            # Los 4xx (salvo 429) no mejoran al reintentar
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if attempt == retries or (status is not None and 400 <= status < 500 and status != 429):
+                print(f'    Error para órgano {organo_id}: {e}')
+                return None
+            time.sleep(backoff * 2 ** attempt)
+
+
+def fetch_tipos_organos(organos, session, workers=MAX_WORKERS, rate=RATE, backoff=BACKOFF, progress=True):
+    """
+    Consulta los tipos de asunto de muchos órganos en paralelo
+
+    Args:
+        organos: Lista de dicts con 'id'
+        session: requests.Session compartida por todos los hilos
+        workers: Hilos simultáneos
+        rate: Peticiones por segundo como máximo
+        backoff: Espera antes del primer reintento de cada órgano
+        progress: Mostrar avance en la consola
+
+    Returns:
+        dict id de órgano -> lista de tipos (None si falló)
+    """
+    bucket = TokenBucket(rate, burst=min(BURST, workers))
+    resultados = {}
+    total = len(organos)
+    inicio = time.time()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(fetch_tipos, org['id'], session, bucket, MAX_RETRIES, backoff): org for org in organos}
+        for hechos, futuro in enumerate(as_completed(futuros), 1):
+            resultados[futuros[futuro]['id']] = futuro.result()
+            if progress and (hechos % 25 == 0 or hechos == total):
+                transcurrido = time.time() - inicio
+                fallidos = sum(1 for v in resultados.values() if v is None)
+                restante = transcurrido / hechos * (total - hechos)
+                print(f'  {hechos}/{total} órganos ({fallidos} con error) '
+                      f'- {transcurrido:.0f}s, faltan ~{restante:.0f}s')
+
+    return resultados
+
+
+def select_organos(catalogo, max_samples=None):
+    """
+    Órganos a consultar: todos, o hasta `max_samples` por categoría
+    (cada uno de un circuito distinto, como el muestreo original)
+
+    Args:
+        catalogo: CatalogoPJF
+    """
+    if not max_samples:
+        return list(catalogo)
+
+    elegidos = []
+    samples = {}
+    for circuito in catalogo.circuitos():
+        vistas = set()
+        for org in catalogo.de_circuito(circuito):
+            cat = org['categoria']
+            if cat in vistas or samples.get(cat, 0) >= max_samples:
+                continue
+            vistas.add(cat)
+            samples[cat] = samples.get(cat, 0) + 1
+            elegidos.append(org)
+    return elegidos
 
-    session = requests.Session()
 
-    # Recopilar tipos por categoría, muestreando hasta 3 órganos por categoría
+def merge_tipos(organos, tipos_por_organo):
+    """
+    Une los tipos de asunto de cada órgano en su categoría (únicos por ID, ordenados)
+
+    Args:
+        organos: Órganos de un CatalogoPJF (con 'categoria' ya calculada)
+    """
     categorias_tipos = {}
-    category_samples = {}  # cat -> número de muestras tomadas
-    MAX_SAMPLES = 3
+    for org in organos:
+        tipos = tipos_por_organo.get(org['id'])
+        if tipos is None:
+            continue
+        cat = org['categoria']
+        entrada = categorias_tipos.setdefault(cat, {'label': CATEGORY_LABELS.get(cat, cat), 'tipos': []})
+        existing_ids = {t['id'] for t in entrada['tipos']}
+        for t in tipos:
+            if t['id'] not in existing_ids:
+                entrada['tipos'].append(t)
+                existing_ids.add(t['id'])
 
-    print(f'Procesando {len(circuitos)} circuitos...\n')
+    # Ordenar tipos por ID dentro de cada categoría
+    for cat in categorias_tipos:
+        categorias_tipos[cat]['tipos'].sort(key=lambda t: t['id'] if isinstance(t['id'], int) else 0)
+    return categorias_tipos
 
-    for circuito in circuitos:
-        num = circuito['numero_circuito']
-        nombre_c = circuito['nombre']
-        organos_c = [o for o in organismos if o['circuito_id'] == num]
 
-        if not organos_c:
-            continue
+def refresh_source_catalog(source, tipos_por_organo, now=None):
+    """
+    Actualiza pjf_catalogos_completos.json (la fuente de artefactos_pjf) con el crawl
 
-        # Agrupar órganos por categoría en este circuito
-        cats_vistas = {}
-        for org in organos_c:
-            cat = detect_category(org['nombre'])
-            if cat not in cats_vistas:
-                cats_vistas[cat] = org
+    Cada entrada de tiposOrgano (tipo de órgano + materia) toma la unión de los
+    tipos de asunto consultados para sus órganos; si ninguno de sus órganos se
+    consultó conserva los que tenía. Los tipos de asunto nuevos se agregan a
+    tiposAsunto (los existentes conservan sus tiposProcedimiento).
 
-        for cat, org in cats_vistas.items():
-            samples = category_samples.get(cat, 0)
-            if samples >= MAX_SAMPLES:
-                continue
+    Args:
+        source: Contenido actual de pjf_catalogos_completos.json
+        tipos_por_organo: {id de órgano: tipos de asunto} (p. ej. de la caché)
 
-            print(f'Circuito {num:2d} ({nombre_c[:30]}) → {cat} → órgano {org["id"]} ({org["nombre"][:50]}...)')
-            tipos = fetch_tipos(org['id'], session)
-            category_samples[cat] = samples + 1
+    Returns:
+        El catálogo actualizado; 'generado' solo cambia si cambió algo más
+    """
+    por_tipo = {}
+    for org in source['organos']:
+        tipos = tipos_por_organo.get(org['id'])
+        if tipos is None:
+            continue
+        unidos = por_tipo.setdefault((org['tipoOrganismoId'], org.get('materiaId')), {})
+        for t in tipos:
+            unidos.setdefault(t['id'], t)
+
+    tipos_organo = []
+    for entrada in source['tiposOrgano']:
+        unidos = por_tipo.get((entrada['TipoOrganismoId'], entrada.get('MateriaOrganismoId')))
+        if unidos is not None:
+            entrada = dict(entrada, tiposAsunto=[
+                {'id': t['id'], 'nombre': t['nombre']}
+                for t in sorted(unidos.values(), key=lambda t: t['id'] if isinstance(t['id'], int) else 0)
+            ])
+        tipos_organo.append(entrada)
+
+    tipos_asunto = {t['id']: t for t in source['tiposAsunto']}
+    for entrada in tipos_organo:
+        for t in entrada['tiposAsunto']:
+            tipos_asunto.setdefault(t['id'], {'id': t['id'], 'nombre': t['nombre'], 'tiposProcedimiento': []})
+
+    refreshed = dict(source,
+                     tiposAsunto=sorted(tipos_asunto.values(), key=lambda t: t['id'] if isinstance(t['id'], int) else 0),
+                     tiposOrgano=tipos_organo)
+    refreshed['resumen'] = dict(source.get('resumen', {}), totalOrganos=len(source['organos']),
+                                totalTiposAsunto=len(refreshed['tiposAsunto']),
+                                totalRelaciones=len(tipos_organo))
+    if {k: v for k, v in refreshed.items() if k != 'generado'} != {k: v for k, v in source.items() if k != 'generado'}:
+        refreshed['generado'] = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    return refreshed
+
+
+# ==================== CACHÉ INCREMENTAL ====================
+
+def hash_tipos(tipos):
+    contenido = json.dumps(tipos, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def load_cache(path=CACHE_PATH):
+    """Caché por órgano: {'organos': {id: {'sha256', 'obtenido', 'tipos'}}}"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {int(k): v for k, v in data.get('organos', {}).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    escribir_json_atomico(path, {'organos': {str(k): cache[k] for k in sorted(cache)}})
+
+
+def stale_organos(organos, cache, max_age_days=MAX_AGE_DAYS, force=False, now=None):
+    """Órganos sin respuesta en caché o con respuesta más vieja que `max_age_days`"""
+    if force:
+        return list(organos)
+    limite = (now or datetime.now()) - timedelta(days=max_age_days)
+    pendientes = []
+    for org in organos:
+        entrada = cache.get(org['id'])
+        if entrada is None or datetime.fromisoformat(entrada['obtenido']) < limite:
+            pendientes.append(org)
+    return pendientes
+
+
+def update_cache(cache, tipos_por_organo, now=None):
+    """
+    Guarda las respuestas nuevas en la caché
+
+    Los órganos que fallaron conservan su respuesta anterior (si la había).
+
+    Returns:
+        IDs de órganos cuya respuesta cambió respecto a la caché
+    """
+    obtenido = (now or datetime.now()).isoformat(timespec='seconds')
+    cambiados = []
+    for organo_id, tipos in tipos_por_organo.items():
+        if tipos is None:
+            continue
+        huella = hash_tipos(tipos)
+        anterior = cache.get(organo_id)
+        if anterior is None or anterior['sha256'] != huella:
+            cambiados.append(organo_id)
+        cache[organo_id] = {'sha256': huella, 'obtenido': obtenido, 'tipos': tipos}
+    return cambiados
+
+
+def diff_categorias(anterior, nuevo):
+    """
+    Tipos de asunto agregados y quitados por categoría
+
+    Returns:
+        dict categoría -> {'agregados': [...], 'quitados': [...]} (solo categorías con cambios)
+    """
+    cambios = {}
+    for cat in list(anterior) + [c for c in nuevo if c not in anterior]:
+        antes = {t['id']: t for t in anterior.get(cat, {}).get('tipos', [])}
+        despues = {t['id']: t for t in nuevo.get(cat, {}).get('tipos', [])}
+        agregados = [despues[i] for i in despues if i not in antes]
+        quitados = [antes[i] for i in antes if i not in despues]
+        if agregados or quitados:
+            cambios[cat] = {'agregados': agregados, 'quitados': quitados}
+    return cambios
+
+
+def write_if_changed(path, data):
+    """Escribe `data` como JSON solo si difiere del contenido actual; True si escribió"""
+    return escribir_bytes_si_cambia(path, serializar_json(data) + b'\n')
+
+
+def create_session(workers):
+    try:
+        import requests
+    except ImportError:
+        print('Error: Se requiere la librería "requests".')
+        print('Instálala con: pip install requests')
+        sys.exit(1)
 
-            if cat not in categorias_tipos:
-                categorias_tipos[cat] = {
-                    'label': CATEGORY_LABELS.get(cat, cat),
-                    'tipos': []
-                }
+    session = requests.Session()
+    # Una conexión por hilo en el pool de la sesión compartida
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount('https://', adapter)
+    return session
 
-            # Merge tipos únicos por ID
-            existing_ids = {t['id'] for t in categorias_tipos[cat]['tipos']}
-            nuevos = 0
-            for t in tipos:
-                if t['id'] not in existing_ids:
-                    categorias_tipos[cat]['tipos'].append(t)
-                    existing_ids.add(t['id'])
-                    nuevos += 1
 
-            total = len(categorias_tipos[cat]['tipos'])
-            print(f'    → {len(tipos)} tipos encontrados, {nuevos} nuevos (total: {total})')
+# ==================== MAIN ====================
 
-            time.sleep(0.5)  # Pausa para no saturar el servidor
+def main():
+    parser = argparse.ArgumentParser(description='Catálogo de tipos de asunto del SISE (PJF)')
+    parser.add_argument('--hilos', type=int, default=MAX_WORKERS, help=f'Hilos simultáneos (default {MAX_WORKERS})')
+    parser.add_argument('--tasa', type=float, default=RATE, help=f'Peticiones por segundo (default {RATE})')
+    parser.add_argument('--muestras', type=int, default=0,
+                        help='Órganos por categoría a consultar (default 0 = todos)')
+    parser.add_argument('--max-edad', type=float, default=MAX_AGE_DAYS,
+                        help=f'Días que una respuesta en caché sigue vigente (default {MAX_AGE_DAYS})')
+    parser.add_argument('--forzar', action='store_true', help='Reconsultar todos los órganos')
+    parser.add_argument('--cache', default=CACHE_PATH, help='Archivo de caché por órgano')
+    args = parser.parse_args()
 
-    # Ordenar tipos por ID dentro de cada categoría
-    for cat in categorias_tipos:
-        categorias_tipos[cat]['tipos'].sort(key=lambda t: t['id'] if isinstance(t['id'], int) else 0)
+    output_path = os.path.join(DATA_DIR, 'tipos_asunto.json')
+    catalogo = obtener_catalogo_pjf()
+
+    cache = load_cache(args.cache)
+    organos = select_organos(catalogo, args.muestras)
+    pendientes = stale_organos(organos, cache, args.max_edad, args.forzar)
+    print(f'{len(organos)} órganos: {len(organos) - len(pendientes)} vigentes en caché, '
+          f'{len(pendientes)} por consultar')
+
+    tipos_por_organo = {}
+    if pendientes:
+        print(f'Consultando {len(pendientes)} órganos ({args.hilos} hilos, máx. {args.tasa:g} peticiones/s)...\n')
+        session = create_session(args.hilos)
+        tipos_por_organo = fetch_tipos_organos(pendientes, session, workers=args.hilos, rate=args.tasa)
+
+    cambiados = update_cache(cache, tipos_por_organo)
+    # Los órganos que ya no están en organismos.json salen de la caché
+    for organo_id in [k for k in cache if k not in catalogo.por_id]:
+        del cache[organo_id]
+    save_cache(cache, args.cache)
+
+    fallidos = [i for i, tipos in tipos_por_organo.items() if tipos is None]
+    if fallidos:
+        print(f'\n⚠️  {len(fallidos)} órganos sin respuesta (se usa la caché anterior si existe): '
+              f'{fallidos[:20]}{" ..." if len(fallidos) > 20 else ""}')
+    print(f'{len(cambiados)} órganos con respuesta distinta a la guardada')
+
+    categorias_tipos = merge_tipos(organos, {k: v['tipos'] for k, v in cache.items()})
 
     # Construir salida
     output = {
@@ -220,14 +542,38 @@ def main():
         ]
     }
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-
-    print(f'\nGuardado en {output_path}')
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            anterior = json.load(f).get('por_categoria', {})
+    except (OSError, ValueError):
+        anterior = {}
+
+    cambios = diff_categorias(anterior, categorias_tipos)
+    for cat, cambio in cambios.items():
+        print(f'\n{cat}:')
+        for t in cambio['agregados']:
+            print(f'  + {t["id"]} {t["nombre"]}')
+        for t in cambio['quitados']:
+            print(f'  - {t["id"]} {t["nombre"]}')
+
+    if write_if_changed(output_path, output):
+        print(f'\nGuardado en {output_path}')
+    else:
+        print(f'\nSin cambios en {output_path} (no se reescribe)')
     print(f'\nCategorías encontradas:')
     for cat, data in categorias_tipos.items():
         print(f'  {cat}: {len(data["tipos"])} tipos de asunto')
 
+    # Fuente de los artefactos: los tipos por tipo de órgano salen del crawl recién unido
+    with open(artefactos_pjf.ARCHIVO_ORIGEN, 'r', encoding='utf-8') as f:
+        fuente = json.load(f)
+    fuente = refresh_source_catalog(fuente, {k: v['tipos'] for k, v in cache.items()})
+    if escribir_bytes_si_cambia(artefactos_pjf.ARCHIVO_ORIGEN, serializar_json(fuente)):
+        print(f'Actualizado {artefactos_pjf.ARCHIVO_ORIGEN}')
+
+    # Artefactos para la app web (índice compacto, fragmentos por circuito, .gz/.br)
+    artefactos_pjf.resumen(*artefactos_pjf.generar())
+
 
 if __name__ == '__main__':
     main()
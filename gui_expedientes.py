@@ -6,16 +6,244 @@ TSJ Quintana Roo - Lista Electrónica
 
 Permite agregar/eliminar expedientes y ejecutar búsquedas desde una GUI amigable
 FIX v6.2: Usa rutas absolutas para evitar errores de permisos
+
+Las búsquedas se ejecutan dentro del mismo proceso en un hilo de trabajo: el
+navegador se reutiliza entre ejecuciones, el progreso se muestra en vivo y la
+búsqueda se puede cancelar conservando los resultados parciales.
+
+Los cambios en la lista se guardan solos: la escritura de expedientes.json se
+agrupa (debounce), se hace en segundo plano y es atómica (archivo temporal +
+rename), y se omite si el contenido no cambió.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import json
 import os
-import subprocess
+import queue
 import threading
+import time
 from datetime import datetime
 
+from catalogo_juzgados import obtener_catalogo
+from indice_juzgados import IndiceJuzgados
+from persistencia import AutoGuardado
+from vigilancia import clave_expediente
+
+
+class ListaVirtual:
+    """
+    Treeview virtualizado: solo existen tantas filas como caben en pantalla
+
+    Los datos viven en una lista de Python; el Treeview mantiene un conjunto
+    fijo de filas que se reescriben al desplazarse. Agregar o eliminar un
+    elemento solo actualiza las filas visibles cuyo contenido cambió, así que
+    el costo no depende del tamaño de la lista (probado con 20,000 entradas).
+    """
+
+    def __init__(self, parent, columnas, formatear_fila, alto_fila=20):
+        self.datos = []
+        self.formatear_fila = formatear_fila  # elemento -> tupla de valores
+        self.alto_fila = alto_fila
+        self.inicio = 0            # Índice del primer elemento visible
+        self.filas = []            # iids del conjunto fijo de filas
+        self.valores = {}          # iid -> valores mostrados (para no reescribir sin cambios)
+        self.seleccionado = None   # Índice absoluto del elemento seleccionado
+
+        self.scrollbar = ttk.Scrollbar(parent, command=self._desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(
+            parent,
+            columns=columnas,
+            show="headings",
+            selectmode="browse",
+            height=1
+        )
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self._al_redimensionar)
+        self.tree.bind('<<TreeviewSelect>>', self._al_seleccionar)
+        self.tree.bind('<MouseWheel>', lambda e: self._desplazar('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda e: self._desplazar('scroll', -1, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self._desplazar('scroll', 1, 'units'))
+        self.tree.bind('<Up>', lambda e: self._mover_seleccion(-1))
+        self.tree.bind('<Down>', lambda e: self._mover_seleccion(1))
+
+    # ---------- API ----------
+
+    def set_datos(self, datos):
+        self.datos = datos
+        self.seleccionado = None
+        self.refrescar()
+
+    def insertado(self, indice):
+        """Notifica que se insertó un elemento en `indice`"""
+        if self.seleccionado is not None and indice <= self.seleccionado:
+            self.seleccionado += 1
+        self.refrescar()
+
+    def eliminado(self, indice):
+        """Notifica que se eliminó el elemento en `indice`"""
+        if self.seleccionado == indice:
+            self.seleccionado = None
+        elif self.seleccionado is not None and indice < self.seleccionado:
+            self.seleccionado -= 1
+        self.refrescar()
+
+    def indice_seleccionado(self):
+        return self.seleccionado
+
+    def ver(self, indice):
+        """Desplaza la vista para que `indice` quede visible"""
+        visibles = len(self.filas)
+        if indice < self.inicio:
+            self.inicio = indice
+        elif indice >= self.inicio + visibles:
+            self.inicio = indice - visibles + 1
+        self.refrescar()
+
+    # ---------- Renderizado ----------
+
+    def refrescar(self):
+        """Reescribe solo las filas visibles que cambiaron"""
+        visibles = len(self.filas)
+        total = len(self.datos)
+        self.inicio = max(0, min(self.inicio, total - visibles))
+
+        for pos, iid in enumerate(self.filas):
+            indice = self.inicio + pos
+            if indice < total:
+                valores = tuple(self.formatear_fila(self.datos[indice]))
+                if self.valores.get(iid) is None:  # Fila oculta: volver a mostrarla
+                    self.tree.reattach(iid, '', pos)
+                if self.valores.get(iid) != valores:
+                    self.tree.item(iid, values=valores)
+                    self.valores[iid] = valores
+            elif self.valores.get(iid) is not None:
+                self.tree.detach(iid)
+                self.valores[iid] = None
+
+        # Mantener la selección visual sincronizada con el índice absoluto
+        if self.seleccionado is not None and self.inicio <= self.seleccionado < self.inicio + visibles:
+            iid = self.filas[self.seleccionado - self.inicio]
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self.inicio / total, min(1.0, (self.inicio + visibles) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _al_redimensionar(self, event):
+        encabezado = self.alto_fila + 5
+        necesarias = max(1, (event.height - encabezado) // self.alto_fila)
+        while len(self.filas) < necesarias:
+            iid = self.tree.insert("", tk.END, values=())
+            self.filas.append(iid)
+            self.valores[iid] = ()
+        while len(self.filas) > necesarias:
+            iid = self.filas.pop()
+            self.tree.delete(iid)
+            self.valores.pop(iid, None)
+        self.refrescar()
+
+    def _desplazar(self, accion, cantidad=None, unidad=None):
+        visibles = max(1, len(self.filas))
+        if accion == 'moveto':
+            self.inicio = int(float(cantidad) * len(self.datos))
+        elif accion == 'scroll':
+            paso = visibles if unidad == 'pages' else 1
+            self.inicio += int(cantidad) * paso
+        self.refrescar()
+        return 'break'
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion and seleccion[0] in self.filas:
+            indice = self.inicio + self.filas.index(seleccion[0])
+            if indice < len(self.datos):
+                self.seleccionado = indice
+
+    def _mover_seleccion(self, paso):
+        if not self.datos:
+            return 'break'
+        actual = self.seleccionado if self.seleccionado is not None else self.inicio - paso
+        self.seleccionado = max(0, min(len(self.datos) - 1, actual + paso))
+        self.ver(self.seleccionado)
+        return 'break'
+
+
+class SelectorJuzgado:
+    """
+    Selector de juzgado con búsqueda incremental
+
+    Se escribe cualquier parte del nombre ("seg fam canc") y la lista muestra
+    al instante los juzgados que coinciden; las flechas y Enter eligen uno.
+    """
+
+    def __init__(self, parent, indice, alto=6, limite=100):
+        self.indice = indice
+        self.limite = limite
+        self.coincidencias = []
+
+        self.var = tk.StringVar()
+        self.entry = tk.Entry(parent, textvariable=self.var, font=("Arial", 10))
+        self.entry.pack(fill=tk.X, pady=(5, 0))
+
+        frame_lista = tk.Frame(parent)
+        frame_lista.pack(fill=tk.X)
+        self.listbox = tk.Listbox(frame_lista, height=alto, font=("Arial", 9), exportselection=False)
+        scroll = ttk.Scrollbar(frame_lista, orient=tk.VERTICAL, command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=scroll.set)
+        self.listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.var.trace_add('write', lambda *args: self.filtrar())
+        self.entry.bind('<Down>', lambda e: self._mover(1))
+        self.entry.bind('<Up>', lambda e: self._mover(-1))
+        self.entry.bind('<Return>', lambda e: self.elegir())
+        self.listbox.bind('<<ListboxSelect>>', lambda e: self.elegir())
+
+        self.filtrar()
+
+    def filtrar(self):
+        """Actualiza la lista con las coincidencias de lo escrito (en cada tecla)"""
+        self.coincidencias = self.indice.buscar(self.var.get(), self.limite)
+        self.listbox.delete(0, tk.END)
+        if self.coincidencias:
+            self.listbox.insert(tk.END, *[nombre for nombre, _ in self.coincidencias])
+            self.listbox.selection_set(0)
+
+    def _mover(self, paso):
+        if not self.coincidencias:
+            return "break"
+        actual = self.listbox.curselection()
+        nueva = min(max((actual[0] if actual else -1) + paso, 0), len(self.coincidencias) - 1)
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(nueva)
+        self.listbox.see(nueva)
+        return "break"
+
+    def elegir(self):
+        actual = self.listbox.curselection()
+        if actual:
+            self.set(self.coincidencias[actual[0]][0])
+        return "break"
+
+    def set(self, nombre):
+        self.var.set(nombre)
+        self.entry.icursor(tk.END)
+
+    def get(self):
+        """Nombre oficial elegido: el escrito si es exacto, o la única coincidencia; si no, None"""
+        exacto = self.indice.exacto(self.var.get())
+        if exacto is None and len(self.coincidencias) == 1:
+            return self.coincidencias[0][0]
+        return exacto
+
 
 class ExpedientesGUI:
     def __init__(self, root):
@@ -29,9 +257,20 @@ class ExpedientesGUI:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.archivo_json = os.path.join(script_dir, "expedientes.json")
         self.expedientes = []
+        self.indice_expedientes = {}  # clave_expediente -> expediente (detección de duplicados)
+        self.datos_json = {}          # Resto del documento (config, juzgados_disponibles...) en memoria
+        self.autoguardado = AutoGuardado(self.archivo_json, self.instantanea_json)
+
+        # Ejecución de búsquedas en segundo plano
+        self.bot = None                      # Se conserva entre ejecuciones (navegador abierto)
+        self.eventos = queue.Queue()         # Eventos del hilo de trabajo -> hilo de Tk
+        self.cancelar_evento = threading.Event()
+        self.busqueda_activa = False
 
         # Lista de juzgados/salas (ordenados por categoría)
         self.juzgados = self.obtener_lista_juzgados()
+        self.indice_juzgados = IndiceJuzgados(
+            (nombre, categoria) for categoria, nombres in self.juzgados.items() for nombre in nombres)
 
         # Cargar expedientes existentes
         self.cargar_expedientes()
@@ -40,80 +279,15 @@ class ExpedientesGUI:
         self.crear_interfaz()
 
         # Actualizar lista
+        self.lista.set_datos(self.expedientes)
         self.actualizar_lista_expedientes()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self.root.after(1000, self.actualizar_estado_guardado)
+
     def obtener_lista_juzgados(self):
-        """Obtiene lista completa de juzgados y salas organizados"""
-        return {
-            "🏛️ SALAS DE SEGUNDA INSTANCIA": [
-                "PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR",
-                "SEGUNDA SALA PENAL ORAL",
-                "TERCERA SALA PENAL ORAL",
-                "CUARTA SALA CIVIL MERCANTIL Y FAMILIAR",
-                "QUINTA SALA CIVIL MERCANTIL Y FAMILIAR",
-                "SEXTA SALA CIVIL MERCANTIL Y FAMILIAR",
-                "SEPTIMA SALA PENAL TRADICIONAL",
-                "OCTAVA SALA PENAL ORAL",
-                "NOVENA SALA PENAL ORAL",
-                "DECIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA",
-                "SALA CONSTITUCIONAL",
-            ],
-            "📍 CANCÚN - Familiar": [
-                "JUZGADO PRIMERO FAMILIAR ORAL CANCUN",
-                "JUZGADO SEGUNDO FAMILIAR ORAL CANCUN",
-                "JUZGADO SEGUNDO DE LO FAMILIAR CANCUN",
-                "JUZGADO FAMILIAR DE PRIMERA INSTANCIA CANCUN",
-            ],
-            "📍 CANCÚN - Civil": [
-                "JUZGADO PRIMERO CIVIL CANCUN",
-                "JUZGADO SEGUNDO CIVIL CANCUN",
-                "JUZGADO TERCERO CIVIL CANCUN",
-                "JUZGADO CUARTO CIVIL CANCUN",
-                "JUZGADO ORAL CIVIL CANCUN",
-            ],
-            "📍 CANCÚN - Mercantil": [
-                "JUZGADO PRIMERO MERCANTIL CANCUN",
-                "JUZGADO SEGUNDO MERCANTIL CANCUN",
-                "JUZGADO TERCERO MERCANTIL CANCUN",
-                "JUZGADO ORAL MERCANTIL CANCUN",
-            ],
-            "📍 CANCÚN - Laboral": [
-                "TRIBUNAL PRIMERO LABORAL CANCUN",
-                "TRIBUNAL SEGUNDO LABORAL CANCUN",
-            ],
-            "📍 PLAYA DEL CARMEN": [
-                "JUZGADO FAMILIAR ORAL PLAYA",
-                "JUZGADO FAMILIAR PRIMERA INSTANCIA PLAYA",
-                "JUZGADO PRIMERO CIVIL PLAYA",
-                "JUZGADO SEGUNDO CIVIL PLAYA",
-                "JUZGADO ORAL CIVIL PLAYA",
-                "JUZGADO MERCANTIL PLAYA",
-                "TRIBUNAL LABORAL PLAYA",
-            ],
-            "📍 CHETUMAL": [
-                "JUZGADO FAMILIAR ORAL CHETUMAL",
-                "JUZGADO FAMILIAR PRIMERA INSTANCIA CHETUMAL",
-                "JUZGADO CIVIL CHETUMAL",
-                "JUZGADO MERCANTIL CHETUMAL",
-                "JUZGADO CIVIL ORAL CHETUMAL",
-                "TRIBUNAL LABORAL CHETUMAL",
-            ],
-            "📍 OTROS MUNICIPIOS": [
-                "JUZGADO FAMILIAR COZUMEL",
-                "JUZGADO CIVIL COZUMEL",
-                "JUZGADO FAMILIAR ORAL COZUMEL",
-                "JUZGADO ORAL CIVIL COZUMEL",
-                "JUZGADO CIVIL ORAL CARRILLO PUERTO",
-                "JUZGADO FAMILIAR ORAL CARRILLO PUERTO",
-                "JUZGADO CIVIL PRIMERA INSTANCIA CARRILLO PUERTO",
-                "JUZGADO FAMILIAR PRIMERA INSTANCIA CARRILLO PUERTO",
-                "JUZGADO CIVIL ORAL ISLA MUJERES",
-                "JUZGADO FAMILIAR ORAL ISLA MUJERES",
-                "JUZGADO CIVIL ORAL TULUM",
-                "JUZGADO FAMILIAR ORAL TULUM",
-                "JUZGADO FAMILIAR PRIMERA INSTANCIA BACALAR",
-            ]
-        }
+        """Obtiene lista completa de juzgados y salas organizados (del catálogo compilado)"""
+        return dict(obtener_catalogo().grupos)
 
     def crear_interfaz(self):
         """Crea todos los elementos de la interfaz"""
@@ -141,8 +315,17 @@ class ExpedientesGUI:
         subtitulo.pack(pady=0)
 
         # ========== FRAME PRINCIPAL ==========
-        frame_principal = tk.Frame(self.root)
-        frame_principal.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        frame_principal = tk.Frame(self.notebook)
+        self.notebook.add(frame_principal, text="📋 Expedientes")
+
+        # Pestaña de resultados: se carga al abrirla por primera vez
+        self.frame_resultados = tk.Frame(self.notebook)
+        self.notebook.add(self.frame_resultados, text="📊 Resultados")
+        self.historial_resultados = None
+        self.notebook.bind('<<NotebookTabChanged>>', self.al_cambiar_pestana)
 
         # Dividir en dos columnas: Formulario (izq) y Lista (der)
         frame_izquierda = tk.Frame(frame_principal)
@@ -215,24 +398,9 @@ class ExpedientesGUI:
 
         tk.Label(frame_juzgado, text="Juzgado/Sala:", font=("Arial", 10)).pack(anchor=tk.W)
 
-        # Lista de juzgados con categorías
-        self.combo_juzgado = ttk.Combobox(
-            frame_juzgado,
-            font=("Arial", 9),
-            state="readonly",
-            width=50
-        )
-        self.combo_juzgado.pack(fill=tk.X, pady=5)
-
-        # Poblar combo con categorías
-        opciones = []
-        for categoria, juzgados in self.juzgados.items():
-            opciones.append(categoria)  # Categoría como separador
-            opciones.extend(juzgados)
-            opciones.append("---")  # Separador visual
-
-        self.combo_juzgado['values'] = opciones
-        self.combo_juzgado.current(1)  # Seleccionar primer juzgado real
+        # Búsqueda incremental sobre el catálogo (escribe parte del nombre)
+        self.selector_juzgado = SelectorJuzgado(frame_juzgado, self.indice_juzgados)
+        self.selector_juzgado.set(self.indice_juzgados.nombres()[0])
 
         # Comentario (opcional)
         frame_comentario = tk.Frame(frame_izquierda)
@@ -293,22 +461,25 @@ class ExpedientesGUI:
         )
         self.label_contador.pack(side=tk.LEFT, padx=10)
 
+        self.label_guardado = tk.Label(
+            frame_titulo_lista,
+            text="",
+            font=("Arial", 9),
+            fg="gray"
+        )
+        self.label_guardado.pack(side=tk.RIGHT)
+
         # Treeview para lista de expedientes
         frame_tree = tk.Frame(frame_derecha)
         frame_tree.pack(fill=tk.BOTH, expand=True)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(frame_tree)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Treeview
-        self.tree = ttk.Treeview(
+        # Lista virtualizada: solo se dibujan las filas visibles
+        self.lista = ListaVirtual(
             frame_tree,
-            columns=("tipo", "busqueda", "juzgado"),
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            selectmode="browse"
+            columnas=("tipo", "busqueda", "juzgado"),
+            formatear_fila=self.formatear_fila
         )
+        self.tree = self.lista.tree
 
         self.tree.heading("tipo", text="Tipo")
         self.tree.heading("busqueda", text="Expediente/Nombre")
@@ -318,9 +489,6 @@ class ExpedientesGUI:
         self.tree.column("busqueda", width=150, anchor=tk.W)
         self.tree.column("juzgado", width=300, anchor=tk.W)
 
-        self.tree.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.tree.yview)
-
         # Botones de gestión de lista
         frame_botones_lista = tk.Frame(frame_derecha)
         frame_botones_lista.pack(fill=tk.X, pady=10)
@@ -351,6 +519,19 @@ class ExpedientesGUI:
         )
         btn_limpiar_todo.pack(side=tk.LEFT)
 
+        self.btn_importar = tk.Button(
+            frame_botones_lista,
+            text="📥 Importar CSV/Excel",
+            command=self.importar_archivo,
+            bg="#009688",
+            fg="white",
+            font=("Arial", 10),
+            padx=10,
+            pady=8,
+            cursor="hand2"
+        )
+        self.btn_importar.pack(side=tk.RIGHT)
+
         # ========== FRAME INFERIOR - ACCIONES ==========
         frame_inferior = tk.Frame(self.root, bg="#f5f5f5", height=80)
         frame_inferior.pack(fill=tk.X, padx=0, pady=0)
@@ -358,7 +539,7 @@ class ExpedientesGUI:
         frame_acciones = tk.Frame(frame_inferior, bg="#f5f5f5")
         frame_acciones.pack(pady=15)
 
-        btn_ejecutar = tk.Button(
+        self.btn_ejecutar = btn_ejecutar = tk.Button(
             frame_acciones,
             text="🚀 EJECUTAR BÚSQUEDA",
             command=self.ejecutar_busqueda,
@@ -386,6 +567,176 @@ class ExpedientesGUI:
         )
         btn_guardar.pack(side=tk.LEFT, padx=5)
 
+        self.btn_cancelar = tk.Button(
+            frame_acciones,
+            text="⏹️ Cancelar",
+            command=self.cancelar_busqueda,
+            bg="#757575",
+            fg="white",
+            font=("Arial", 11),
+            padx=20,
+            pady=12,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        self.btn_cancelar.pack(side=tk.LEFT, padx=5)
+
+        # Progreso de la búsqueda en curso
+        frame_progreso = tk.Frame(frame_inferior, bg="#f5f5f5")
+        frame_progreso.pack(fill=tk.X, padx=20, pady=(0, 10))
+
+        self.progreso = ttk.Progressbar(frame_progreso, mode="determinate")
+        self.progreso.pack(fill=tk.X)
+
+        self.label_progreso = tk.Label(
+            frame_progreso,
+            text="Sin búsquedas en curso",
+            font=("Arial", 9),
+            bg="#f5f5f5",
+            fg="gray"
+        )
+        self.label_progreso.pack(anchor=tk.W)
+
+    def crear_pestana_resultados(self):
+        """Crea el visor de resultados: filtros, tabla paginada y navegación"""
+        frame = self.frame_resultados
+
+        # ---------- Filtros ----------
+        frame_filtros = tk.Frame(frame)
+        frame_filtros.pack(fill=tk.X, pady=(5, 10))
+
+        tk.Label(frame_filtros, text="Juzgado:", font=("Arial", 9)).pack(side=tk.LEFT)
+        self.filtro_juzgado = tk.Entry(frame_filtros, font=("Arial", 9), width=18)
+        self.filtro_juzgado.pack(side=tk.LEFT, padx=(2, 8))
+
+        tk.Label(frame_filtros, text="Desde:", font=("Arial", 9)).pack(side=tk.LEFT)
+        self.filtro_desde = tk.Entry(frame_filtros, font=("Arial", 9), width=10)
+        self.filtro_desde.pack(side=tk.LEFT, padx=(2, 8))
+
+        tk.Label(frame_filtros, text="Hasta:", font=("Arial", 9)).pack(side=tk.LEFT)
+        self.filtro_hasta = tk.Entry(frame_filtros, font=("Arial", 9), width=10)
+        self.filtro_hasta.pack(side=tk.LEFT, padx=(2, 8))
+
+        self.filtro_nuevos = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_filtros, text="Solo nuevos", variable=self.filtro_nuevos,
+                       font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 8))
+
+        tk.Label(frame_filtros, text="Texto:", font=("Arial", 9)).pack(side=tk.LEFT)
+        self.filtro_texto = tk.Entry(frame_filtros, font=("Arial", 9), width=18)
+        self.filtro_texto.pack(side=tk.LEFT, padx=(2, 8))
+        for entry in (self.filtro_juzgado, self.filtro_desde, self.filtro_hasta, self.filtro_texto):
+            entry.bind('<Return>', lambda e: self.aplicar_filtros())
+
+        tk.Button(frame_filtros, text="🔍 Filtrar", command=self.aplicar_filtros,
+                  font=("Arial", 9), cursor="hand2").pack(side=tk.LEFT, padx=2)
+        tk.Button(frame_filtros, text="✖ Limpiar", command=self.limpiar_filtros,
+                  font=("Arial", 9), cursor="hand2").pack(side=tk.LEFT, padx=2)
+
+        # ---------- Tabla ----------
+        frame_tabla = tk.Frame(frame)
+        frame_tabla.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar = ttk.Scrollbar(frame_tabla)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        columnas = ("fecha", "busqueda", "juzgado", "documento", "extracto", "nuevo")
+        self.tree_resultados = ttk.Treeview(
+            frame_tabla,
+            columns=columnas,
+            show="headings",
+            yscrollcommand=scrollbar.set
+        )
+        encabezados = {
+            "fecha": ("Fecha Pub.", 85), "busqueda": ("Expediente/Nombre", 110),
+            "juzgado": ("Juzgado/Sala", 200), "documento": ("Documento", 130),
+            "extracto": ("Extracto", 300), "nuevo": ("Nuevo", 60),
+        }
+        for col, (texto, ancho) in encabezados.items():
+            self.tree_resultados.heading(col, text=texto)
+            self.tree_resultados.column(col, width=ancho, anchor=tk.W)
+        self.tree_resultados.tag_configure('nuevo', background="#FFFF99")
+        self.tree_resultados.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree_resultados.yview)
+
+        # ---------- Paginación ----------
+        frame_paginas = tk.Frame(frame)
+        frame_paginas.pack(fill=tk.X, pady=5)
+
+        self.btn_anterior = tk.Button(frame_paginas, text="◀ Anterior", font=("Arial", 9),
+                                      command=lambda: self.mostrar_pagina_resultados(self.pagina_resultados - 1))
+        self.btn_anterior.pack(side=tk.LEFT)
+        self.label_pagina = tk.Label(frame_paginas, text="", font=("Arial", 9))
+        self.label_pagina.pack(side=tk.LEFT, padx=10)
+        self.btn_siguiente = tk.Button(frame_paginas, text="Siguiente ▶", font=("Arial", 9),
+                                       command=lambda: self.mostrar_pagina_resultados(self.pagina_resultados + 1))
+        self.btn_siguiente.pack(side=tk.LEFT)
+
+        self.pagina_resultados = 0
+        self.filtro_resultados = None
+
+    def al_cambiar_pestana(self, event):
+        """Abre el historial de resultados la primera vez que se muestra la pestaña"""
+        if self.notebook.index(self.notebook.select()) != 1:
+            return
+        if self.historial_resultados is None:
+            from historial_resultados import HistorialResultados, ARCHIVO_HISTORIAL
+            self.crear_pestana_resultados()
+            self.historial_resultados = HistorialResultados(ARCHIVO_HISTORIAL)
+        # Siempre se muestra la página actual: incluye filas de búsquedas recientes
+        self.mostrar_pagina_resultados(self.pagina_resultados)
+
+    def aplicar_filtros(self):
+        from historial_resultados import FiltroResultados
+
+        fechas = []
+        for entry in (self.filtro_desde, self.filtro_hasta):
+            texto = entry.get().strip()
+            if not texto:
+                fechas.append(None)
+                continue
+            try:
+                fechas.append(datetime.strptime(texto, '%d/%m/%Y'))
+            except ValueError:
+                messagebox.showwarning("Advertencia", f"Fecha no válida: {texto}\n\nUsa el formato dd/mm/aaaa")
+                return
+
+        self.filtro_resultados = FiltroResultados(
+            juzgado=self.filtro_juzgado.get(),
+            desde=fechas[0],
+            hasta=fechas[1],
+            solo_nuevos=self.filtro_nuevos.get(),
+            texto=self.filtro_texto.get()
+        )
+        self.mostrar_pagina_resultados(0)
+
+    def limpiar_filtros(self):
+        for entry in (self.filtro_juzgado, self.filtro_desde, self.filtro_hasta, self.filtro_texto):
+            entry.delete(0, tk.END)
+        self.filtro_nuevos.set(False)
+        self.filtro_resultados = None
+        self.mostrar_pagina_resultados(0)
+
+    def mostrar_pagina_resultados(self, numero, tam=100):
+        """Lee del historial solo la página solicitada y la muestra"""
+        if numero < 0:
+            return
+        filas, hay_mas = self.historial_resultados.pagina(numero, tam, self.filtro_resultados)
+        if not filas and numero > 0:
+            return
+
+        self.pagina_resultados = numero
+        self.tree_resultados.delete(*self.tree_resultados.get_children())
+        for fila in filas:
+            self.tree_resultados.insert("", tk.END, values=(
+                fila['Fecha Publicación'], fila['Búsqueda'], fila['Juzgado'],
+                fila['Documento'] or fila['Estado'], fila['Extracto'], fila['Nuevo']
+            ), tags=('nuevo',) if fila['Nuevo'] else ())
+
+        total = self.historial_resultados.total()
+        self.label_pagina.config(text=f"Página {numero + 1} · {len(filas)} filas · {total} en el historial")
+        self.btn_anterior.config(state=tk.NORMAL if numero > 0 else tk.DISABLED)
+        self.btn_siguiente.config(state=tk.NORMAL if hay_mas else tk.DISABLED)
+
     def cambiar_tipo_busqueda(self):
         """Cambia las etiquetas según el tipo de búsqueda"""
         if self.tipo_busqueda.get() == "numero":
@@ -400,7 +751,7 @@ class ExpedientesGUI:
     def agregar_expediente(self):
         """Agrega un expediente a la lista"""
         texto = self.entry_texto.get().strip()
-        juzgado = self.combo_juzgado.get().strip()
+        juzgado = self.selector_juzgado.get()
         comentario = self.entry_comentario.get().strip()
 
         # Validaciones
@@ -408,8 +759,8 @@ class ExpedientesGUI:
             messagebox.showwarning("Advertencia", "Debes ingresar un número de expediente o nombre")
             return
 
-        if not juzgado or juzgado.startswith("📍") or juzgado.startswith("🏛️") or juzgado == "---":
-            messagebox.showwarning("Advertencia", "Debes seleccionar un juzgado/sala válido")
+        if not juzgado:
+            messagebox.showwarning("Advertencia", "Debes elegir un juzgado/sala de la lista")
             return
 
         # Crear expediente
@@ -426,33 +777,36 @@ class ExpedientesGUI:
             expediente["comentario"] = comentario
 
         # Verificar duplicados
-        for exp in self.expedientes:
-            if (exp.get("numero") == texto or exp.get("nombre") == texto) and exp.get("juzgado") == juzgado:
-                messagebox.showwarning("Advertencia", "Este expediente ya está en la lista")
-                return
+        clave = clave_expediente(expediente)
+        if clave in self.indice_expedientes:
+            messagebox.showwarning("Advertencia", "Este expediente ya está en la lista")
+            return
 
         # Agregar a la lista
         self.expedientes.append(expediente)
+        self.indice_expedientes[clave] = expediente
+        self.lista.insertado(len(self.expedientes) - 1)
+        self.lista.ver(len(self.expedientes) - 1)
         self.actualizar_lista_expedientes()
+        self.autoguardado.marcar_cambio()
         self.limpiar_formulario()
 
         messagebox.showinfo("Éxito", f"Expediente agregado correctamente\n\nTotal: {len(self.expedientes)} expedientes")
 
     def eliminar_expediente(self):
         """Elimina el expediente seleccionado"""
-        seleccion = self.tree.selection()
-        if not seleccion:
+        index = self.lista.indice_seleccionado()
+        if index is None:
             messagebox.showwarning("Advertencia", "Debes seleccionar un expediente de la lista")
             return
 
-        # Obtener índice
-        item = seleccion[0]
-        index = self.tree.index(item)
-
         # Confirmar
         if messagebox.askyesno("Confirmar", "¿Eliminar este expediente de la lista?"):
-            del self.expedientes[index]
+            exp = self.expedientes.pop(index)
+            self.indice_expedientes.pop(clave_expediente(exp), None)
+            self.lista.eliminado(index)
             self.actualizar_lista_expedientes()
+            self.autoguardado.marcar_cambio()
             messagebox.showinfo("Éxito", "Expediente eliminado")
 
     def limpiar_todos(self):
@@ -463,76 +817,134 @@ class ExpedientesGUI:
 
         if messagebox.askyesno("Confirmar", f"¿Eliminar TODOS los {len(self.expedientes)} expedientes?"):
             self.expedientes = []
+            self.indice_expedientes = {}
+            self.lista.set_datos(self.expedientes)
             self.actualizar_lista_expedientes()
+            self.autoguardado.marcar_cambio()
             messagebox.showinfo("Éxito", "Todos los expedientes eliminados")
 
+    def importar_archivo(self):
+        """Importa expedientes desde un CSV o Excel (lectura y validación en segundo plano)"""
+        ruta = filedialog.askopenfilename(
+            title="Importar expedientes",
+            filetypes=[("CSV o Excel", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx"), ("Todos", "*.*")]
+        )
+        if not ruta:
+            return
+
+        from importar_expedientes import importar
+
+        nombres = self.indice_juzgados.nombres()
+        existentes = list(self.expedientes)
+        estado = {}
+
+        def trabajar():
+            try:
+                estado['resultado'] = importar(ruta, nombres, existentes)
+            except Exception as e:
+                estado['error'] = e
+
+        hilo = threading.Thread(target=trabajar, daemon=True)
+        hilo.start()
+        self.btn_importar.config(state=tk.DISABLED)
+        self.label_guardado.config(text=f"📥 Importando {os.path.basename(ruta)}...", fg="gray")
+        self.root.after(100, self.terminar_importacion, hilo, estado)
+
+    def terminar_importacion(self, hilo, estado):
+        """Agrega el lote importado de una sola vez y muestra el reporte"""
+        if hilo.is_alive():
+            self.root.after(100, self.terminar_importacion, hilo, estado)
+            return
+        self.btn_importar.config(state=tk.NORMAL)
+
+        if 'error' in estado:
+            messagebox.showerror("Error", f"No se pudo importar el archivo:\n\n{estado['error']}")
+            return
+
+        resultado = estado['resultado']
+        # Se vuelve a comprobar contra la lista: pudo editarse mientras se importaba
+        agregados = [exp for exp in resultado.agregados if clave_expediente(exp) not in self.indice_expedientes]
+        resultado.ya_existentes += len(resultado.agregados) - len(agregados)
+        resultado.agregados = agregados
+
+        if agregados:
+            self.expedientes.extend(agregados)
+            self.indice_expedientes.update((clave_expediente(exp), exp) for exp in agregados)
+            self.lista.set_datos(self.expedientes)
+            self.lista.ver(len(self.expedientes) - 1)
+            self.actualizar_lista_expedientes()
+            self.autoguardado.marcar_cambio()
+
+        messagebox.showinfo("Importación terminada", resultado.reporte())
+
     def limpiar_formulario(self):
         """Limpia el formulario"""
         self.entry_texto.delete(0, tk.END)
         self.entry_comentario.delete(0, tk.END)
         self.entry_texto.focus()
 
-    def actualizar_lista_expedientes(self):
-        """Actualiza la vista de expedientes en el TreeView"""
-        # Limpiar
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Agregar expedientes
-        for exp in self.expedientes:
-            tipo = "📄 Expediente" if "numero" in exp else "👤 Nombre"
-            busqueda = exp.get("numero", exp.get("nombre", "N/A"))
-            juzgado = exp.get("juzgado", "N/A")
+    @staticmethod
+    def formatear_fila(exp):
+        """Valores de la fila de un expediente en la lista"""
+        tipo = "📄 Expediente" if "numero" in exp else "👤 Nombre"
+        busqueda = exp.get("numero", exp.get("nombre", "N/A"))
+        juzgado = exp.get("juzgado", "N/A")
 
-            # Truncar si es muy largo
-            if len(juzgado) > 45:
-                juzgado = juzgado[:42] + "..."
+        # Truncar si es muy largo
+        if len(juzgado) > 45:
+            juzgado = juzgado[:42] + "..."
 
-            self.tree.insert("", tk.END, values=(tipo, busqueda, juzgado))
+        return (tipo, busqueda, juzgado)
 
-        # Actualizar contador
+    def actualizar_lista_expedientes(self):
+        """Actualiza las filas visibles y el contador (no reconstruye la lista)"""
+        self.lista.refrescar()
         self.label_contador.config(text=f"({len(self.expedientes)} expedientes)")
 
     def cargar_expedientes(self):
-        """Carga expedientes desde el archivo JSON"""
+        """Carga expedientes desde el archivo JSON (se lee una sola vez)"""
         try:
             if os.path.exists(self.archivo_json):
                 with open(self.archivo_json, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.expedientes = data.get('expedientes', [])
+                self.expedientes = data.pop('expedientes', [])
+                self.datos_json = data
+                self.autoguardado.registrar_contenido_actual(self.instantanea_json())
+            self.indice_expedientes = {clave_expediente(exp): exp for exp in self.expedientes}
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar expedientes: {e}")
 
-    def guardar_expedientes(self):
-        """Guarda expedientes en el archivo JSON"""
-        try:
-            # Cargar estructura completa del JSON
-            data = {}
-            if os.path.exists(self.archivo_json):
-                with open(self.archivo_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-            # Actualizar solo la sección de expedientes
-            data['expedientes'] = self.expedientes
-
-            # Guardar
-            with open(self.archivo_json, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    def instantanea_json(self):
+        """Documento completo a guardar; copia superficial de la lista para escribirla en otro hilo"""
+        return dict(self.datos_json, expedientes=list(self.expedientes))
 
-            messagebox.showinfo("Éxito", f"✅ {len(self.expedientes)} expedientes guardados en {self.archivo_json}")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar: {e}")
+    def guardar_expedientes(self):
+        """Guarda de inmediato (botón 💾), sin bloquear la ventana"""
+        self.autoguardado.marcar_cambio()
+        threading.Thread(target=self.autoguardado.guardar_ahora, daemon=True).start()
+        self.label_guardado.config(text="💾 Guardando...", fg="gray")
+
+    def actualizar_estado_guardado(self):
+        """Muestra el estado del guardado automático (consulta periódica desde el hilo de Tk)"""
+        if self.autoguardado.ultimo_error is not None:
+            self.label_guardado.config(text=f"❌ Error al guardar: {self.autoguardado.ultimo_error}", fg="red")
+        elif self.autoguardado.hay_cambios_pendientes():
+            self.label_guardado.config(text="💾 Cambios sin guardar...", fg="gray")
+        elif self.autoguardado.ultimo_guardado is not None:
+            hora = datetime.fromtimestamp(self.autoguardado.ultimo_guardado).strftime('%H:%M:%S')
+            self.label_guardado.config(text=f"✅ Guardado {hora}", fg="green")
+        self.root.after(1000, self.actualizar_estado_guardado)
 
     def ejecutar_busqueda(self):
-        """Ejecuta el script de búsqueda"""
+        """Inicia la búsqueda en un hilo de trabajo dentro de este mismo proceso"""
+        if self.busqueda_activa:
+            messagebox.showinfo("Información", "Ya hay una búsqueda en curso")
+            return
+
         if not self.expedientes:
             messagebox.showwarning("Advertencia", "No hay expedientes para buscar.\n\nAgrega al menos un expediente primero.")
             return
 
-        # Guardar primero
-        self.guardar_expedientes()
-
         # Confirmar
         respuesta = messagebox.askyesno(
             "Confirmar Búsqueda",
@@ -542,46 +954,162 @@ class ExpedientesGUI:
         if not respuesta:
             return
 
-        # Ejecutar en un hilo separado para no bloquear la GUI
-        threading.Thread(target=self.ejecutar_script, daemon=True).start()
-
-        messagebox.showinfo(
-            "Búsqueda Iniciada",
-            "🚀 La búsqueda ha comenzado en segundo plano.\n\n"
-            "Se abrirá una ventana de Chrome con las búsquedas.\n\n"
-            "Al finalizar se generará el archivo Excel con los resultados."
-        )
-
-    def ejecutar_script(self):
-        """Ejecuta el script de búsqueda en segundo plano"""
+        self.busqueda_activa = True
+        self.con_publicaciones = 0
+        self.acuerdos_nuevos = 0
+        self.cancelar_evento.clear()
+        self.btn_ejecutar.config(state=tk.DISABLED)
+        self.btn_cancelar.config(state=tk.NORMAL, bg="#f44336")
+        self.progreso.config(value=0, maximum=len(self.expedientes))
+        self.label_progreso.config(text="Iniciando navegador...", fg="black")
+
+        # Copia de la lista: la GUI puede seguir editándose durante la búsqueda
+        threading.Thread(target=self.ejecutar_script, args=(list(self.expedientes),), daemon=True).start()
+        self.root.after(100, self.procesar_eventos)
+
+    def cancelar_busqueda(self):
+        """Solicita la cancelación; se detiene al terminar la búsqueda en curso"""
+        if self.busqueda_activa:
+            self.cancelar_evento.set()
+            self.btn_cancelar.config(state=tk.DISABLED)
+            self.label_progreso.config(text="Cancelando... (se guardarán los resultados parciales)")
+
+    def ejecutar_script(self, expedientes):
+        """Hilo de trabajo: ejecuta el bot y publica eventos de progreso en la cola"""
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(script_dir, "buscar_expedientes.py")
-
-        # Intentar primero con 'python' (Conda), luego con 'python3'
-        for python_cmd in ['python', 'python3']:
-            try:
-                subprocess.run([python_cmd, script_path], cwd=script_dir, check=True)
-                return  # Si funciona, salir
-            except FileNotFoundError:
-                continue  # Intentar con el siguiente comando
-            except subprocess.CalledProcessError as e:
-                # Si el comando existe pero falla, mostrar error específico
-                messagebox.showerror(
-                    "Error al ejecutar búsqueda",
-                    f"El script falló con {python_cmd}:\n\n{e}\n\n"
-                    f"Verifica que selenium y openpyxl estén instalados:\n"
-                    f"  conda install selenium openpyxl\n"
-                    f"o\n"
-                    f"  pip install selenium openpyxl"
+        try:
+            # Escribir cambios pendientes (si los hay) antes de empezar, fuera del hilo de Tk
+            self.autoguardado.guardar_ahora()
+
+            import navegador
+            from buscar_expedientes import TSJExpedientesBot
+            from planificador import HistorialBusquedas
+
+            if self.bot is None:
+                config = TSJExpedientesBot.cargar_configuracion(os.path.join(script_dir, 'config.json'))
+                self.bot = TSJExpedientesBot(
+                    max_pestanas=config.get('max_pestanas', 5),
+                    dias_acuerdos_nuevos=config.get('dias_acuerdos_nuevos', 5),
+                    arranque_rapido=config.get('arranque_rapido', True),
+                    limites_navegador=navegador.limites_desde_config(config),
+                    extraccion_red=config.get('extraccion_red', True),
+                    sincronizar_catalogo=config.get('sincronizar_catalogo', True)
                 )
-                return
-
-        # Si ninguno funcionó
-        messagebox.showerror(
-            "Error",
-            "No se pudo ejecutar el script.\n\n"
-            "Asegúrate de tener Python instalado."
-        )
+                self.bot.cancelado = self.cancelar_evento
+
+            bot = self.bot
+            bot.resultados = []
+            bot.duraciones = []
+            bot.al_completar = lambda exp, resultado, hechos, total: self.eventos.put(
+                ('progreso', exp, resultado, hechos, total))
+
+            expedientes = bot.preparar_expedientes(expedientes)
+            self.eventos.put(('total', len(expedientes)))
+
+            historial = HistorialBusquedas()
+            if bot.driver is None:
+                inicio = time.time()
+                bot.iniciar_navegador()
+                historial.registrar_arranque(time.time() - inicio)
+
+            bot.procesar_expedientes(expedientes)
+
+            for exp, duracion in bot.duraciones:
+                historial.registrar(exp, duracion)
+            historial.guardar()
+
+            # Se guardan también los resultados parciales de una búsqueda cancelada
+            total_nuevos = 0
+            if bot.resultados:
+                total_nuevos = bot.guardar_excel(os.path.join(script_dir, 'resultados_expedientes.xlsx'))
+                bot.guardar_csv(os.path.join(script_dir, 'resultados_expedientes.csv'))
+                bot.guardar_historial()
+
+            self.eventos.put(('fin', len(bot.resultados), len(expedientes), total_nuevos, self.cancelar_evento.is_set()))
+
+        except ImportError as e:
+            self.eventos.put(('error',
+                              f"Falta una dependencia: {e}\n\n"
+                              f"Verifica que selenium y openpyxl estén instalados:\n"
+                              f"  conda install selenium openpyxl\n"
+                              f"o\n"
+                              f"  pip install selenium openpyxl"))
+        except Exception as e:
+            # Navegador en estado desconocido: se reinicia en la próxima ejecución
+            if self.bot is not None:
+                try:
+                    self.bot.cerrar()
+                except Exception:
+                    pass
+                self.bot.driver = None
+            self.eventos.put(('error', f"La búsqueda falló:\n\n{e}"))
+
+    def procesar_eventos(self):
+        """Aplica en el hilo de Tk los eventos publicados por el hilo de trabajo"""
+        try:
+            while True:
+                evento = self.eventos.get_nowait()
+                tipo = evento[0]
+
+                if tipo == 'total':
+                    self.progreso.config(maximum=max(evento[1], 1))
+
+                elif tipo == 'progreso':
+                    _, exp, resultado, hechos, total = evento
+                    if resultado and resultado.get('publicaciones'):
+                        self.con_publicaciones += 1
+                        self.acuerdos_nuevos += sum(1 for p in resultado['publicaciones'] if p.get('es_nuevo'))
+                    termino = exp.get('numero', exp.get('nombre', 'N/A'))
+                    self.progreso.config(value=hechos)
+                    self.label_progreso.config(
+                        text=f"{hechos}/{total} búsquedas · {self.con_publicaciones} con publicaciones · "
+                             f"{self.acuerdos_nuevos} acuerdos nuevos · último: {termino}"
+                    )
+
+                elif tipo == 'fin':
+                    _, hechas, total, total_nuevos, cancelada = evento
+                    self.finalizar_busqueda()
+                    estado = "cancelada" if cancelada else "completada"
+                    self.label_progreso.config(text=f"Búsqueda {estado}: {hechas}/{total} búsquedas")
+                    # Sin resultados (p. ej. cancelada al inicio) no se escribió ningún archivo
+                    guardado = ("Resultados guardados en resultados_expedientes.xlsx" if hechas
+                                else "No hubo resultados que guardar")
+                    messagebox.showinfo(
+                        "Búsqueda " + estado,
+                        f"✅ Búsqueda {estado}: {hechas}/{total} búsquedas\n"
+                        f"⭐ Acuerdos nuevos: {total_nuevos}\n\n"
+                        f"{guardado}"
+                    )
+                    return
+
+                elif tipo == 'error':
+                    self.finalizar_busqueda()
+                    self.label_progreso.config(text="La búsqueda terminó con errores", fg="red")
+                    messagebox.showerror("Error al ejecutar búsqueda", evento[1])
+                    return
+
+        except queue.Empty:
+            pass
+
+        self.root.after(100, self.procesar_eventos)
+
+    def finalizar_busqueda(self):
+        self.busqueda_activa = False
+        self.btn_ejecutar.config(state=tk.NORMAL)
+        self.btn_cancelar.config(state=tk.DISABLED, bg="#757575")
+
+    def cerrar(self):
+        """Cierra la ventana y el navegador que se mantuvo abierto entre búsquedas"""
+        self.cancelar_evento.set()
+        self.autoguardado.guardar_ahora()
+        if self.autoguardado.ultimo_error is not None:
+            messagebox.showerror("Error", f"Error al guardar expedientes: {self.autoguardado.ultimo_error}")
+        if self.bot is not None and self.bot.driver is not None:
+            try:
+                self.bot.cerrar()
+            except Exception:
+                pass
+        self.root.destroy()
 
 
 def main():
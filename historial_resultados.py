@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historial acumulado de resultados con lectura paginada
+
+Cada ejecución agrega sus filas a historial_resultados.csv (una publicación por
+línea). Un índice binario de posiciones (historial_resultados.csv.idx) permite
+leer cualquier página sin cargar el archivo completo, de modo que el
+visor de resultados abre al instante aun con cientos de miles de filas.
+"""
+
+import csv
+import io
+import os
+from array import array
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_HISTORIAL = os.path.join(SCRIPT_DIR, 'historial_resultados.csv')
+
+CAMPOS = [
+    'Fecha Consulta', 'Búsqueda', 'Tipo', 'Juzgado', 'Estado',
+    'IdAcuerdo', 'Documento', 'Juicio', 'Promoventes',
+    'Demandados', 'Extracto', 'Fecha Publicación', 'Nuevo'
+]
+
+FILAS_POR_BLOQUE = 2000  # Filas leídas de una vez al recorrer con filtros
+
+
+def _limpiar(valor):
+    # Una fila por línea: el índice de posiciones depende de ello
+    return ' '.join(str(valor).split()) if valor is not None else ''
+
+
+def _fecha(texto):
+    for formato in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y'):
+        try:
+            return datetime.strptime(texto.strip(), formato)
+        except ValueError:
+            continue
+    return None
+
+
+class FiltroResultados:
+    """Criterios de filtrado; los campos vacíos no filtran"""
+
+    def __init__(self, juzgado='', desde=None, hasta=None, solo_nuevos=False, texto=''):
+        self.juzgado = juzgado.strip().upper()
+        self.desde = desde
+        self.hasta = hasta
+        self.solo_nuevos = solo_nuevos
+        self.texto = texto.strip().lower()
+
+    def vacio(self):
+        return not (self.juzgado or self.desde or self.hasta or self.solo_nuevos or self.texto)
+
+    def clave(self):
+        return (self.juzgado, self.desde, self.hasta, self.solo_nuevos, self.texto)
+
+    def descarta_linea(self, linea):
+        """
+        Prefiltro barato sobre el texto crudo, antes de interpretar el CSV
+
+        Solo descarta líneas que no pueden cumplir el filtro; la decisión final
+        la toma acepta() sobre la fila ya interpretada. Las comillas se duplican
+        en el CSV, así que un texto con comillas no se busca en crudo.
+        """
+        if self.texto and '"' not in self.texto and self.texto not in linea.lower():
+            return True
+        return bool(self.juzgado) and '"' not in self.juzgado and self.juzgado not in linea.upper()
+
+    def acepta(self, fila):
+        if self.juzgado and self.juzgado not in fila['Juzgado'].upper():
+            return False
+        if self.texto and not any(self.texto in valor.lower() for valor in fila.values()):
+            return False
+        if self.solo_nuevos and not fila['Nuevo']:
+            return False
+        if self.desde or self.hasta:
+            fecha = _fecha(fila['Fecha Publicación'])
+            if fecha is None:
+                return False
+            if self.desde and fecha < self.desde:
+                return False
+            if self.hasta and fecha > self.hasta:
+                return False
+        return True
+
+
+class HistorialResultados:
+    """Archivo CSV de solo-agregar con índice de posiciones por fila"""
+
+    def __init__(self, archivo=ARCHIVO_HISTORIAL):
+        self.archivo = archivo
+        self.archivo_indice = archivo + '.idx'
+        self.posiciones = array('Q')  # Inicio de cada fila de datos
+        self.fin_indexado = 0         # Bytes del CSV ya indexados
+        self._cursores = {}           # clave de filtro -> {página: posición en el índice}
+        self._cargar_indice()
+
+    # ---------- Índice ----------
+
+    def _cargar_indice(self):
+        try:
+            if os.path.exists(self.archivo_indice):
+                datos = array('Q')
+                with open(self.archivo_indice, 'rb') as f:
+                    datos.frombytes(f.read())
+                if datos and datos[-1] <= os.path.getsize(self.archivo):
+                    self.fin_indexado = datos.pop()
+                    self.posiciones = datos
+        except (OSError, ValueError):
+            self.posiciones, self.fin_indexado = array('Q'), 0
+        self._actualizar_indice()
+
+    def _actualizar_indice(self):
+        """Indexa solo las filas agregadas desde la última vez"""
+        if not os.path.exists(self.archivo):
+            return
+        tamano = os.path.getsize(self.archivo)
+        if tamano < self.fin_indexado:  # El archivo fue reemplazado: reindexar
+            self.posiciones, self.fin_indexado = array('Q'), 0
+        if tamano == self.fin_indexado:
+            return
+
+        with open(self.archivo, 'rb') as f:
+            f.seek(self.fin_indexado)
+            posicion = self.fin_indexado
+            if posicion == 0:
+                posicion += len(f.readline())  # Encabezado
+            for linea in f:
+                if linea.strip():
+                    self.posiciones.append(posicion)
+                posicion += len(linea)
+        self.fin_indexado = posicion
+        self._cursores = {}
+
+        with open(self.archivo_indice, 'wb') as f:
+            f.write(self.posiciones.tobytes())
+            f.write(array('Q', [self.fin_indexado]).tobytes())
+
+    # ---------- Escritura ----------
+
+    def agregar(self, resultados):
+        """Agrega al historial las filas de una ejecución (mismo formato que el CSV del bot)"""
+        nuevo = not os.path.exists(self.archivo) or os.path.getsize(self.archivo) == 0
+        with open(self.archivo, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if nuevo:
+                writer.writerow(CAMPOS)
+            for r in resultados:
+                base = [r['fecha_busqueda'], r['busqueda'], r['tipo_busqueda'], r['juzgado'], r['estado']]
+                for p in r['publicaciones'] or [None]:
+                    p = p or {}
+                    writer.writerow([_limpiar(v) for v in base + [
+                        p.get('id_acuerdo', ''), p.get('documento', ''), p.get('juicio', ''),
+                        p.get('promoventes', ''), p.get('demandados', ''), p.get('extracto', ''),
+                        p.get('fecha_publicacion', ''), 'NUEVO' if p.get('es_nuevo') else ''
+                    ]])
+        self._actualizar_indice()
+
+    # ---------- Lectura ----------
+
+    def total(self):
+        self._actualizar_indice()
+        return len(self.posiciones)
+
+    def _leer_bloque(self, f, desde, hasta):
+        """Filas del índice [desde, hasta) como lista de (texto, fila) en orden inverso"""
+        inicio = self.posiciones[desde]
+        fin = self.posiciones[hasta] if hasta < len(self.posiciones) else self.fin_indexado
+        f.seek(inicio)
+        lineas = f.read(fin - inicio).decode('utf-8', errors='replace').splitlines()
+        return list(reversed([l for l in lineas if l.strip()]))
+
+    def _filas(self, lineas):
+        return [dict(zip(CAMPOS, valores)) for valores in csv.reader(io.StringIO('\n'.join(lineas)))]
+
+    def pagina(self, numero, tam=100, filtro=None):
+        """
+        Devuelve una página de filas, de la más reciente a la más antigua
+
+        Sin filtro se lee directamente la porción del archivo que corresponde.
+        Con filtro se recorre el archivo por bloques desde el final y se
+        recuerda dónde empieza cada página para no repetir el recorrido.
+
+        Returns:
+            (filas, hay_mas)
+        """
+        self._actualizar_indice()
+        total = len(self.posiciones)
+        if not total:
+            return [], False
+
+        with open(self.archivo, 'rb') as f:
+            if filtro is None or filtro.vacio():
+                hasta = total - numero * tam
+                desde = max(0, hasta - tam)
+                if hasta <= 0:
+                    return [], False
+                return self._filas(self._leer_bloque(f, desde, hasta)), desde > 0
+
+            cursores = self._cursores.setdefault(filtro.clave(), {0: total})
+            conocida = max(p for p in cursores if p <= numero)
+            pagina_actual, hasta = conocida, cursores[conocida]
+            filas = []
+
+            while hasta > 0:
+                desde = max(0, hasta - FILAS_POR_BLOQUE)
+                lineas = self._leer_bloque(f, desde, hasta)
+                for i, linea in enumerate(lineas):
+                    if filtro.descarta_linea(linea):
+                        continue
+                    fila = self._filas([linea])[0]
+                    if not filtro.acepta(fila):
+                        continue
+                    if len(filas) == tam:
+                        # Empieza la página siguiente: recordar su posición
+                        pagina_actual += 1
+                        cursores[pagina_actual] = hasta - i
+                        if pagina_actual > numero:
+                            return filas, True
+                        filas = []
+                    filas.append(fila)
+                hasta = desde
+
+            if pagina_actual < numero:
+                return [], False
+            return filas, False
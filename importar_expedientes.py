@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de expedientes desde CSV o Excel (.xlsx)
+
+El archivo se lee fila por fila (sin cargarlo completo en memoria), se valida
+y normaliza en una sola pasada con las mismas reglas del lote de búsqueda,
+se descartan los que ya están en la lista y el resultado se agrega de una vez.
+
+Columnas reconocidas (sin importar mayúsculas ni acentos):
+    numero / expediente     - Número de expediente (NUM/AÑO)
+    nombre / actor          - Nombre a buscar (si no hay número)
+    juzgado / sala          - Juzgado o sala (se acepta escrito de forma aproximada)
+    comentario / nota       - Opcional
+    prioridad               - Opcional (alta, media, baja)
+
+Uso:
+    python importar_expedientes.py clientes.csv
+    python importar_expedientes.py clientes.xlsx --archivo expedientes.json --simular
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from catalogo_juzgados import obtener_catalogo
+from persistencia import escribir_json_atomico
+from planificador import crear_resolutor_juzgados, normalizar_nombre, normalizar_numero, preparar_lote
+from vigilancia import clave_expediente
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COLUMNAS = {
+    'numero': ('NUMERO', 'EXPEDIENTE', 'NO EXPEDIENTE', 'NUM EXPEDIENTE', 'NUMERO DE EXPEDIENTE'),
+    'nombre': ('NOMBRE', 'ACTOR', 'ACTORES', 'PARTE'),
+    'juzgado': ('JUZGADO', 'SALA', 'JUZGADO SALA', 'ORGANO', 'ORGANO JURISDICCIONAL'),
+    'comentario': ('COMENTARIO', 'COMENTARIOS', 'NOTA', 'NOTAS', 'OBSERVACIONES'),
+    'prioridad': ('PRIORIDAD',),
+}
+
+
+class ResultadoImportacion:
+    """Resumen de una importación"""
+
+    def __init__(self):
+        self.filas_leidas = 0
+        self.agregados = []       # Expedientes nuevos, normalizados
+        self.descartados = []     # (fila, motivo)
+        self.avisos = []          # (fila, motivo) de filas agregadas con algo sospechoso
+        self.duplicados = 0       # Repetidos dentro del mismo archivo
+        self.ya_existentes = 0    # Ya estaban en la lista
+        self.segundos = 0.0
+
+    def reporte(self, max_descartados=20):
+        lineas = [f"{icono} {etiqueta:<22} {valor}" for icono, etiqueta, valor in (
+            ('📥', 'Filas leídas:', self.filas_leidas),
+            ('✅', 'Agregados:', len(self.agregados)),
+            ('🔁', 'Ya en la lista:', self.ya_existentes),
+            ('🔁', 'Repetidos en archivo:', self.duplicados),
+            ('❌', 'Descartados:', len(self.descartados)),
+            ('⚠️', 'Con aviso:', len(self.avisos)),
+            ('⏱️', 'Tiempo:', f"{self.segundos:.2f}s"),
+        )]
+        if self.descartados:
+            lineas.append("")
+            lineas.append("Filas descartadas:")
+            for fila, motivo in self.descartados[:max_descartados]:
+                lineas.append(f"  Fila {fila}: {motivo}")
+            if len(self.descartados) > max_descartados:
+                lineas.append(f"  ... y {len(self.descartados) - max_descartados} más")
+        if self.avisos:
+            lineas.append("")
+            lineas.append("Filas agregadas con aviso:")
+            for fila, motivo in self.avisos[:max_descartados]:
+                lineas.append(f"  Fila {fila}: {motivo}")
+            if len(self.avisos) > max_descartados:
+                lineas.append(f"  ... y {len(self.avisos) - max_descartados} más")
+        return '\n'.join(lineas)
+
+
+def _mapear_encabezados(encabezados):
+    """Índice de columna para cada campo reconocido"""
+    alias = {a: campo for campo, nombres in COLUMNAS.items() for a in nombres}
+    mapa = {}
+    for i, encabezado in enumerate(encabezados):
+        campo = alias.get(normalizar_nombre(encabezado or ''))
+        if campo and campo not in mapa:
+            mapa[campo] = i
+    if 'juzgado' not in mapa or not ({'numero', 'nombre'} & set(mapa)):
+        raise ValueError("El archivo debe tener una columna de juzgado y otra de número o nombre")
+    return mapa
+
+
+def _filas_csv(ruta):
+    with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(f, dialecto)
+
+
+def _filas_xlsx(ruta):
+    from openpyxl import load_workbook  # Solo se necesita para archivos Excel
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        for valores in libro.active.iter_rows(values_only=True):
+            yield ['' if v is None else str(v) for v in valores]
+    finally:
+        libro.close()
+
+
+def leer_expedientes(ruta):
+    """
+    Genera los expedientes del archivo, uno por fila no vacía
+
+    Cada expediente lleva '_fila' (número de fila en el archivo) para el reporte.
+    """
+    filas = _filas_xlsx(ruta) if ruta.lower().endswith(('.xlsx', '.xlsm')) else _filas_csv(ruta)
+    mapa = None
+    for numero_fila, valores in enumerate(filas, 1):
+        if mapa is None:
+            mapa = _mapear_encabezados(valores)
+            continue
+        celdas = {campo: valores[i].strip() if i < len(valores) and valores[i] else ''
+                  for campo, i in mapa.items()}
+        if not any(celdas.values()):
+            continue
+
+        exp = {'_fila': numero_fila, 'juzgado': celdas['juzgado']}
+        if celdas.get('numero'):
+            exp['numero'] = celdas['numero']
+        elif celdas.get('nombre'):
+            exp['nombre'] = celdas['nombre']
+        if celdas.get('comentario'):
+            exp['comentario'] = celdas['comentario']
+        if celdas.get('prioridad'):
+            exp['prioridad'] = celdas['prioridad'].lower()
+        yield exp
+
+
+def _clave_normalizada(exp):
+    """Clave para comparar expedientes, con el número normalizado si es válido"""
+    if 'numero' in exp:
+        exp = dict(exp, numero=normalizar_numero(exp['numero']) or exp['numero'])
+    return clave_expediente(exp)
+
+
+def importar(ruta, nombres_juzgados, existentes=()):
+    """
+    Lee, valida y deduplica un archivo de expedientes
+
+    Args:
+        ruta: Archivo .csv o .xlsx
+        nombres_juzgados: Nombres oficiales de juzgados y salas
+        existentes: Expedientes que ya están en la lista
+
+    Returns:
+        ResultadoImportacion (los expedientes a agregar en .agregados)
+    """
+    inicio = time.time()
+    resultado = ResultadoImportacion()
+    claves_existentes = {_clave_normalizada(exp) for exp in existentes}
+
+    def contar(filas):
+        for exp in filas:
+            resultado.filas_leidas += 1
+            yield exp
+
+    # El "ID" del juzgado es su nombre oficial: así queda escrito en expedientes.json
+    validos, descartados, resultado.duplicados, avisos = preparar_lote(
+        contar(leer_expedientes(ruta)), crear_resolutor_juzgados(nombres_juzgados))
+    resultado.descartados = [(exp['_fila'], motivo) for exp, motivo in descartados]
+    resultado.avisos = [(exp['_fila'], motivo) for exp, motivo in avisos]
+
+    for exp in sorted(validos, key=lambda e: e['_fila']):  # Mismo orden que el archivo
+        exp['juzgado'] = exp.pop('id_juzgado')
+        del exp['_fila']
+        clave = _clave_normalizada(exp)
+        if clave in claves_existentes:
+            resultado.ya_existentes += 1
+            continue
+        claves_existentes.add(clave)
+        resultado.agregados.append(exp)
+
+    resultado.segundos = time.time() - inicio
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa expedientes desde un archivo CSV o Excel")
+    parser.add_argument('origen', help="Archivo .csv o .xlsx a importar")
+    parser.add_argument('--archivo', default=os.path.join(SCRIPT_DIR, 'expedientes.json'),
+                        help="Lista de expedientes a actualizar (default: expedientes.json)")
+    parser.add_argument('--simular', action='store_true', help="Muestra el reporte sin guardar cambios")
+    args = parser.parse_args()
+
+    try:
+        with open(args.archivo, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+
+    try:
+        resultado = importar(args.origen, obtener_catalogo().nombres(), data.get('expedientes', []))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error al importar: {e}")
+        sys.exit(1)
+
+    print(resultado.reporte())
+
+    if resultado.agregados and not args.simular:
+        data['expedientes'] = data.get('expedientes', []) + resultado.agregados
+        escribir_json_atomico(args.archivo, data)
+        print(f"\n💾 {len(resultado.agregados)} expedientes agregados a {args.archivo}")
+
+
+if __name__ == "__main__":
+    main()
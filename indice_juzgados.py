@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de búsqueda incremental de juzgados y salas
+
+Se construye una sola vez: cada palabra del nombre (y de su categoría), sin
+acentos ni mayúsculas, se registra bajo todos sus prefijos. Una consulta como
+"seg fam canc" se resuelve intersectando los conjuntos de "SEG", "FAM" y
+"CANC", sin recorrer el catálogo, de modo que responde en microsegundos aun
+con los ~1,000 organismos del catálogo federal.
+"""
+
+from planificador import normalizar_nombre
+
+
+class IndiceJuzgados:
+    """
+    Índice de prefijos por palabra sobre un catálogo de juzgados
+
+    Args:
+        entradas: Iterable de (nombre, categoria), en el orden en que deben mostrarse
+    """
+
+    def __init__(self, entradas):
+        self.entradas = []
+        self.claves = []       # Nombre normalizado de cada entrada
+        self.prefijos = {}     # prefijo -> tupla ordenada de posiciones
+        self._por_clave = {}   # nombre normalizado -> posición
+
+        prefijos = {}
+        for nombre, categoria in entradas:
+            clave = normalizar_nombre(nombre)
+            if not clave or clave in self._por_clave:
+                continue
+            posicion = len(self.entradas)
+            self.entradas.append((nombre, categoria))
+            self.claves.append(clave)
+            self._por_clave[clave] = posicion
+
+            for palabra in set(clave.split()) | set(normalizar_nombre(categoria).split()):
+                for i in range(1, len(palabra) + 1):
+                    prefijos.setdefault(palabra[:i], []).append(posicion)
+
+        # Las posiciones se agregan en orden creciente; solo hay que quitar repetidas
+        self.prefijos = {p: tuple(dict.fromkeys(pos)) for p, pos in prefijos.items()}
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def nombres(self):
+        return [nombre for nombre, _ in self.entradas]
+
+    def exacto(self, texto):
+        """Nombre oficial si `texto` coincide con uno del catálogo (sin importar acentos)"""
+        posicion = self._por_clave.get(normalizar_nombre(texto))
+        return None if posicion is None else self.entradas[posicion][0]
+
+    def buscar(self, texto, limite=50):
+        """
+        Entradas cuyas palabras empiezan con cada palabra escrita
+
+        Primero las que empiezan con el texto completo, después el resto en el
+        orden del catálogo.
+
+        Returns:
+            Lista de (nombre, categoria), a lo más `limite`
+        """
+        consulta = normalizar_nombre(texto)
+        if not consulta:
+            return self.entradas[:limite]
+
+        conjuntos = []
+        for palabra in set(consulta.split()):
+            posiciones = self.prefijos.get(palabra)
+            if not posiciones:
+                return []
+            conjuntos.append(posiciones)
+
+        conjuntos.sort(key=len)
+        candidatos = set(conjuntos[0])
+        for posiciones in conjuntos[1:]:
+            candidatos.intersection_update(posiciones)
+            if not candidatos:
+                return []
+
+        ordenados = sorted(candidatos, key=lambda p: (not self.claves[p].startswith(consulta), p))
+        return [self.entradas[p] for p in ordenados[:limite]]
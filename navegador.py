@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arranque y salud de Chrome
+
+- Las rutas de chromedriver y de Chrome se resuelven una vez (Selenium Manager)
+  y se guardan en navegador_rutas.json; los arranques siguientes no vuelven a
+  resolverlas ni necesitan red para ello.
+- Se usa un perfil persistente (perfil_chrome/), cuya caché HTTP conserva los
+  recursos estáticos del sitio de estrados entre ejecuciones.
+- Se mide el tiempo hasta la primera búsqueda y se guardan las últimas
+  mediciones para comparar arranques en frío y con caché.
+- En sesiones largas se vigila la salud de cada driver (páginas, memoria,
+  errores seguidos) para reiniciar Chrome antes de que se degrade.
+- Con la extracción por red, el HTML de cada búsqueda se toma del registro
+  de red de DevTools (Network.getResponseBody) en lugar de recorrer el DOM.
+- La navegación se puede lanzar sin esperar (navegar_sin_esperar) para que
+  todas las pestañas carguen a la vez mientras se extrae una de ellas.
+"""
+
+import base64
+import json
+import os
+import time
+from datetime import datetime
+from urllib.parse import unquote
+
+from persistencia import escribir_json_atomico
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_RUTAS = os.path.join(SCRIPT_DIR, 'navegador_rutas.json')
+DIRECTORIO_PERFIL = os.path.join(SCRIPT_DIR, 'perfil_chrome')
+
+TAM_CACHE_DISCO = 500 * 1024 * 1024  # Bytes de caché HTTP del perfil
+MAX_MEDICIONES = 20
+
+
+def _cargar(archivo):
+    try:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rutas_en_cache(archivo=ARCHIVO_RUTAS):
+    """Rutas guardadas, solo si los ejecutables siguen existiendo"""
+    rutas = _cargar(archivo).get('rutas') or {}
+    driver = rutas.get('driver_path')
+    navegador = rutas.get('browser_path')
+    if not driver or not os.path.exists(driver):
+        return None
+    if navegador and not os.path.exists(navegador):
+        return None
+    return rutas
+
+
+def guardar_rutas(rutas, archivo=ARCHIVO_RUTAS):
+    data = _cargar(archivo)
+    data['rutas'] = dict(rutas, resueltas=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    escribir_json_atomico(archivo, data)
+
+
+def olvidar_rutas(archivo=ARCHIVO_RUTAS):
+    data = _cargar(archivo)
+    if data.pop('rutas', None) is not None:
+        escribir_json_atomico(archivo, data)
+
+
+def resolver_rutas(opciones):
+    """
+    Resuelve chromedriver y Chrome con Selenium Manager
+
+    Returns:
+        {'driver_path': ..., 'browser_path': ...} o None si no se pudo
+    """
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+    except ImportError:  # Selenium < 4.11: chromedriver debe estar en el PATH
+        return None
+
+    manager = SeleniumManager()
+    try:
+        if hasattr(manager, 'binary_paths'):  # Selenium >= 4.20
+            rutas = manager.binary_paths(['--browser', 'chrome'])
+            return {'driver_path': rutas.get('driver_path'), 'browser_path': rutas.get('browser_path') or None}
+        driver = manager.driver_location(opciones)  # Selenium 4.11 - 4.19
+        return {'driver_path': driver, 'browser_path': opciones.binary_location or None}
+    except Exception:
+        return None
+
+
+def _iniciar(opciones, rutas):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    if rutas.get('browser_path'):
+        opciones.binary_location = rutas['browser_path']
+    return webdriver.Chrome(service=Service(executable_path=rutas['driver_path']), options=opciones)
+
+
+def crear_driver(opciones, usar_cache=True, archivo=ARCHIVO_RUTAS, log=None):
+    """
+    Inicia Chrome reutilizando las rutas resueltas en ejecuciones anteriores
+
+    Si las rutas guardadas ya no sirven (p. ej. Chrome se actualizó y el
+    driver no coincide) se descartan, se resuelven de nuevo y se reintenta.
+    """
+    from selenium import webdriver
+
+    if not usar_cache:
+        return webdriver.Chrome(options=opciones)
+
+    rutas = rutas_en_cache(archivo)
+    if rutas:
+        try:
+            return _iniciar(opciones, rutas)
+        except Exception as e:
+            if log:
+                log(f"Rutas de Chrome en caché no válidas, resolviendo de nuevo ({e.__class__.__name__})", "WARN")
+            olvidar_rutas(archivo)
+
+    rutas = resolver_rutas(opciones)
+    if not rutas or not rutas.get('driver_path'):
+        return webdriver.Chrome(options=opciones)
+
+    driver = _iniciar(opciones, rutas)
+    try:
+        guardar_rutas(rutas, archivo)
+    except OSError:
+        pass
+    return driver
+
+
+def registrar_medicion(arranque, primera_busqueda, perfil, archivo=ARCHIVO_RUTAS):
+    """Guarda los segundos de arranque y hasta la primera búsqueda (últimas mediciones)"""
+    data = _cargar(archivo)
+    mediciones = data.get('mediciones', [])
+    mediciones.append({
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'arranque': round(arranque, 2),
+        'primera_busqueda': round(primera_busqueda, 2),
+        'perfil_persistente': perfil,
+    })
+    data['mediciones'] = mediciones[-MAX_MEDICIONES:]
+    try:
+        escribir_json_atomico(archivo, data)
+    except OSError:
+        pass
+
+
+class Cronometro:
+    """Tiempo desde el inicio del navegador hasta la primera búsqueda cargada"""
+
+    def __init__(self):
+        self.inicio = None
+        self.arranque = None
+        self.primera_busqueda = None
+
+    def iniciar(self):
+        self.inicio = time.time()
+        self.arranque = self.primera_busqueda = None
+
+    def navegador_listo(self):
+        if self.inicio is not None:
+            self.arranque = time.time() - self.inicio
+
+    def busqueda_cargada(self):
+        """Devuelve los segundos hasta la primera búsqueda la primera vez; después None"""
+        if self.inicio is None or self.primera_busqueda is not None:
+            return None
+        self.primera_busqueda = time.time() - self.inicio
+        return self.primera_busqueda
+
+
+# ---------- Salud del navegador (sesiones largas) ----------
+
+MAX_PAGINAS = 400          # Páginas cargadas antes de reiniciar Chrome
+MAX_MEMORIA_MB = 2500      # Memoria residente de Chrome (todos sus procesos) antes de reiniciar
+MAX_ERRORES = 3            # Errores seguidos antes de reiniciar
+MEDIR_MEMORIA_CADA = 10    # Páginas entre mediciones de memoria
+
+
+def _hijos_por_proceso():
+    """Mapeo PID padre -> PIDs hijos a partir de /proc (Linux)"""
+    hijos = {}
+    for nombre in os.listdir('/proc'):
+        if not nombre.isdigit():
+            continue
+        try:
+            with open(f'/proc/{nombre}/stat', 'r') as f:
+                # El nombre del proceso va entre paréntesis y puede contener espacios
+                campos = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue  # El proceso terminó mientras se leía
+        hijos.setdefault(int(campos[1]), []).append(int(nombre))
+    return hijos
+
+
+def memoria_procesos_mb(pid):
+    """
+    MB de memoria residente (RSS) de los procesos descendientes de pid
+
+    Con chromedriver como pid, suma el proceso principal de Chrome, los
+    renderizadores de cada pestaña, la GPU y los demás auxiliares. Usa psutil
+    si está instalado; si no, /proc. Devuelve None si no se puede medir.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None  # Opcional: sin psutil solo se mide en Linux
+
+    if psutil is not None:
+        try:
+            procesos = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proceso in procesos:
+            try:
+                total += proceso.memory_info().rss
+            except psutil.Error:
+                pass  # Terminó entre la lista y la lectura
+        return total / (1024 * 1024) if procesos else None
+
+    if not os.path.isdir('/proc'):
+        return None
+    hijos = _hijos_por_proceso()
+    pendientes = list(hijos.get(pid, []))
+    tam_pagina = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    vistos = 0
+    while pendientes:
+        actual = pendientes.pop()
+        pendientes.extend(hijos.get(actual, []))
+        try:
+            with open(f'/proc/{actual}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * tam_pagina
+            vistos += 1
+        except (OSError, IndexError, ValueError):
+            pass
+    return total / (1024 * 1024) if vistos else None
+
+
+def limites_desde_config(config):
+    """Límites de reciclaje a partir de config.json"""
+    return {
+        'max_paginas': config.get('navegador_max_paginas', MAX_PAGINAS),
+        'max_memoria_mb': config.get('navegador_max_memoria_mb', MAX_MEMORIA_MB),
+        'max_errores': config.get('navegador_max_errores', MAX_ERRORES),
+    }
+
+
+class SaludNavegador:
+    """
+    Estado de un driver: páginas servidas, memoria y errores seguidos
+
+    Cuando se supera algún límite, necesita_reciclar() indica el motivo y el
+    bot reinicia Chrome; reiniciar() deja los contadores en cero.
+    """
+
+    def __init__(self, max_paginas=MAX_PAGINAS, max_memoria_mb=MAX_MEMORIA_MB, max_errores=MAX_ERRORES,
+                 medir_memoria_cada=MEDIR_MEMORIA_CADA):
+        self.max_paginas = max_paginas
+        self.max_memoria_mb = max_memoria_mb
+        self.max_errores = max_errores
+        self.medir_memoria_cada = medir_memoria_cada
+        self.reciclajes = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.paginas = 0
+        self.errores_seguidos = 0
+        self.memoria_mb = None
+
+    def registrar_pagina(self, driver):
+        self.paginas += 1
+        if self.medir_memoria_cada and self.paginas % self.medir_memoria_cada == 0:
+            self.memoria_mb = self.medir_memoria(driver)
+
+    def registrar_error(self):
+        self.errores_seguidos += 1
+
+    def registrar_exito(self):
+        self.errores_seguidos = 0
+
+    def medir_memoria(self, driver):
+        """MB de memoria residente de los procesos de Chrome que lanzó este driver, o None"""
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return None  # Driver remoto o sin proceso propio
+        return memoria_procesos_mb(pid)
+
+    def necesita_reciclar(self):
+        """Motivo para reiniciar el navegador, o None si está sano"""
+        if self.max_errores and self.errores_seguidos >= self.max_errores:
+            return f"{self.errores_seguidos} errores seguidos"
+        if self.max_paginas and self.paginas >= self.max_paginas:
+            return f"{self.paginas} páginas cargadas"
+        if self.max_memoria_mb and self.memoria_mb is not None and self.memoria_mb >= self.max_memoria_mb:
+            return f"memoria {self.memoria_mb:.0f} MB"
+        return None
+
+
+# ---------- Navegación sin bloqueo (una petición en curso por pestaña) ----------
+
+# La marca vive en el documento anterior: desaparece en cuanto la pestaña
+# cambia de página, aunque el servidor redirija a otra URL
+_SCRIPT_NAVEGAR = "window.__tsjPendiente = true; window.location.href = arguments[0];"
+_SCRIPT_CARGADA = "return !window.__tsjPendiente && document.readyState === 'complete';"
+
+
+def navegar_sin_esperar(driver, url):
+    """Inicia la carga de `url` en la pestaña actual y regresa de inmediato"""
+    driver.execute_script(_SCRIPT_NAVEGAR, url)
+
+
+def esperar_carga(driver, timeout=30, intervalo=0.05):
+    """
+    Espera a que la pestaña actual termine la navegación lanzada con navegar_sin_esperar
+
+    Returns:
+        True si la página nueva terminó de cargar, False si se agotó el tiempo
+    """
+    limite = time.time() + timeout
+    while True:
+        try:
+            if driver.execute_script(_SCRIPT_CARGADA):
+                return True
+        except Exception:
+            pass  # Documento en transición: se vuelve a preguntar
+        if time.time() >= limite:
+            return False
+        time.sleep(intervalo)
+
+
+# ---------- Extracción por red (registro de rendimiento de DevTools) ----------
+
+def activar_registro_red(opciones):
+    """Habilita en ChromeOptions el registro de eventos de red (goog:loggingPrefs)"""
+    opciones.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    # Solo eventos de red: sin los de página y trazado el registro es mucho más chico
+    opciones.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+
+def _clave_url(url):
+    return unquote(url).split('#', 1)[0]
+
+
+class CapturaRed:
+    """
+    Cuerpos de respuesta de documentos vistos en el registro de red de Chrome
+
+    Chrome entrega el registro de todas las pestañas junto y lo vacía al
+    leerlo, así que las respuestas se guardan por URL hasta que se piden.
+    """
+
+    def __init__(self):
+        self.respuestas = {}  # URL (sin codificar) -> requestId de DevTools
+
+    def reiniciar(self):
+        self.respuestas.clear()
+
+    def leer_registro(self, driver):
+        for entrada in driver.get_log('performance'):
+            try:
+                mensaje = json.loads(entrada['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if mensaje.get('method') != 'Network.responseReceived':
+                continue
+            parametros = mensaje.get('params', {})
+            if parametros.get('type') == 'Document':
+                self.respuestas[_clave_url(parametros['response']['url'])] = parametros['requestId']
+
+    def cuerpo(self, driver, url):
+        """
+        HTML devuelto por el servidor para `url` en la pestaña actual
+
+        Returns:
+            Texto de la respuesta, o None si no se capturó (el bot recurre al DOM)
+        """
+        try:
+            self.leer_registro(driver)
+            id_peticion = self.respuestas.pop(_clave_url(url), None)
+            if id_peticion is None:
+                return None
+            respuesta = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': id_peticion})
+        except Exception:
+            return None  # Registro no habilitado o cuerpo ya descartado por Chrome
+
+        cuerpo = respuesta.get('body', '')
+        if respuesta.get('base64Encoded'):
+            cuerpo = base64.b64decode(cuerpo).decode('utf-8', errors='replace')
+        return cuerpo
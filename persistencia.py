@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Escritura segura de archivos JSON
+
+- escribir_json_atomico: escribe en un archivo temporal y lo renombra, de modo
+  que una interrupción a mitad de la escritura nunca deja un JSON corrupto.
+- AutoGuardado: guardado diferido (debounce) en un hilo en segundo plano, que
+  omite la escritura cuando el contenido no cambió.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+
+
+def serializar_json(data):
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _crear_temporal(directorio, nombre):
+    """
+    Crea un temporal exclusivo junto al destino con modo 0666 menos la umask
+
+    A diferencia de tempfile.mkstemp (que crea con 0600), un archivo nuevo queda
+    con los mismos permisos que si se hubiera creado con open().
+    """
+    banderas = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temporal = os.path.join(directorio, f'.{nombre}.{secrets.token_hex(4)}.tmp')
+        try:
+            return os.open(temporal, banderas, 0o666), temporal
+        except FileExistsError:
+            continue
+
+
+def escribir_bytes_atomico(ruta, contenido):
+    """Escribe `contenido` en `ruta` mediante archivo temporal + rename"""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = _crear_temporal(directorio, os.path.basename(ruta))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contenido)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(ruta):
+            os.chmod(temporal, os.stat(ruta).st_mode & 0o777)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def escribir_bytes_si_cambia(ruta, contenido):
+    """Escribe `contenido` (de forma atómica) solo si difiere de lo que ya hay; True si escribió"""
+    try:
+        with open(ruta, 'rb') as f:
+            if f.read() == contenido:
+                return False
+    except OSError:
+        pass
+    escribir_bytes_atomico(ruta, contenido)
+    return True
+
+
+def escribir_json_atomico(ruta, data):
+    """Guarda `data` como JSON (indentado, UTF-8) sin riesgo de dejar el archivo a medias"""
+    escribir_bytes_atomico(ruta, serializar_json(data))
+
+
+class AutoGuardado:
+    """
+    Guardado diferido y en segundo plano de un documento JSON
+
+    Args:
+        ruta: Archivo de destino
+        obtener_datos: Función sin argumentos que devuelve el documento a guardar.
+                       Se invoca en el hilo que llama a marcar_cambio(), así que
+                       debe devolver una instantánea (no estructuras que sigan mutando).
+        retardo: Segundos sin cambios antes de escribir
+    """
+
+    def __init__(self, ruta, obtener_datos, retardo=1.5):
+        self.ruta = ruta
+        self.obtener_datos = obtener_datos
+        self.retardo = retardo
+        self.ultimo_error = None
+        self.ultimo_guardado = None   # Hora (time.time()) de la última escritura real
+        self._pendiente = None        # Instantánea aún no escrita
+        self._hash_escrito = None     # Hash del contenido que está en disco
+        self._timer = None
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+
+    def registrar_contenido_actual(self, data):
+        """Indica qué contenido hay ya en disco (al cargar), para no reescribirlo"""
+        self._hash_escrito = hashlib.sha1(serializar_json(data)).hexdigest()
+
+    def marcar_cambio(self):
+        """Toma una instantánea y programa la escritura tras `retardo` segundos sin cambios"""
+        with self._lock:
+            self._pendiente = self.obtener_datos()
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.retardo, self._escribir_pendiente)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def hay_cambios_pendientes(self):
+        return self._pendiente is not None
+
+    def guardar_ahora(self):
+        """Escribe de inmediato lo pendiente (en el hilo que llama). Devuelve True si escribió."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return self._escribir_pendiente()
+
+    def _escribir_pendiente(self):
+        # La instantánea se toma ya con el turno de escritura: si se tomara antes,
+        # un hilo podría escribir una versión vieja después de otro con una más nueva
+        with self._lock_escritura:
+            with self._lock:
+                data, self._pendiente = self._pendiente, None
+            if data is None:
+                return False
+
+            try:
+                contenido = serializar_json(data)
+                huella = hashlib.sha1(contenido).hexdigest()
+                if huella == self._hash_escrito:
+                    return False
+                escribir_bytes_atomico(self.ruta, contenido)
+                self._hash_escrito = huella
+                self.ultimo_error = None
+                self.ultimo_guardado = time.time()
+                return True
+            except Exception as e:
+                self.ultimo_error = e
+                return False
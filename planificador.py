@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificación de lotes de búsqueda
+
+1. Preparación del lote (antes de abrir el navegador): valida y normaliza los
+   números, resuelve los juzgados en una sola pasada, fusiona duplicados y
+   agrupa las búsquedas por juzgado.
+2. Ejecuciones con plazo límite (--deadline): estima el costo de cada búsqueda
+   a partir de los tiempos históricos, ordena por prioridad y antigüedad de la
+   última revisión, y selecciona las que caben en el tiempo disponible. Las que
+   no caben se reportan explícitamente como omitidas.
+"""
+
+import json
+import os
+import re
+import time
+import unicodedata
+from datetime import datetime, timedelta
+
+from persistencia import escribir_json_atomico
+from vigilancia import clave_expediente
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_HISTORIAL = os.path.join(SCRIPT_DIR, 'historial_busquedas.json')
+
+COSTO_POR_DEFECTO = 8.0      # Segundos por búsqueda sin historial (carga + extracción)
+ARRANQUE_POR_DEFECTO = 10.0  # Segundos para iniciar Chrome
+PESO_RECIENTE = 0.3          # Peso de la última medición en la media móvil
+
+PRIORIDADES = {'alta': 2, 'media': 1, 'baja': 0}
+
+_RE_DURACION = re.compile(r'^(?:(\d+)h)?\s*(?:(\d+)m(?:in)?)?$')
+_RE_NUMERO_EXPEDIENTE = re.compile(r'^0*(\d{1,6})\s*[/-]\s*(\d{4}|\d{2})(?:\s*[-\s]\s*([A-Z0-9]+))?$')
+
+
+_prioridades_invalidas = set()  # Valores ya avisados (prioridad() se llama al ordenar)
+
+
+def prioridad(exp):
+    """
+    Prioridad numérica de un expediente (campo opcional 'prioridad', mayor = más importante)
+
+    Acepta números, números escritos como texto ("2") y alta/media/baja.
+    Cualquier otro valor cuenta como 0 y se avisa una vez.
+    """
+    valor = exp.get('prioridad', 0)
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str):
+        texto = valor.strip().lower()
+        if texto in PRIORIDADES:
+            return PRIORIDADES[texto]
+        if texto.lstrip('-').isdigit():
+            return int(texto)
+    if repr(valor) not in _prioridades_invalidas:
+        _prioridades_invalidas.add(repr(valor))
+        print(f"⚠️  Prioridad no válida {valor!r}, se usa 0 (valores: número, alta, media o baja)")
+    return 0
+
+
+def normalizar_numero(numero):
+    """
+    Normaliza un número de expediente al formato NUM/AÑO
+
+    Ejemplos:
+        " 0615 / 2019 " -> "615/2019"
+        "615-19"        -> "615/2019"
+        "2358/2025-ii"  -> "2358/2025-II"
+
+    Returns:
+        Número normalizado, o None si no tiene un formato válido
+    """
+    m = _RE_NUMERO_EXPEDIENTE.match(str(numero).strip().upper())
+    if not m:
+        return None
+    num, anio, sufijo = m.groups()
+    if len(anio) == 2:
+        anio = '20' + anio
+    return f"{num}/{anio}" + (f"-{sufijo}" if sufijo else '')
+
+
+def normalizar_nombre(texto):
+    """
+    Forma canónica de un nombre de juzgado para compararlo: sin acentos,
+    mayúsculas, sin puntuación y con espacios simples
+
+    Ejemplo: "Juzgado Segundo  Familiar Oral, Cancún" -> "JUZGADO SEGUNDO FAMILIAR ORAL CANCUN"
+    """
+    sin_acentos = unicodedata.normalize('NFKD', str(texto))
+    sin_acentos = ''.join(c for c in sin_acentos if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^0-9A-Z]+', ' ', sin_acentos.upper()).split())
+
+
+def crear_resolutor_juzgados(nombres):
+    """
+    Resolutor de nombres de juzgado escritos a mano contra el catálogo
+
+    Busca primero la coincidencia exacta (sin acentos ni mayúsculas) y después
+    el único juzgado que contiene todas las palabras escritas.
+
+    Returns:
+        Función nombre -> nombre oficial del catálogo (o None si no hay uno único)
+    """
+    exactos = {normalizar_nombre(n): n for n in nombres}
+    palabras = [(set(clave.split()), nombre) for clave, nombre in exactos.items()]
+
+    def resolver(nombre):
+        clave = normalizar_nombre(nombre)
+        if clave in exactos:
+            return exactos[clave]
+        buscadas = set(clave.split())
+        candidatos = [n for p, n in palabras if buscadas and buscadas <= p]
+        return candidatos[0] if len(candidatos) == 1 else None
+
+    return resolver
+
+
+def preparar_lote(expedientes, resolver_juzgado):
+    """
+    Valida, normaliza y deduplica un lote completo antes de abrir el navegador
+
+    Los números con formato NUM/AÑO se buscan en su forma normalizada (la que
+    publica el sitio) y, si se escribieron distinto, la forma original queda en
+    el comentario. Un número con otro formato no se descarta (el sitio puede
+    aceptarlo): se busca tal cual y se avisa.
+
+    Args:
+        expedientes: Lista de expedientes tal como vienen de expedientes.json
+        resolver_juzgado: Función nombre_juzgado -> ID (o None si no existe)
+
+    Returns:
+        (validos, descartados, duplicados, avisos)
+        - validos: copias con 'id_juzgado', agrupadas por juzgado
+        - descartados: lista de (expediente, motivo)
+        - duplicados: número de entradas fusionadas con otra equivalente
+        - avisos: lista de (expediente, motivo) de las búsquedas que se hacen
+          aunque algo parezca incorrecto
+    """
+    ids_juzgado = {}  # nombre normalizado -> ID (cada juzgado se resuelve una vez)
+    por_clave = {}
+    descartados = []
+    avisos = []
+    duplicados = 0
+
+    for exp in expedientes:
+        juzgado = ' '.join(str(exp.get('juzgado', '')).split())
+        if not juzgado:
+            descartados.append((exp, "Sin juzgado"))
+            continue
+
+        normalizado = dict(exp, juzgado=juzgado)
+        if 'numero' in exp and str(exp['numero']).strip():
+            escrito = str(exp['numero']).strip()
+            numero = normalizar_numero(escrito)
+            if numero is None:
+                avisos.append((exp, f"Número con formato inesperado, se busca tal cual: {escrito}"))
+                numero = escrito
+            elif numero != escrito:
+                comentarios = [c for c in (exp.get('comentario'), f"Número escrito: {escrito}") if c]
+                normalizado['comentario'] = ' | '.join(comentarios)
+            normalizado['numero'] = numero
+            termino = 'numero:' + ' '.join(numero.upper().split())
+        elif 'nombre' in exp and str(exp['nombre']).strip():
+            normalizado['nombre'] = ' '.join(str(exp['nombre']).split())
+            termino = 'nombre:' + normalizado['nombre'].upper()
+        else:
+            descartados.append((exp, "Sin número ni nombre"))
+            continue
+
+        clave_juzgado = juzgado.upper()
+        if clave_juzgado not in ids_juzgado:
+            ids_juzgado[clave_juzgado] = resolver_juzgado(juzgado)
+        id_juzgado = ids_juzgado[clave_juzgado]
+        if id_juzgado is None:
+            descartados.append((exp, f"Juzgado no encontrado: {juzgado}"))
+            continue
+        normalizado['id_juzgado'] = id_juzgado
+
+        # Duplicado: mismo término en el mismo juzgado (aunque el nombre venga escrito distinto)
+        clave = (termino, id_juzgado)
+        if clave in por_clave:
+            duplicados += 1
+            previo = por_clave[clave]
+            comentarios = [c for c in (previo.get('comentario'), normalizado.get('comentario')) if c]
+            if comentarios:
+                previo['comentario'] = ' | '.join(dict.fromkeys(comentarios))
+            if prioridad(exp) > prioridad(previo):
+                previo['prioridad'] = exp['prioridad']
+            continue
+        por_clave[clave] = normalizado
+
+    # Agrupar por juzgado, respetando el orden de primera aparición
+    orden_juzgados = {}
+    for exp in por_clave.values():
+        orden_juzgados.setdefault(exp['id_juzgado'], len(orden_juzgados))
+    validos = sorted(por_clave.values(), key=lambda e: orden_juzgados[e['id_juzgado']])
+
+    return validos, descartados, duplicados, avisos
+
+
+def interpretar_limite(texto, ahora=None):
+    """
+    Convierte el argumento de --deadline en una fecha/hora límite
+
+    Formatos aceptados:
+        "09:45"     -> hoy a las 09:45
+        "45" o "45m" -> dentro de 45 minutos
+        "1h30m"     -> dentro de 1 hora 30 minutos
+
+    Raises:
+        ValueError si el formato no es válido o la hora ya pasó
+    """
+    ahora = ahora or datetime.now()
+    texto = texto.strip().lower()
+
+    if ':' in texto:
+        hora = datetime.strptime(texto, '%H:%M')
+        limite = ahora.replace(hour=hora.hour, minute=hora.minute, second=0, microsecond=0)
+        if limite <= ahora:
+            raise ValueError(f"La hora límite {texto} ya pasó")
+        return limite
+
+    if texto.isdigit():
+        return ahora + timedelta(minutes=int(texto))
+
+    m = _RE_DURACION.match(texto)
+    if not m or not any(m.groups()):
+        raise ValueError(f"Formato de plazo no válido: {texto} (usa HH:MM, 45m o 1h30m)")
+    horas, minutos = (int(g) if g else 0 for g in m.groups())
+    return ahora + timedelta(hours=horas, minutes=minutos)
+
+
+class HistorialBusquedas:
+    """Tiempos y fechas de búsquedas anteriores, persistidos en JSON"""
+
+    def __init__(self, archivo=ARCHIVO_HISTORIAL):
+        self.archivo = archivo
+        self.juzgados = {}     # juzgado -> duración media (s)
+        self.expedientes = {}  # clave -> {'ultima_busqueda': ts, 'duracion': s}
+        self.arranque = ARRANQUE_POR_DEFECTO
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo):
+                with open(self.archivo, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.juzgados = data.get('juzgados', {})
+                self.expedientes = data.get('expedientes', {})
+                self.arranque = data.get('arranque', ARRANQUE_POR_DEFECTO)
+        except Exception as e:
+            print(f"⚠️  Error cargando historial de búsquedas: {e}")
+
+    def guardar(self):
+        try:
+            data = {
+                'version': 1,
+                'arranque': self.arranque,
+                'juzgados': self.juzgados,
+                'expedientes': self.expedientes,
+            }
+            escribir_json_atomico(self.archivo, data)
+        except Exception as e:
+            print(f"⚠️  Error guardando historial de búsquedas: {e}")
+
+    @staticmethod
+    def _media(anterior, nueva):
+        if anterior is None:
+            return nueva
+        return (1 - PESO_RECIENTE) * anterior + PESO_RECIENTE * nueva
+
+    def registrar(self, exp, duracion, ahora=None):
+        """Registra la duración (s) de una búsqueda completada"""
+        ahora = ahora if ahora is not None else time.time()
+        juzgado = exp.get('juzgado', '')
+        self.juzgados[juzgado] = round(self._media(self.juzgados.get(juzgado), duracion), 2)
+
+        datos = self.expedientes.setdefault(clave_expediente(exp), {})
+        datos['duracion'] = round(self._media(datos.get('duracion'), duracion), 2)
+        datos['ultima_busqueda'] = ahora
+
+    def registrar_arranque(self, duracion):
+        self.arranque = round(self._media(self.arranque, duracion), 2)
+
+    def costo_estimado(self, exp):
+        """Segundos estimados: media del expediente, si no la del juzgado, si no la global"""
+        datos = self.expedientes.get(clave_expediente(exp), {})
+        if 'duracion' in datos:
+            return datos['duracion']
+        if exp.get('juzgado') in self.juzgados:
+            return self.juzgados[exp['juzgado']]
+        if self.juzgados:
+            return sum(self.juzgados.values()) / len(self.juzgados)
+        return COSTO_POR_DEFECTO
+
+    def ultima_busqueda(self, exp):
+        return self.expedientes.get(clave_expediente(exp), {}).get('ultima_busqueda')
+
+
+def planificar(expedientes, historial, segundos_disponibles, ahora=None):
+    """
+    Selecciona los expedientes que caben en el tiempo disponible
+
+    Orden: prioridad (mayor primero) y luego antigüedad de la última búsqueda
+    (nunca buscados primero, después los más antiguos).
+
+    Returns:
+        (seleccionados, omitidos) - listas de expedientes en orden de ejecución
+    """
+    ahora = ahora if ahora is not None else time.time()
+
+    def antiguedad(exp):
+        ultima = historial.ultima_busqueda(exp)
+        return float('inf') if ultima is None else ahora - ultima
+
+    ordenados = sorted(expedientes, key=lambda e: (-prioridad(e), -antiguedad(e)))
+
+    seleccionados, omitidos = [], []
+    restante = segundos_disponibles - historial.arranque
+    for exp in ordenados:
+        costo = historial.costo_estimado(exp)
+        if costo <= restante:
+            seleccionados.append(exp)
+            restante -= costo
+        else:
+            omitidos.append(exp)
+    return seleccionados, omitidos
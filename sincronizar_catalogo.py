@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificación del catálogo de juzgados contra el menú de los Estrados
+
+Descarga sidebar.php (a lo más una vez al día: la copia se guarda en
+sidebar_cache.json) y la compara con catalogo_juzgados_tsj.csv:
+
+- ID renumerado: el nombre sigue en el menú pero con otro ID
+- areaId distinto: la Sala conserva su ID pero cambió de areaId
+- nombre distinto: el ID sigue en el menú con otro nombre (se sigue buscando)
+- inexistente: ni el ID ni el nombre aparecen en el menú
+- nuevo: órganos del menú que no están en el catálogo (solo informativo)
+
+El bot hace esta verificación antes de repartir búsquedas (ver
+TSJExpedientesBot.verificar_catalogo): usa los IDs y areaId corregidos
+durante la ejecución y descarta las búsquedas dirigidas a IDs inexistentes.
+Para corregir el CSV de forma permanente:
+
+    python3 sincronizar_catalogo.py            # Muestra las diferencias
+    python3 sincronizar_catalogo.py --aplicar  # Las escribe en catalogo_juzgados_tsj.csv
+    python3 sincronizar_catalogo.py --forzar   # Descarga el menú aunque la copia sea de hoy
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+
+import estrados_http
+from catalogo_juzgados import ARCHIVO_FUENTE, obtener_catalogo
+from persistencia import escribir_bytes_atomico, escribir_json_atomico
+from planificador import normalizar_nombre
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_CACHE = os.path.join(SCRIPT_DIR, 'sidebar_cache.json')
+
+HORAS_CACHE = 24
+# Si menos de esta fracción de los juzgados del catálogo aparece por nombre en
+# el menú, se asume que el sitio cambió de formato y no se compara nada
+COBERTURA_MINIMA = 0.5
+
+
+def obtener_sidebar(archivo=ARCHIVO_CACHE, horas=HORAS_CACHE, forzar=False, descargar=None, ahora=None):
+    """
+    Órganos del menú de los Estrados, desde la copia local si es reciente
+
+    Si la descarga falla se usa la copia anterior aunque haya caducado.
+
+    Returns:
+        (lista de órganos de estrados_http.extraer_sidebar, fecha de la copia) o (None, None)
+    """
+    ahora = ahora or datetime.now()
+    cache = None
+    try:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if cache and not forzar and datetime.fromisoformat(cache['fecha']) > ahora - timedelta(hours=horas):
+        return cache['organos'], cache['fecha']
+
+    try:
+        organos = estrados_http.extraer_sidebar((descargar or estrados_http.obtener_html)(estrados_http.URL_SIDEBAR))
+        if not organos:
+            raise ValueError("sidebar.php no contiene enlaces a los buscadores")
+    except Exception as e:
+        print(f"⚠️  No se pudo leer sidebar.php: {e}")
+        return (cache['organos'], cache['fecha']) if cache else (None, None)
+
+    fecha = ahora.isoformat(timespec='seconds')
+    try:
+        escribir_json_atomico(archivo, {'fecha': fecha, 'organos': organos})
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar {archivo}: {e}")
+    return organos, fecha
+
+
+def comparar(catalogo, organos):
+    """
+    Diferencias entre el catálogo y los órganos del menú
+
+    Cada juzgado se busca primero por nombre, para seguirlo si el TSJ reasigna
+    o intercambia IDs. Si el nombre no aparece pero su ID sigue en el menú con
+    un nombre que no es de otro juzgado del catálogo, se considera el mismo
+    órgano con el nombre cambiado y se sigue buscando.
+
+    Returns:
+        dict con:
+        - 'ids': {ID del catálogo: ID en el menú} para los renumerados
+        - 'area_ids': {ID (ya corregido): areaId del menú} para las Salas con areaId distinto
+        - 'nombres': {ID: nombre en el menú} de los que cambiaron de nombre
+        - 'inexistentes': {ID: nombre} de los que ya no aparecen
+        - 'nuevos': órganos del menú que no están en el catálogo
+        o None si el menú no es confiable (ver COBERTURA_MINIMA)
+    """
+    por_id = {o['id']: o for o in organos}
+    por_clave = {}
+    for o in organos:
+        por_clave.setdefault(normalizar_nombre(o['nombre']), o)
+
+    if sum(1 for j in catalogo.juzgados if j['clave'] in por_clave) < COBERTURA_MINIMA * len(catalogo.juzgados):
+        return None
+
+    claves_catalogo = {j['clave'] for j in catalogo.juzgados}
+    diferencias = {'ids': {}, 'area_ids': {}, 'nombres': {}, 'inexistentes': {}, 'nuevos': []}
+    usados = set()  # IDs del menú que corresponden a algún juzgado del catálogo
+    for j in catalogo.juzgados:
+        organo = por_clave.get(j['clave'])
+        if organo is None:
+            organo = por_id.get(j['id'])
+            if organo is None or normalizar_nombre(organo['nombre']) in claves_catalogo:
+                # El ID no está, o ahora es de otro juzgado del catálogo
+                diferencias['inexistentes'][j['id']] = j['nombre']
+                continue
+            diferencias['nombres'][j['id']] = organo['nombre']
+        usados.add(organo['id'])
+        if organo['id'] != j['id']:
+            diferencias['ids'][j['id']] = organo['id']
+
+        # Las Salas siguen necesitando areaId con su nuevo ID
+        area_id = organo['area_id'] if organo['area_id'] is not None else j['area_id']
+        if j['area_id'] is not None and (area_id != j['area_id'] or organo['id'] != j['id']):
+            diferencias['area_ids'][organo['id']] = area_id
+
+    diferencias['nuevos'] = [o for o in organos if o['id'] not in usados]
+    return diferencias
+
+
+def area_ids_vigentes(catalogo, diferencias):
+    """
+    Mapeo ID -> areaId de las Salas con las diferencias aplicadas
+
+    Los IDs que dejaron de ser de una Sala (renumerados o inexistentes) pierden
+    su areaId, aunque otro juzgado ocupe ahora ese ID.
+    """
+    area_ids = {id_juzgado: area_id for id_juzgado, area_id in catalogo.area_ids.items()
+                if id_juzgado not in diferencias['ids'] and id_juzgado not in diferencias['inexistentes']}
+    area_ids.update(diferencias['area_ids'])
+    return area_ids
+
+
+def hay_diferencias(diferencias):
+    return bool(diferencias and (diferencias['ids'] or diferencias['area_ids'] or diferencias['nombres']
+                                 or diferencias['inexistentes']))
+
+
+def describir(diferencias, catalogo):
+    """Líneas legibles con cada diferencia"""
+    lineas = []
+    for viejo, nuevo in diferencias['ids'].items():
+        linea = f"🔀 {catalogo.por_id[viejo]['nombre']}: ID {viejo} → {nuevo}"
+        if diferencias['area_ids'].get(nuevo, catalogo.area_id(viejo)) != catalogo.area_id(viejo):
+            linea += f", areaId {catalogo.area_id(viejo)} → {diferencias['area_ids'][nuevo]}"
+        lineas.append(linea)
+    renumeradas = set(diferencias['ids'].values())
+    for id_juzgado, area_id in diferencias['area_ids'].items():
+        if id_juzgado not in renumeradas:
+            anterior = catalogo.area_id(id_juzgado)
+            lineas.append(f"🔀 {catalogo.por_id[id_juzgado]['nombre']}: areaId {anterior} → {area_id}")
+    for id_juzgado, nombre in diferencias['nombres'].items():
+        lineas.append(f"📝 {catalogo.por_id[id_juzgado]['nombre']} (ID {id_juzgado}) aparece en sidebar.php como {nombre}")
+    for id_juzgado, nombre in diferencias['inexistentes'].items():
+        lineas.append(f"❌ {nombre} (ID {id_juzgado}) ya no aparece en sidebar.php")
+    for o in diferencias['nuevos']:
+        area = f", areaId {o['area_id']}" if o['area_id'] is not None else ""
+        lineas.append(f"🆕 {o['nombre']} (ID {o['id']}{area}) no está en el catálogo")
+    return lineas
+
+
+def aplicar(diferencias, archivo=ARCHIVO_FUENTE):
+    """
+    Escribe en el CSV los IDs renumerados y los areaId corregidos
+
+    Los inexistentes y los nuevos no se tocan: requieren decidir a mano (borrar
+    la fila o completar ciudad, materia y grupo). Los nombres tampoco, porque
+    expedientes.json se refiere a cada juzgado por su nombre.
+
+    Returns:
+        Número de filas modificadas
+    """
+    with open(archivo, 'r', encoding='utf-8-sig', newline='') as f:
+        lector = csv.DictReader(f)
+        campos = lector.fieldnames
+        filas = list(lector)
+
+    cambios = 0
+    for fila in filas:
+        viejo = int(fila['id'])
+        nuevo = diferencias['ids'].get(viejo, viejo)
+        area_id = diferencias['area_ids'].get(nuevo)
+        if nuevo != viejo or (area_id is not None and str(area_id) != fila['area_id'].strip()):
+            fila['id'] = str(nuevo)
+            if area_id is not None:
+                fila['area_id'] = str(area_id)
+            cambios += 1
+
+    if cambios:
+        salida = io.StringIO()
+        escritor = csv.DictWriter(salida, fieldnames=campos, lineterminator='\n')
+        escritor.writeheader()
+        escritor.writerows(filas)
+        escribir_bytes_atomico(archivo, salida.getvalue().encode('utf-8'))
+    return cambios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara el catálogo de juzgados con sidebar.php")
+    parser.add_argument('--aplicar', action='store_true',
+                        help="Escribe los IDs y areaId corregidos en catalogo_juzgados_tsj.csv")
+    parser.add_argument('--forzar', action='store_true', help="Descarga sidebar.php aunque la copia sea reciente")
+    args = parser.parse_args()
+
+    organos, fecha = obtener_sidebar(forzar=args.forzar)
+    if organos is None:
+        return
+    catalogo = obtener_catalogo()
+    diferencias = comparar(catalogo, organos)
+    print(f"📋 sidebar.php del {fecha}: {len(organos)} órganos; catálogo: {len(catalogo.juzgados)}")
+    if diferencias is None:
+        print("⚠️  El menú no coincide con el formato esperado; no se compara")
+        return
+
+    lineas = describir(diferencias, catalogo)
+    for linea in lineas:
+        print(f"   {linea}")
+    if not lineas:
+        print("✅ El catálogo está al día")
+    elif args.aplicar and hay_diferencias(diferencias):
+        print(f"💾 {aplicar(diferencias)} fila(s) corregidas en {ARCHIVO_FUENTE}")
+
+
+if __name__ == "__main__":
+    main()
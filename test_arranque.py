@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Presupuesto de arranque de los puntos de entrada (python -X importtime)
+
+Importar los scripts no debe cargar Selenium ni openpyxl (se importan solo
+al abrir el navegador o generar el Excel) y debe tardar menos de 200 ms.
+"""
+
+import os
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PRESUPUESTO_US = 200_000
+MODULOS = ['buscar_expedientes', 'buscar_multiple', 'gui_expedientes', 'importar_expedientes']
+PESADOS = ('selenium', 'openpyxl')
+
+
+def _tiempos_importacion(modulo):
+    """dict paquete -> microsegundos acumulados, según -X importtime"""
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=SCRIPT_DIR, capture_output=True, text=True
+    )
+    assert proceso.returncode == 0, proceso.stderr[-2000:]
+
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, paquete = linea[len('import time:'):].split('|')
+        tiempos[paquete.strip()] = int(acumulado)
+    return tiempos
+
+
+def test_arranque_sin_dependencias_pesadas():
+    for modulo in MODULOS:
+        _tiempos_importacion(modulo)  # Primera vez: genera los .pyc
+        tiempos = _tiempos_importacion(modulo)
+
+        cargados = [p for p in tiempos if p.split('.')[0] in PESADOS]
+        assert not cargados, f"{modulo} importa {cargados[:3]} al arrancar"
+        assert tiempos[modulo] < PRESUPUESTO_US, f"{modulo}: {tiempos[modulo] / 1000:.0f} ms"
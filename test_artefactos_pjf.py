@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los artefactos del catálogo PJF para la app web
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+import artefactos_pjf
+
+
+def _leer(directorio, nombre):
+    with open(os.path.join(directorio, nombre), 'rb') as f:
+        return f.read()
+
+
+def test_artefactos_equivalentes_al_catalogo_completo(tmp_path):
+    destino = str(tmp_path)
+    manifiesto, escritos, borrados = artefactos_pjf.generar(destino=destino)
+    with open(artefactos_pjf.ARCHIVO_ORIGEN, encoding='utf-8') as f:
+        completo = json.load(f)
+
+    assert json.loads(_leer(destino, 'manifest.json')) == manifiesto
+    # Cada archivo lleva su huella en el nombre y su .gz descomprime a lo mismo
+    for entrada in [manifiesto['indice'], manifiesto['tipos']] + list(manifiesto['circuitos'].values()):
+        contenido = _leer(destino, entrada['archivo'])
+        assert hashlib.sha256(contenido).hexdigest() == entrada['sha256']
+        assert entrada['sha256'][:12] in entrada['archivo']
+        assert gzip.decompress(_leer(destino, entrada['archivo'] + '.gz')) == contenido
+
+    # El índice compacto conserva lo que usa la app
+    indice = json.loads(_leer(destino, manifiesto['indice']['archivo']))
+    originales = {o['id']: o for o in completo['organos']}
+    assert len(indice['organos']) == len(originales)
+    for id_, nombre, circuito, tipo, estado, ciudad in indice['organos']:
+        o = originales[id_]
+        assert (nombre, circuito, tipo, ciudad) == (o['nombre'], o['circuitoId'], o['tipoOrganismoId'], o['ciudad'] or '')
+        assert indice['circuitos'][str(circuito)] == o['circuito']
+        assert indice['estados'][estado] == (o['estado'] or '')
+
+    # Los fragmentos por circuito cubren todos los órganos con sus registros completos
+    fragmentos = [json.loads(_leer(destino, e['archivo'])) for e in manifiesto['circuitos'].values()]
+    assert sorted(o['id'] for f in fragmentos for o in f) == sorted(originales)
+    assert all(o == originales[o['id']] for f in fragmentos for o in f)
+
+    # La carga inicial es mucho menor que el archivo completo
+    assert manifiesto['indice']['gz'] + manifiesto['tipos']['gz'] < os.path.getsize(artefactos_pjf.ARCHIVO_ORIGEN) / 10
+
+
+def test_regenerar_sin_cambios_y_limpieza(tmp_path):
+    destino = str(tmp_path)
+    artefactos_pjf.generar(destino=destino)
+    (tmp_path / 'indice.viejo000000.json').write_text('{}')
+    (tmp_path / 'indice.viejo000000.json.gz').write_bytes(b'')
+    (tmp_path / 'LEEME.txt').write_text('no es un artefacto')
+
+    _, escritos, borrados = artefactos_pjf.generar(destino=destino)
+    assert escritos == []
+    assert borrados == ['indice.viejo000000.json', 'indice.viejo000000.json.gz']
+    assert (tmp_path / 'LEEME.txt').exists()
+
+
+def test_sin_brotli_se_conservan_los_br(tmp_path, monkeypatch):
+    destino = str(tmp_path)
+    manifiesto, _, _ = artefactos_pjf.generar(destino=destino)
+    br = manifiesto['indice']['archivo'] + '.br'
+    (tmp_path / br).write_bytes(b'br publicado en otra maquina')
+
+    monkeypatch.setattr(artefactos_pjf, '_variantes', lambda contenido: {'.gz': gzip.compress(contenido, mtime=0)})
+    manifiesto, escritos, borrados = artefactos_pjf.generar(destino=destino)
+    assert br not in borrados and (tmp_path / br).exists()
+    assert manifiesto['indice']['br'] == len(b'br publicado en otra maquina')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del sondeo concurrente de la búsqueda múltiple (sin red)
+"""
+
+import time
+
+import buscar_multiple as bm
+import estrados_http
+from catalogo_juzgados import obtener_catalogo
+from estadisticas_juzgados import EstadisticasJuzgados
+
+NUMERO = '615/2019'
+JUZGADOS = bm.CATEGORIAS['PENAL']
+
+
+def _por_url(juzgados):
+    catalogo = obtener_catalogo()
+    return {
+        estrados_http.url_busqueda(catalogo.ids[j], NUMERO, 1, catalogo.area_id(catalogo.ids[j])): j
+        for j in juzgados
+    }
+
+
+def test_parada_temprana_cancela_los_demas_sondeos(monkeypatch):
+    juzgado_url = _por_url(JUZGADOS)
+    acierto = JUZGADOS[2]
+
+    def sondear(url, cancelado=None):
+        if juzgado_url[url] == acierto:
+            return True
+        # Los demás tardan hasta que el acierto los cancela
+        return None if cancelado.wait(timeout=5) else False
+
+    monkeypatch.setattr(estrados_http, 'sondear', sondear)
+    inicio = time.time()
+    resultados = bm.sondear_juzgados(NUMERO, JUZGADOS, parar_al_encontrar=True)
+
+    assert time.time() - inicio < 2
+    assert resultados == {j: (True if j == acierto else None) for j in JUZGADOS}
+
+
+def test_parada_temprana_no_lanza_los_que_esperan(monkeypatch):
+    juzgado_url = _por_url(JUZGADOS)
+    sondeados = []
+
+    def sondear(url, cancelado=None):
+        sondeados.append(juzgado_url[url])
+        if juzgado_url[url] == JUZGADOS[0]:
+            return True
+        return None if cancelado.wait(timeout=5) else False
+
+    monkeypatch.setattr(estrados_http, 'sondear', sondear)
+    resultados = bm.sondear_juzgados(NUMERO, JUZGADOS, parar_al_encontrar=True, max_simultaneos=1)
+
+    # Con un solo hilo, a lo más se llegó a iniciar el siguiente antes de cancelar
+    assert resultados == {j: (True if j == JUZGADOS[0] else None) for j in JUZGADOS}
+    assert sondeados[0] == JUZGADOS[0] and len(sondeados) <= 2
+
+
+def test_error_de_sondeo_no_descarta_el_juzgado(monkeypatch):
+    juzgado_url = _por_url(JUZGADOS)
+
+    def sondear(url, cancelado=None):
+        if juzgado_url[url] == JUZGADOS[0]:
+            raise OSError("timed out")
+        return False
+
+    monkeypatch.setattr(estrados_http, 'sondear', sondear)
+    resultados = bm.sondear_juzgados(NUMERO, JUZGADOS, parar_al_encontrar=True)
+    assert resultados == {j: (None if j == JUZGADOS[0] else False) for j in JUZGADOS}
+
+
+def test_sin_aciertos_se_revisan_los_juzgados_con_error(tmp_path, monkeypatch):
+    sondeos = {j: (None if j == JUZGADOS[1] else False) for j in JUZGADOS}
+    monkeypatch.setattr(bm, 'sondear_juzgados', lambda *a, **k: dict(sondeos))
+    monkeypatch.setattr(bm, 'EstadisticasJuzgados', lambda: EstadisticasJuzgados(str(tmp_path / 'estadisticas.json')))
+
+    for parar in (False, True):
+        assert bm.ejecutar_busqueda_multiple(NUMERO, 'PENAL', parar_al_encontrar=parar, extraer=False) == [JUZGADOS[1]]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del catálogo compilado de juzgados
+"""
+
+import json
+
+from catalogo_juzgados import cargar
+
+FUENTE = (
+    "id,nombre,area_id,instancia,ciudad,materia,historica,grupo,busqueda_multiple\n"
+    "158,JUZGADO SEGUNDO FAMILIAR ORAL CANCUN,,1,CANCUN,FAMILIAR,0,📍 CANCÚN - Familiar,FAMILIAR\n"
+    "179,NOVENA SALA PENAL ORAL,154,2,,PENAL,0,🏛️ SALAS DE SEGUNDA INSTANCIA,PENAL TODAS_SALAS\n"
+)
+
+
+def test_compila_y_recompila_al_cambiar_la_fuente(tmp_path):
+    fuente = tmp_path / 'catalogo.csv'
+    compilado = tmp_path / 'catalogo.json'
+    fuente.write_text(FUENTE, encoding='utf-8')
+
+    catalogo = cargar(str(fuente), str(compilado))
+    assert catalogo.id_juzgado('Juzgado Segundo Familiar Oral Cancún') == 158
+    assert catalogo.area_id(179) == 154 and catalogo.area_id(158) is None
+    assert catalogo.categorias == {'FAMILIAR': ['JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'],
+                                   'PENAL': ['NOVENA SALA PENAL ORAL'],
+                                   'TODAS_SALAS': ['NOVENA SALA PENAL ORAL']}
+    # Segunda instancia primero en la GUI
+    assert [grupo for grupo, _ in catalogo.grupos][0] == '🏛️ SALAS DE SEGUNDA INSTANCIA'
+    assert catalogo.juzgados_disponibles == {'CANCUN': ['JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'],
+                                             'SEGUNDA_INSTANCIA': ['NOVENA SALA PENAL ORAL']}
+
+    # Sin cambios en la fuente se usa el compilado tal cual
+    datos = json.loads(compilado.read_text(encoding='utf-8'))
+    datos['por_clave']['MARCA'] = 1
+    compilado.write_text(json.dumps(datos), encoding='utf-8')
+    assert 'MARCA' in cargar(str(fuente), str(compilado)).por_clave
+
+    # Al cambiar la fuente se recompila
+    fuente.write_text(FUENTE + "95,JUZGADO CIVIL CHETUMAL,,1,CHETUMAL,CIVIL,0,📍 CHETUMAL,CIVIL\n", encoding='utf-8')
+    catalogo = cargar(str(fuente), str(compilado))
+    assert 'MARCA' not in catalogo.por_clave
+    assert catalogo.id_juzgado('juzgado civil chetumal') == 95
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del catálogo federal indexado
+"""
+
+import json
+
+import catalogo_pjf
+
+
+def test_indices_del_catalogo_completo():
+    catalogo = catalogo_pjf.cargar()
+    with open(catalogo_pjf.ARCHIVO_JSON, encoding='utf-8') as f:
+        organismos = json.load(f)
+
+    assert len(catalogo) == len({o['id'] for o in organismos})
+    for circuito in catalogo.circuitos():
+        esperados = [o['id'] for o in organismos if o['circuito_id'] == circuito]
+        assert [o['id'] for o in catalogo.de_circuito(circuito)] == esperados
+    for org in organismos[:50]:
+        organo = catalogo.organismo(org['id'])
+        assert organo['categoria'] == catalogo_pjf.detect_category(org['nombre'])
+        assert organo in catalogo.de_categoria(organo['categoria'])
+    assert sum(len(catalogo.de_categoria(c)) for c in catalogo_pjf.CATEGORY_LABELS) == len(catalogo)
+
+    organo = catalogo.organismos[0]
+    assert catalogo.por_nombre(organo['nombre'].upper()) is organo
+    assert catalogo.de_circuito(9999) == []
+
+
+def test_cargar_desde_csv():
+    catalogo = catalogo_pjf.cargar(catalogo_pjf.ARCHIVO_CSV)
+    assert len(catalogo) > 900
+    assert all(isinstance(o['id'], int) and isinstance(o['circuito_id'], int) for o in catalogo)
+    assert catalogo.por_nombre('juzgado primero de distrito en materia administrativa en la ciudad de mexico')
+
+
+def test_cargar_desde_la_fuente_de_artefactos():
+    catalogo = catalogo_pjf.cargar(catalogo_pjf.ARCHIVO_COMPLETO)
+    with open(catalogo_pjf.ARCHIVO_COMPLETO, encoding='utf-8') as f:
+        organos = json.load(f)['organos']
+
+    assert len(catalogo) == len(organos)
+    organo = catalogo.organismo(organos[0]['id'])
+    assert organo['circuito_id'] == organos[0]['circuitoId']
+    assert catalogo.registros[organo['id']] == organos[0]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del descubrimiento de areaId (sin red: la consulta se simula)
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import descubrir_area_ids as d
+import estrados_http
+
+CONOCIDOS = {170: 145, 171: 146, 173: 148}
+
+
+def test_pagina_de_resultados():
+    assert estrados_http.pagina_de_resultados('<table><tbody></tbody></table>')
+    assert estrados_http.pagina_de_resultados('<p>No se encontraron resultados</p>')
+    assert not estrados_http.pagina_de_resultados('<p>Error en la consulta</p>')
+    assert not estrados_http.pagina_de_resultados('<html><body></body></html>')
+    # Lo que dicen el JavaScript y el CSS de la página no cuenta
+    codigo = ('<script>function f() { if (x) alert("error: not found"); }</script>'
+              '<style>.error { color: red }</style>')
+    assert estrados_http.pagina_de_resultados(f'<html>{codigo}<table><tbody></tbody></table></html>')
+    assert not estrados_http.pagina_de_resultados('<html><script>document.write("<table>")</script></html>')
+
+
+def test_solo_se_descarta_con_una_pagina_completa(monkeypatch):
+    respuestas = {
+        150: '<html><head><script>var e = "error";</script></head><body><table></table></body></html>',
+        151: '<html><body><h1>Estrados Electrónicos</h1><p>Seleccione un área</p></body></html>',
+        152: '<html><body><div class="cargando">',     # Cortada
+        153: '<html><body></body></html>',                # Sin contenido
+    }
+    monkeypatch.setattr(estrados_http, 'obtener_html', lambda url, timeout: respuestas[int(url.split('areaId=')[1][:3])])
+    assert [d.probar_area_id(185, a) for a in sorted(respuestas)] == [True, False, None, None]
+
+    cache = {}
+    d.descubrir({'Sala A': 176}, CONOCIDOS, cache, rango=(151, 153), probar=d.probar_area_id)
+    assert list(cache) == ['176:151'] and cache['176:151']['valido'] is False
+
+
+def test_candidatos_empiezan_por_la_prediccion():
+    orden = d.candidatos(180, CONOCIDOS, rango=(120, 200))
+    assert orden[:3] == [155, 156, 154]
+    assert sorted(orden) == list(range(120, 201))
+
+    # Con la predicción (160) fuera del rango se prueba el rango completo, empezando por lo más cercano
+    assert d.candidatos(185, CONOCIDOS, rango=(120, 130)) == list(range(130, 119, -1))
+
+    # El areaId ya registrado va primero
+    assert d.candidatos(171, {171: 190, 170: 145}, rango=(120, 200))[:2] == [190, 146]
+
+
+def test_descubrir_se_detiene_al_acertar():
+    reales = {'Sala A': 160, 'Sala B': 130}
+    salas = {'Sala A': 185, 'Sala B': 150}
+    probados = []
+    lock = threading.Lock()
+
+    def probar(id_sala, area_id):
+        with lock:
+            probados.append((id_sala, area_id))
+        nombre = next(n for n, i in salas.items() if i == id_sala)
+        if area_id != reales[nombre]:
+            time.sleep(0.02)  # Los aciertos responden antes que los fallos
+            return False
+        return True
+
+    cache = {}
+    resultados, peticiones = d.descubrir(salas, CONOCIDOS, cache, rango=(120, 200), probar=probar)
+    assert resultados == {'Sala A': 160, 'Sala B': 130}
+    assert peticiones == len(probados)
+    # Sala A: predicción exacta (185 - 25), a lo sumo una petición más en vuelo
+    assert len([p for p in probados if p[0] == 185]) <= d.POR_SALA
+    assert cache['185:160']['valido'] is True
+
+
+def test_cache_negativa_evita_repetir():
+    salas = {'Sala A': 185}
+    cache = {}
+    d.descubrir(salas, CONOCIDOS, cache, rango=(155, 162), probar=lambda s, a: a == 158)
+    assert not cache['185:160']['valido']
+
+    probados = []
+    d.descubrir(salas, CONOCIDOS, cache, rango=(155, 162),
+                probar=lambda s, a: probados.append(a) or a == 158)
+    assert probados[0] == 158
+    assert not {159, 160, 161, 162} & set(probados)
+
+    # Un negativo viejo ya no cuenta
+    cache['185:160']['fecha'] = (datetime.now() - timedelta(days=d.DIAS_CACHE + 1)).isoformat()
+    assert not d.negativo_vigente(cache, 185, 160)
+
+
+def test_error_de_red_no_se_guarda():
+    cache = {}
+    resultados, _ = d.descubrir({'Sala A': 185}, CONOCIDOS, cache, rango=(159, 161), probar=lambda s, a: None)
+    assert resultados == {'Sala A': None}
+    assert cache == {}
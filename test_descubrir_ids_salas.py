@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del escáner de IDs (sin red: la consulta se simula)
+"""
+
+import descubrir_ids_salas as d
+import estrados_http
+from catalogo_juzgados import obtener_catalogo
+
+
+def test_clasificar_instancia():
+    assert d.clasificar_instancia('PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR') == 2
+    assert d.clasificar_instancia('Sala Constitucional') == 2
+    assert d.clasificar_instancia('JUZGADO PRIMERO FAMILIAR ORAL CANCUN') == 1
+    assert d.clasificar_instancia('TRIBUNAL DE JUICIO ORAL PENAL SALAS') == 1
+
+
+def test_consultar_id_extrae_nombre(monkeypatch):
+    paginas = {170: '<h3>PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR</h3>', 5: '<p>No se encontraron resultados</p>'}
+
+    def obtener_html(url, timeout=20):
+        id_juzgado = int(url.split('int=')[1].split('&')[0])
+        if id_juzgado == 9:
+            raise OSError('timeout')
+        return paginas[id_juzgado]
+
+    monkeypatch.setattr(estrados_http, 'obtener_html', obtener_html)
+    monkeypatch.setattr(d.time, 'sleep', lambda s: None)
+    assert d.consultar_id(170) == {'id': 170, 'nombre': 'PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR', 'instancia': 2}
+    assert d.consultar_id(5) is None
+    assert d.consultar_id(9) == {'id': 9, 'error': 'timeout'}
+
+
+def test_escanear_y_comparar():
+    nombres = {170: 'PRIMERA SALA CIVIL MERCANTIL Y FAMILIAR', 109: 'JUZGADO TERCERO CIVIL CANCUN',
+               299: 'JUZGADO NUEVO DE PRUEBA'}
+
+    def consultar(id_juzgado):
+        if id_juzgado == 3:
+            return {'id': 3, 'error': 'timeout'}
+        if id_juzgado in nombres:
+            return {'id': id_juzgado, 'nombre': nombres[id_juzgado],
+                    'instancia': d.clasificar_instancia(nombres[id_juzgado])}
+        return None
+
+    encontrados, errores = d.escanear(range(1, 301), hilos=8, consultar=consultar)
+    assert [o['id'] for o in encontrados] == [109, 170, 299]
+    assert errores == [3]
+
+    catalogo = obtener_catalogo()
+    estados = {o['id']: d.comparar_con_catalogo(o, catalogo)['catalogo'] for o in encontrados}
+    assert estados == {109: 'distinto', 170: 'coincide', 299: 'nuevo'}
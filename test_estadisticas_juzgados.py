@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del orden de sondeo aprendido de búsquedas anteriores
+"""
+
+import pytest
+
+from estadisticas_juzgados import EstadisticasJuzgados, caracteristicas
+
+
+def test_caracteristicas():
+    assert caracteristicas('615/2019') == {'anio': '2019', 'patron': '3d'}
+    assert caracteristicas('0042/25-II') == {'anio': '2025', 'patron': '2d+'}
+    assert caracteristicas('sin número') == {}
+
+
+def test_orden_aprendido(tmp_path):
+    estadisticas = EstadisticasJuzgados(str(tmp_path / 'estadisticas.json'))
+    for i in range(5):
+        estadisticas.registrar(f'{100 + i}/2019', 'ACIERTA 2019', True)
+        estadisticas.registrar(f'{100 + i}/2025', 'ACIERTA 2025', True)
+        estadisticas.registrar(f'{100 + i}/2019', 'NUNCA', False)
+
+    juzgados = ['NUNCA', 'SIN HISTORIAL', 'ACIERTA 2025', 'ACIERTA 2019']
+    # Un juzgado cuyos aciertos son de otro año queda detrás de uno sin historial
+    assert estadisticas.ordenar('615/2019', juzgados) == ['ACIERTA 2019', 'SIN HISTORIAL', 'ACIERTA 2025', 'NUNCA']
+    assert estadisticas.ordenar('615/2025', juzgados)[0] == 'ACIERTA 2025'
+
+    probs = estadisticas.probabilidades('615/2019', juzgados)
+    assert sum(probs.values()) == pytest.approx(1)
+
+
+def test_juzgado_sin_historial_usa_el_prior(tmp_path):
+    estadisticas = EstadisticasJuzgados(str(tmp_path / 'estadisticas.json'))
+    juzgados = [f'JUZGADO {i}' for i in range(10)]
+
+    # Sin datos todos son igual de probables y se conserva el orden dado
+    probs = estadisticas.probabilidades('615/2019', juzgados)
+    assert all(p == pytest.approx(0.1) for p in probs.values())
+    assert estadisticas.ordenar('615/2019', juzgados) == juzgados
+    assert estadisticas.tam_oleada('615/2019', juzgados) == 8
+
+    # Un juzgado nuevo queda por encima de uno que nunca acierta, no en cero
+    for _ in range(10):
+        estadisticas.registrar('615/2019', 'JUZGADO 0', False)
+    probs = estadisticas.probabilidades('615/2019', juzgados)
+    assert 0 < probs['JUZGADO 0'] < probs['JUZGADO 1']
+    assert estadisticas.ordenar('615/2019', juzgados)[-1] == 'JUZGADO 0'
+
+
+def test_guardar_y_cargar(tmp_path):
+    archivo = str(tmp_path / 'estadisticas.json')
+    estadisticas = EstadisticasJuzgados(archivo)
+    estadisticas.registrar('615/2019', 'SALA CONSTITUCIONAL', True)
+    estadisticas.registrar('12/2025-II', 'SALA CONSTITUCIONAL', False)
+    estadisticas.registrar('12/2025', 'JUZGADO CIVIL', True)
+    estadisticas.guardar()
+
+    recargadas = EstadisticasJuzgados(archivo)
+    assert recargadas.juzgados == estadisticas.juzgados
+    juzgados = ['JUZGADO CIVIL', 'SALA CONSTITUCIONAL', 'OTRO']
+    assert recargadas.probabilidades('7/2019', juzgados) == estadisticas.probabilidades('7/2019', juzgados)
+
+    # Un archivo dañado no impide la búsqueda: se empieza sin historial
+    with open(archivo, 'w', encoding='utf-8') as f:
+        f.write('{"juzgados": ')
+    assert EstadisticasJuzgados(archivo).juzgados == {}
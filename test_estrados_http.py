@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del acceso HTTP directo a los Estrados (sin red)
+"""
+
+import estrados_http
+
+
+def test_url_primera_y_segunda_instancia():
+    url = estrados_http.url_busqueda(109, '2358/2025', 1)
+    assert url.endswith('/buscador_primera.php?int=109&metodo=1&findexp=2358/2025')
+
+    url = estrados_http.url_busqueda(179, '615/2019', 1, area_id=154)
+    assert '/buscador_segunda.php?findexp=615/2019&int=179&areaId=154&metodo=1' in url
+
+
+def test_hay_publicaciones():
+    assert estrados_http.hay_publicaciones('<table><tr class="odd"><td>1</td></tr></table>')
+    assert estrados_http.hay_publicaciones('<tr>' + '<td>x</td>' * 7 + '</tr>')
+    assert not estrados_http.hay_publicaciones('<p>No se encontraron resultados</p>')
+    assert not estrados_http.hay_publicaciones('<table><tr><th>Fecha</th></tr></table>')
+
+
+def test_extraer_publicaciones():
+    html = (
+        '<table><thead><tr><th>ID</th><th>Documento</th></tr></thead><tbody>'
+        '<tr class="odd"><td>101</td><td><a href="doc.pdf">Acuerdo</a></td><td>ORDINARIO CIVIL</td>'
+        '<td>PÉREZ &amp; ASOCIADOS</td><td>JUAN<br>MARÍA</td><td>Se tiene por  presentado</td><td>15/01/2025</td></tr>'
+        '<tr class="even"><td>102<td>Sentencia<td>EJECUTIVO<td>A<td>B<td>C<td>16/01/2025</tr>'
+        '<tr><td colspan="7">Total: 2</td></tr>'
+        '</tbody></table>'
+    )
+    publicaciones = estrados_http.extraer_publicaciones(html)
+    assert len(publicaciones) == 2
+    assert publicaciones[0] == {
+        'id_acuerdo': '101', 'documento': 'Acuerdo', 'juicio': 'ORDINARIO CIVIL',
+        'promoventes': 'PÉREZ & ASOCIADOS', 'demandados': 'JUAN\nMARÍA',
+        'extracto': 'Se tiene por presentado', 'fecha_publicacion': '15/01/2025',
+    }
+    assert publicaciones[1]['fecha_publicacion'] == '16/01/2025'
+    assert estrados_http.extraer_publicaciones('<p>No se encontraron resultados</p>') == []
+
+
+def test_nombre_organo():
+    html = ('<html><head><title>Estrados Electrónicos</title><script>var SALA = 1;</script></head>'
+            '<body><h4>Juzgado: JUZGADO PRIMERO FAMILIAR ORAL CANCUN</h4><p>Sala de audiencias</p></body></html>')
+    assert estrados_http.nombre_organo(html) == 'JUZGADO PRIMERO FAMILIAR ORAL CANCUN'
+    assert estrados_http.nombre_organo('<div>Órgano: <b>DÉCIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA</b></div>') \
+        == 'DÉCIMA SALA CIVIL MERCANTIL Y FAMILIAR PLAYA'
+    assert estrados_http.nombre_organo('<p>No se encontraron resultados</p>') is None
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del rastreo del catálogo de tipos de asunto del PJF (sesión simulada, sin red)
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import fetch_catalogos_pjf as pjf
+from catalogo_pjf import CatalogoPJF
+
+
+def _html_tipos(organo_id):
+    opciones = ''.join(f'<option value="{i}">Tipo {i}</option>' for i in (1, 2, organo_id % 7 + 10))
+    return f'<div><select id="ddlTipoAsunto"><option value="">Seleccione</option>{opciones}</select></div>'
+
+
+class Respuesta:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+    encoding = 'utf-8'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+    def iter_content(self, chunk_size):
+        datos = self.text.encode('utf-8')
+        for i in range(0, len(datos), chunk_size):
+            yield datos[i:i + chunk_size]
+
+
+class SesionSimulada:
+    """Responde a ObtenerDatosExpediente; algunos órganos fallan de forma transitoria"""
+
+    def __init__(self, fallas=None):
+        self.fallas = dict(fallas or {})  # id -> errores 503 antes de responder
+        self.lock = threading.Lock()
+        self.peticiones = []
+        self.simultaneas = 0
+        self.max_simultaneas = 0
+
+    def post(self, url, data, headers, timeout, stream=False):
+        organo_id = int(data.split('&')[0].split('=')[1])
+        with self.lock:
+            self.peticiones.append(organo_id)
+            self.simultaneas += 1
+            self.max_simultaneas = max(self.max_simultaneas, self.simultaneas)
+        time.sleep(0.01)
+        with self.lock:
+            self.simultaneas -= 1
+            if self.fallas.get(organo_id, 0) > 0:
+                self.fallas[organo_id] -= 1
+                return Respuesta(503)
+        return Respuesta(200, _html_tipos(organo_id))
+
+
+def test_rastreo_completo_con_reintentos():
+    organos = list(CatalogoPJF(
+        {'id': i, 'nombre': f'Juzgado {i} de Distrito', 'circuito_id': i % 3 + 1} for i in range(1, 41)))
+    sesion = SesionSimulada(fallas={5: 2, 9: pjf.MAX_RETRIES + 1})
+
+    tipos = pjf.fetch_tipos_organos(organos, sesion, workers=4, rate=1000, backoff=0, progress=False)
+
+    assert set(tipos) == {o['id'] for o in organos}
+    assert tipos[5] == [{'id': 1, 'nombre': 'Tipo 1'}, {'id': 2, 'nombre': 'Tipo 2'}, {'id': 15, 'nombre': 'Tipo 15'}]
+    assert tipos[9] is None  # Agotó los reintentos
+    assert 1 < sesion.max_simultaneas <= 4
+
+    categorias = pjf.merge_tipos(organos, tipos)
+    ids = [t['id'] for t in categorias['juzgado_distrito']['tipos']]
+    assert ids == sorted(set(ids)) and len(ids) == 2 + 7
+
+
+def test_token_bucket_limita_la_tasa():
+    bucket = pjf.TokenBucket(rate=50, burst=5)
+    inicio = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # 5 de golpe y 10 más a 50/s
+    assert time.monotonic() - inicio >= 10 / 50 * 0.9
+
+
+def test_muestreo_por_categoria():
+    catalogo = CatalogoPJF({'id': i, 'nombre': 'Juzgado X' if i % 2 else 'Tribunal Colegiado Y', 'circuito_id': i // 2}
+                           for i in range(20))
+    elegidos = pjf.select_organos(catalogo, max_samples=3)
+    assert len(elegidos) == 6
+    assert len({o['circuito_id'] for o in elegidos if o['categoria'] == 'juzgado_distrito'}) == 3
+    assert pjf.select_organos(catalogo) == catalogo.organismos
+
+
+def test_actualizacion_incremental(tmp_path):
+    organos = [{'id': i, 'nombre': f'Juzgado {i} de Distrito', 'circuito_id': 1} for i in (1, 2, 3)]
+    ruta_cache = str(tmp_path / 'cache.json')
+    hace_10_dias = datetime.now() - timedelta(days=10)
+
+    cache = pjf.load_cache(ruta_cache)
+    assert pjf.stale_organos(organos, cache) == organos
+    pjf.update_cache(cache, {1: [{'id': 1, 'nombre': 'A'}], 2: [{'id': 2, 'nombre': 'B'}]}, now=hace_10_dias)
+    pjf.update_cache(cache, {3: [{'id': 3, 'nombre': 'C'}]})
+    pjf.save_cache(cache, ruta_cache)
+
+    cache = pjf.load_cache(ruta_cache)
+    assert [o['id'] for o in pjf.stale_organos(organos, cache, max_age_days=7)] == [1, 2]
+    assert pjf.stale_organos(organos, cache, max_age_days=30) == []
+    assert len(pjf.stale_organos(organos, cache, max_age_days=30, force=True)) == 3
+
+    # Solo cuenta como cambio la respuesta con otro contenido; un fallo conserva la anterior
+    cambiados = pjf.update_cache(cache, {1: [{'id': 1, 'nombre': 'A'}], 2: None, 3: [{'id': 4, 'nombre': 'D'}]})
+    assert cambiados == [3]
+    assert cache[2]['tipos'] == [{'id': 2, 'nombre': 'B'}]
+
+
+def test_diff_y_escritura_sin_cambios(tmp_path):
+    anterior = {'juzgado_distrito': {'label': 'J', 'tipos': [{'id': 1, 'nombre': 'A'}, {'id': 2, 'nombre': 'B'}]}}
+    nuevo = {'juzgado_distrito': {'label': 'J', 'tipos': [{'id': 1, 'nombre': 'A'}, {'id': 3, 'nombre': 'C'}]},
+             'otro': {'label': 'O', 'tipos': []}}
+    assert pjf.diff_categorias(anterior, nuevo) == {
+        'juzgado_distrito': {'agregados': [{'id': 3, 'nombre': 'C'}], 'quitados': [{'id': 2, 'nombre': 'B'}]}}
+    assert pjf.diff_categorias(nuevo, nuevo) == {}
+
+    salida = tmp_path / 'tipos_asunto.json'
+    assert pjf.write_if_changed(str(salida), {'por_categoria': nuevo})
+    modificado = salida.stat().st_mtime_ns
+    time.sleep(0.01)
+    assert not pjf.write_if_changed(str(salida), {'por_categoria': nuevo})
+    assert salida.stat().st_mtime_ns == modificado
+
+
+def test_fuente_de_artefactos_con_el_crawl():
+    fuente = {
+        'generado': '2026-01-01T00:00:00.000Z',
+        'resumen': {'totalOrganos': 3, 'totalTiposAsunto': 1, 'totalRelaciones': 2},
+        'tiposAsunto': [{'id': 1, 'nombre': 'Amparo Indirecto', 'tiposProcedimiento': [{'id': 5}]}],
+        'tiposOrgano': [
+            {'TipoOrganismoId': 2, 'TipoOrganismo': 'Juzgado de Distrito', 'MateriaOrganismoId': 8,
+             'tiposAsunto': [{'id': 1, 'nombre': 'Amparo Indirecto'}]},
+            {'TipoOrganismoId': 4, 'TipoOrganismo': 'Tribunal Colegiado', 'MateriaOrganismoId': 8,
+             'tiposAsunto': [{'id': 1, 'nombre': 'Amparo Indirecto'}]},
+        ],
+        'organos': [{'id': 10, 'tipoOrganismoId': 2, 'materiaId': 8},
+                    {'id': 11, 'tipoOrganismoId': 2, 'materiaId': 8},
+                    {'id': 20, 'tipoOrganismoId': 4, 'materiaId': 8}],
+    }
+    crawl = {10: [{'id': 1, 'nombre': 'Amparo Indirecto'}], 11: [{'id': 9, 'nombre': 'Juicio Nuevo'}]}
+    ahora = datetime(2026, 3, 1, 12, 0)
+
+    nueva = pjf.refresh_source_catalog(fuente, crawl, now=ahora)
+    assert [t['id'] for t in nueva['tiposOrgano'][0]['tiposAsunto']] == [1, 9]
+    assert nueva['tiposOrgano'][1] == fuente['tiposOrgano'][1]  # Sin órganos consultados: se conserva
+    assert nueva['tiposAsunto'] == [fuente['tiposAsunto'][0],
+                                    {'id': 9, 'nombre': 'Juicio Nuevo', 'tiposProcedimiento': []}]
+    assert nueva['resumen']['totalTiposAsunto'] == 2
+    assert nueva['generado'] == '2026-03-01T12:00:00.000Z'
+
+    # Volver a aplicar el mismo crawl no cambia nada (ni la fecha)
+    assert pjf.refresh_source_catalog(nueva, crawl, now=datetime(2026, 4, 1)) == nueva
+
+
+def test_extraccion_por_bloques_se_detiene_al_cerrar_el_select():
+    html = ('<html><head><script>var s = "<select id=x>";</script></head><body>'
+            + '<div class="fila"><input name="a" value="1"></div>' * 500
+            + '<select name="otro" id="ddlOtro"><option value="9">No</option></select>'
+            + '<select class="form" id="ddlTipoAsunto" onchange="f()">'
+            + '<option value="">Seleccione</option><option value="1">Amparo &amp; Indirecto</option>'
+            + '<option value="28">Causa Penal</option></select>'
+            + '<select id="ddlTipoAsunto"><option value="99">Duplicado</option></select>')
+    esperado = [{'id': 1, 'nombre': 'Amparo & Indirecto'}, {'id': 28, 'nombre': 'Causa Penal'}]
+    assert pjf.parse_select(html, 'ddlTipoAsunto') == esperado
+
+    leidos = []
+
+    def bloques(tam):
+        for i in range(0, len(html), tam):
+            leidos.append(i)
+            yield html[i:i + tam]
+
+    for tam in (1, 7, 64, 4096):
+        leidos.clear()
+        assert pjf.extract_select_options(bloques(tam), 'ddlTipoAsunto') == esperado
+        # No se lee el último <select>
+        assert leidos[-1] < html.rindex('<select')
+    assert pjf.parse_select(html, 'ddlNoExiste') == []
+
+
+def test_resto_de_la_respuesta_se_descarta_sin_decodificar(monkeypatch):
+    cola = '<div>' + 'x' * 100 + '</div>'
+    respuesta = Respuesta(200, _html_tipos(3) + cola * 2000)
+    leidos = []
+    decodificados = []
+    original_iter_content = respuesta.iter_content
+    original_iter_text = pjf.iter_text
+
+    def iter_content(chunk_size):
+        for bloque in original_iter_content(chunk_size):
+            leidos.append(len(bloque))
+            yield bloque
+
+    def iter_text(raw_chunks, encoding=None):
+        for texto in original_iter_text(raw_chunks, encoding):
+            decodificados.append(len(texto))
+            yield texto
+
+    respuesta.iter_content = iter_content
+    monkeypatch.setattr(pjf, 'iter_text', iter_text)
+    sesion = type('Sesion', (), {'post': lambda self, *a, **k: respuesta})()
+
+    assert [t['id'] for t in pjf.fetch_tipos(3, sesion)] == [1, 2, 13]
+    # Todo el cuerpo se leyó (la conexión vuelve al pool), pero solo se decodificó el inicio
+    assert sum(leidos) == len(respuesta.text.encode('utf-8'))
+    assert len(decodificados) == 1 and len(leidos) > 1
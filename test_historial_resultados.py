@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del historial paginado de resultados
+"""
+
+from historial_resultados import FiltroResultados, HistorialResultados
+
+
+def _resultado(i):
+    return {
+        'fecha_busqueda': '2026-01-05 09:00:00',
+        'busqueda': f'{i}/2025',
+        'tipo_busqueda': 'expediente',
+        'juzgado': 'SALA CONSTITUCIONAL' if i % 2 else 'JUZGADO CIVIL CHETUMAL',
+        'estado': 'Con publicaciones',
+        'publicaciones': [{
+            'id_acuerdo': str(i),
+            'documento': 'Acuerdo\nde trámite',
+            'extracto': 'Se tiene por recibido, "con anexos"',
+            'fecha_publicacion': f'{1 + i % 28:02d}/01/2026',
+            'es_nuevo': i % 5 == 0,
+        }],
+    }
+
+
+def test_paginas_sin_filtro(tmp_path):
+    archivo = str(tmp_path / 'historial.csv')
+    HistorialResultados(archivo).agregar([_resultado(i) for i in range(250)])
+
+    historial = HistorialResultados(archivo)  # Reabre usando el índice guardado
+    assert historial.total() == 250
+
+    filas, hay_mas = historial.pagina(0, tam=100)
+    assert filas[0]['Búsqueda'] == '249/2025'  # Más reciente primero
+    assert filas[0]['Documento'] == 'Acuerdo de trámite'
+    assert hay_mas
+
+    filas, hay_mas = historial.pagina(2, tam=100)
+    assert len(filas) == 50 and filas[-1]['Búsqueda'] == '0/2025'
+    assert not hay_mas
+
+
+def test_paginas_con_filtro(tmp_path):
+    historial = HistorialResultados(str(tmp_path / 'historial.csv'))
+    historial.agregar([_resultado(i) for i in range(100)])
+    historial.agregar([_resultado(i) for i in range(100, 200)])
+
+    filtro = FiltroResultados(juzgado='sala', solo_nuevos=True)
+    esperadas = [f'{i}/2025' for i in reversed(range(200)) if i % 2 and i % 5 == 0]
+
+    filas, hay_mas = historial.pagina(0, tam=15, filtro=filtro)
+    assert [f['Búsqueda'] for f in filas] == esperadas[:15] and hay_mas
+    filas, hay_mas = historial.pagina(1, tam=15, filtro=filtro)
+    assert [f['Búsqueda'] for f in filas] == esperadas[15:] and not hay_mas
+
+
+def test_filtro_de_texto_por_campo(tmp_path):
+    historial = HistorialResultados(str(tmp_path / 'historial.csv'))
+    historial.agregar([_resultado(i) for i in range(10)])
+
+    # Las comillas del extracto van duplicadas en el CSV crudo
+    filas, _ = historial.pagina(0, filtro=FiltroResultados(texto='"con anexos"'))
+    assert len(filas) == 10
+
+    # El texto debe estar dentro de un campo, no repartido entre dos
+    filas, _ = historial.pagina(0, filtro=FiltroResultados(texto='chetumal,con'))
+    assert filas == []
+
+    filas, _ = historial.pagina(0, filtro=FiltroResultados(texto='CHETUMAL'))
+    assert [f['Búsqueda'] for f in filas] == [f'{i}/2025' for i in (8, 6, 4, 2, 0)]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la importación masiva de expedientes (CSV)
+"""
+
+from importar_expedientes import importar
+
+JUZGADOS = [
+    'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN',
+    'JUZGADO PRIMERO FAMILIAR ORAL CANCUN',
+    'JUZGADO CIVIL CHETUMAL',
+    'NOVENA SALA PENAL ORAL',
+]
+
+
+def test_importar_csv(tmp_path):
+    ruta = tmp_path / 'clientes.csv'
+    ruta.write_text(
+        "Expediente;Juzgado;Notas\n"
+        "0615 / 2019;Novena Sala Penal Oral;Cliente A\n"
+        "2358/25;Juzgado Segundo Familiar Oral Cancún;\n"
+        "615/2019;NOVENA SALA PENAL ORAL;Cliente B\n"   # Repetido en el archivo
+        "2501/2025;juzgado segundo familiar oral cancun;\n"  # Ya estaba en la lista
+        ";;\n"                                           # Fila vacía
+        "abc;Juzgado Civil Chetumal;\n"                  # Formato inesperado: se agrega con aviso
+        "10/2024;Juzgado Inexistente;\n",
+        encoding='utf-8'
+    )
+    existentes = [{'numero': '2501/2025', 'juzgado': 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'}]
+
+    resultado = importar(str(ruta), JUZGADOS, existentes)
+
+    assert resultado.filas_leidas == 6
+    # Los números se normalizan; la forma escrita queda en el comentario
+    assert resultado.agregados == [
+        {'juzgado': 'NOVENA SALA PENAL ORAL', 'numero': '615/2019',
+         'comentario': 'Cliente A | Número escrito: 0615 / 2019 | Cliente B'},
+        {'juzgado': 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN', 'numero': '2358/2025',
+         'comentario': 'Número escrito: 2358/25'},
+        {'juzgado': 'JUZGADO CIVIL CHETUMAL', 'numero': 'abc'},
+    ]
+    assert resultado.duplicados == 1
+    assert resultado.ya_existentes == 1
+    assert [fila for fila, _ in resultado.descartados] == [8]
+    assert [fila for fila, _ in resultado.avisos] == [7]
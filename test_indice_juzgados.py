@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de búsqueda incremental de juzgados
+"""
+
+import time
+
+import catalogo_pjf
+from indice_juzgados import IndiceJuzgados
+from planificador import normalizar_nombre
+
+CATALOGO = [
+    ('NOVENA SALA PENAL ORAL', '🏛️ SALAS DE SEGUNDA INSTANCIA'),
+    ('SALA CONSTITUCIONAL', '🏛️ SALAS DE SEGUNDA INSTANCIA'),
+    ('JUZGADO PRIMERO FAMILIAR ORAL CANCUN', '📍 CANCÚN - Familiar'),
+    ('JUZGADO SEGUNDO FAMILIAR ORAL CANCUN', '📍 CANCÚN - Familiar'),
+    ('JUZGADO CIVIL CHETUMAL', '📍 CHETUMAL'),
+]
+
+
+def test_busqueda_por_prefijos():
+    indice = IndiceJuzgados(CATALOGO)
+
+    assert [n for n, _ in indice.buscar('seg fam canc')] == ['JUZGADO SEGUNDO FAMILIAR ORAL CANCUN']
+    assert [n for n, _ in indice.buscar('Cancún')] == [
+        'JUZGADO PRIMERO FAMILIAR ORAL CANCUN', 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN']
+    # Las que empiezan con el texto van primero
+    assert indice.buscar('sala')[0][0] == 'SALA CONSTITUCIONAL'
+    # Por categoría
+    assert [n for n, _ in indice.buscar('segunda instancia')] == ['NOVENA SALA PENAL ORAL', 'SALA CONSTITUCIONAL']
+    assert indice.buscar('penal familiar') == []
+    assert len(indice.buscar('')) == len(CATALOGO)
+    assert indice.exacto('juzgado civil chetumal') == 'JUZGADO CIVIL CHETUMAL'
+    assert indice.exacto('juzgado civil') is None
+
+
+def test_catalogo_federal_completo():
+    catalogo = catalogo_pjf.cargar(catalogo_pjf.ARCHIVO_CSV)
+    entradas = [(o['nombre'], str(o['circuito_id'])) for o in catalogo]
+    indice = IndiceJuzgados(entradas)
+    assert len(indice) > 900
+
+    inicio = time.perf_counter()
+    for texto in ('j', 'ju', 'juz', 'juzgado', 'juzgado seg', 'juzgado segundo dis', 'juzgado segundo distrito admin'):
+        resultados = indice.buscar(texto)
+    transcurrido = time.perf_counter() - inicio
+
+    claves = [normalizar_nombre(n).split() for n, _ in resultados]
+    assert claves and all('SEGUNDO' in c and any(p.startswith('ADMIN') for p in c) for c in claves)
+    assert transcurrido < 0.1  # Siete teclas; cada una muy por debajo de un cuadro (16 ms)
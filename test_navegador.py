@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la caché de rutas de Chrome y de la captura de red (sin abrir el navegador)
+"""
+
+import base64
+import json
+
+from navegador import CapturaRed, guardar_rutas, olvidar_rutas, registrar_medicion, rutas_en_cache, MAX_MEDICIONES
+
+
+def test_cache_de_rutas(tmp_path):
+    archivo = str(tmp_path / 'rutas.json')
+    driver = tmp_path / 'chromedriver'
+    driver.write_text('')
+
+    assert rutas_en_cache(archivo) is None
+    guardar_rutas({'driver_path': str(driver), 'browser_path': None}, archivo)
+    assert rutas_en_cache(archivo)['driver_path'] == str(driver)
+
+    # Las mediciones no borran las rutas y se conservan solo las últimas
+    for i in range(MAX_MEDICIONES + 5):
+        registrar_medicion(3.0, 5.0 + i, True, archivo)
+    data = json.loads((tmp_path / 'rutas.json').read_text(encoding='utf-8'))
+    assert len(data['mediciones']) == MAX_MEDICIONES
+    assert rutas_en_cache(archivo) is not None
+
+    # Si el ejecutable desaparece (p. ej. actualización), la caché no se usa
+    driver.unlink()
+    assert rutas_en_cache(archivo) is None
+    olvidar_rutas(archivo)
+    assert 'rutas' not in json.loads((tmp_path / 'rutas.json').read_text(encoding='utf-8'))
+
+
+class DriverConRegistro:
+    def __init__(self, eventos, cuerpos):
+        self.eventos = eventos
+        self.cuerpos = cuerpos
+
+    def get_log(self, tipo):
+        assert tipo == 'performance'
+        eventos, self.eventos = self.eventos, []  # Chrome vacía el registro al leerlo
+        return [{'message': json.dumps({'message': e})} for e in eventos]
+
+    def execute_cdp_cmd(self, comando, parametros):
+        assert comando == 'Network.getResponseBody'
+        return self.cuerpos[parametros['requestId']]
+
+
+def _respuesta(id_peticion, url, tipo='Document'):
+    return {'method': 'Network.responseReceived',
+            'params': {'requestId': id_peticion, 'type': tipo, 'response': {'url': url}}}
+
+
+def test_captura_de_respuestas():
+    url_a = 'https://x/estrados/buscador_primera.php?int=1&metodo=1&findexp=10/2025'
+    url_b = 'https://x/estrados/buscador_primera.php?int=1&metodo=2&findexp=JUAN%20P%C3%89REZ'
+    driver = DriverConRegistro(
+        [_respuesta('1', url_a), _respuesta('2', 'https://x/estilos.css', 'Stylesheet'),
+         {'method': 'Network.loadingFinished', 'params': {'requestId': '1'}}, _respuesta('3', url_b)],
+        {'1': {'body': '<html>A</html>', 'base64Encoded': False},
+         '3': {'body': base64.b64encode('<html>B</html>'.encode()).decode(), 'base64Encoded': True}},
+    )
+    captura = CapturaRed()
+
+    assert captura.cuerpo(driver, url_a) == '<html>A</html>'
+    # La respuesta de otra pestaña quedó guardada aunque el registro ya se vació
+    assert captura.cuerpo(driver, 'https://x/estrados/buscador_primera.php?int=1&metodo=2&findexp=JUAN PÉREZ') == '<html>B</html>'
+    assert captura.cuerpo(driver, url_a) is None
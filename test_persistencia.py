@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del guardado atómico y diferido de JSON
+"""
+
+import json
+import os
+import threading
+import time
+
+from persistencia import AutoGuardado, escribir_json_atomico
+
+
+def test_escritura_atomica(tmp_path):
+    ruta = tmp_path / 'expedientes.json'
+    escribir_json_atomico(str(ruta), {'expedientes': [{'numero': '615/2019'}]})
+    escribir_json_atomico(str(ruta), {'expedientes': []})
+
+    assert json.loads(ruta.read_text(encoding='utf-8')) == {'expedientes': []}
+    assert os.listdir(tmp_path) == ['expedientes.json']  # Sin temporales sueltos
+
+
+def test_archivo_nuevo_respeta_la_umask(tmp_path):
+    anterior = os.umask(0o027)
+    try:
+        escribir_json_atomico(str(tmp_path / 'nuevo.json'), {})
+    finally:
+        os.umask(anterior)
+    assert (tmp_path / 'nuevo.json').stat().st_mode & 0o777 == 0o640
+
+
+def test_autoguardado_agrupa_y_omite_sin_cambios(tmp_path):
+    ruta = tmp_path / 'expedientes.json'
+    datos = {'config': {'max_pestanas': 5}, 'expedientes': []}
+    auto = AutoGuardado(str(ruta), lambda: dict(datos, expedientes=list(datos['expedientes'])), retardo=60)
+
+    for i in range(50):
+        datos['expedientes'].append({'numero': f'{i}/2025'})
+        auto.marcar_cambio()
+    assert not ruta.exists()  # Aún dentro del retardo
+
+    assert auto.guardar_ahora()
+    guardado = json.loads(ruta.read_text(encoding='utf-8'))
+    assert guardado['config'] == {'max_pestanas': 5}
+    assert len(guardado['expedientes']) == 50
+
+    # Mismo contenido: no se reescribe
+    auto.marcar_cambio()
+    assert not auto.guardar_ahora()
+    assert not auto.hay_cambios_pendientes()
+
+
+def test_autoguardado_no_escribe_una_version_vieja_al_final(tmp_path):
+    ruta = tmp_path / 'expedientes.json'
+    datos = {'version': 1}
+    auto = AutoGuardado(str(ruta), lambda: dict(datos), retardo=60)
+    auto.marcar_cambio()
+
+    # El timer (con la versión 1 pendiente) obtiene el turno de escritura
+    # solo después de que guardar_ahora escribió la versión 2
+    manual_terminado = threading.Event()
+    lock = auto._lock_escritura
+
+    class TurnoOrdenado:
+        def __enter__(self):
+            if threading.current_thread() is timer:
+                manual_terminado.wait(5)
+            lock.acquire()
+
+        def __exit__(self, *exc):
+            lock.release()
+
+    auto._lock_escritura = TurnoOrdenado()
+    timer = threading.Thread(target=auto._escribir_pendiente)
+    timer.start()
+    time.sleep(0.05)
+    datos['version'] = 2
+    auto.marcar_cambio()
+    assert auto.guardar_ahora()
+    manual_terminado.set()
+    timer.join()
+
+    assert json.loads(ruta.read_text(encoding='utf-8')) == {'version': 2}
+    assert not auto.hay_cambios_pendientes()
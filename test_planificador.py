@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del planificador de ejecuciones con plazo (sin navegador)
+"""
+
+from datetime import datetime
+
+import pytest
+
+from planificador import HistorialBusquedas, interpretar_limite, normalizar_numero, planificar, preparar_lote, prioridad
+
+
+def test_interpretar_limite():
+    ahora = datetime(2026, 1, 12, 9, 0)
+    assert interpretar_limite('10:00', ahora) == datetime(2026, 1, 12, 10, 0)
+    assert interpretar_limite('45', ahora) == datetime(2026, 1, 12, 9, 45)
+    assert interpretar_limite('1h30m', ahora) == datetime(2026, 1, 12, 10, 30)
+    with pytest.raises(ValueError):
+        interpretar_limite('08:00', ahora)
+    with pytest.raises(ValueError):
+        interpretar_limite('pronto', ahora)
+
+
+def test_planificar_por_prioridad_y_antiguedad(tmp_path):
+    historial = HistorialBusquedas(archivo=str(tmp_path / 'historial.json'))
+    exps = [{'numero': f'{i}/2025', 'juzgado': 'JUZGADO CIVIL CHETUMAL'} for i in range(6)]
+    exps[4]['prioridad'] = 'alta'
+    historial.registrar(exps[0], 5.0, ahora=100)   # Revisado recientemente
+    historial.registrar(exps[1], 5.0, ahora=10)    # Revisado hace más tiempo
+
+    # Arranque + 3 búsquedas de 5 s
+    seleccionados, omitidos = planificar(exps, historial, historial.arranque + 15, ahora=200)
+
+    assert [e['numero'] for e in seleccionados] == ['4/2025', '2/2025', '3/2025']
+    assert [e['numero'] for e in omitidos] == ['5/2025', '1/2025', '0/2025']
+
+
+def test_normalizar_numero():
+    assert normalizar_numero(' 0615 / 2019 ') == '615/2019'
+    assert normalizar_numero('615-19') == '615/2019'
+    assert normalizar_numero('2358/2025-ii') == '2358/2025-II'
+    assert normalizar_numero('samanta') is None
+    assert normalizar_numero('615/2019/3') is None
+
+
+def test_preparar_lote_deduplica_y_agrupa():
+    ids = {'JUZGADO CIVIL CHETUMAL': 95, 'JUZGADO MERCANTIL PLAYA': 85}
+    lote = [
+        {'numero': '1/2024', 'juzgado': 'JUZGADO CIVIL CHETUMAL', 'comentario': 'Cliente A'},
+        {'nombre': 'juan  perez', 'juzgado': 'JUZGADO MERCANTIL PLAYA'},
+        {'numero': '001/2024', 'juzgado': ' juzgado civil chetumal ', 'comentario': 'Cliente B'},
+        {'numero': '2/2024', 'juzgado': 'JUZGADO CIVIL CHETUMAL'},
+        {'numero': 'sin número', 'juzgado': 'JUZGADO CIVIL CHETUMAL'},
+        {'numero': '3/2024', 'juzgado': 'JUZGADO INEXISTENTE'},
+    ]
+    consultas = []
+
+    def resolver(nombre):
+        consultas.append(nombre)
+        return ids.get(nombre.upper())
+
+    validos, descartados, duplicados, avisos = preparar_lote(lote, resolver)
+
+    assert duplicados == 1
+    assert len(descartados) == 1
+    # Un número con formato inesperado no se descarta: se busca tal cual y se avisa
+    assert [(e.get('numero') or e['nombre'], e['id_juzgado']) for e in validos] == [
+        ('1/2024', 95), ('2/2024', 95), ('sin número', 95), ('juan perez', 85)
+    ]
+    assert [exp['numero'] for exp, _ in avisos] == ['sin número']
+    assert validos[0]['comentario'] == 'Cliente A | Cliente B | Número escrito: 001/2024'
+    assert len(consultas) == 3  # Un solo intento de resolución por juzgado
+
+
+def test_preparar_lote_normaliza_y_conserva_el_numero_escrito():
+    lote = [
+        {'numero': ' 0615 / 2019 ', 'juzgado': 'NOVENA SALA PENAL ORAL'},
+        {'numero': '615-19', 'juzgado': 'NOVENA SALA PENAL ORAL', 'comentario': 'Otra forma'},
+        {'numero': '615/2019', 'juzgado': 'NOVENA SALA PENAL ORAL'},
+        {'numero': 'CA-12/2024', 'juzgado': 'NOVENA SALA PENAL ORAL'},
+        {'numero': 'ca-12/2024', 'juzgado': 'NOVENA SALA PENAL ORAL'},
+    ]
+    validos, descartados, duplicados, avisos = preparar_lote(lote, lambda nombre: 170)
+
+    # Se busca la forma normalizada; las formas escritas quedan en el comentario
+    assert [e['numero'] for e in validos] == ['615/2019', 'CA-12/2024']
+    assert validos[0]['comentario'] == 'Número escrito: 0615 / 2019 | Otra forma | Número escrito: 615-19'
+    assert duplicados == 3 and not descartados
+    # Un formato inesperado se busca tal cual, con aviso
+    assert [exp['numero'] for exp, _ in avisos] == ['CA-12/2024', 'ca-12/2024']
+
+
+def test_prioridad_acepta_numeros_texto_y_nulos(tmp_path, capsys):
+    assert [prioridad({'prioridad': v}) for v in (2, 1.5, '2', ' Alta ', 'baja', None, 'urgente', True)] == \
+        [2, 1.5, 2, 2, 0, 0, 0, 0]
+    assert prioridad({}) == 0
+    assert 'urgente' in capsys.readouterr().out
+
+    historial = HistorialBusquedas(archivo=str(tmp_path / 'historial.json'))
+    exps = [{'numero': f'{i}/2025', 'juzgado': 'JUZGADO CIVIL CHETUMAL', 'prioridad': p}
+            for i, p in enumerate((None, 1, '2'))]
+    seleccionados, omitidos = planificar(exps, historial, historial.arranque + 1000, ahora=200)
+    assert [e['numero'] for e in seleccionados] == ['2/2025', '1/2025', '0/2025'] and not omitidos
+
+    # Duplicados con prioridad nula no rompen la fusión
+    validos, _, duplicados, _ = preparar_lote([
+        {'numero': '1/2025', 'juzgado': 'X', 'prioridad': None},
+        {'numero': '1/2025', 'juzgado': 'X', 'prioridad': '2'},
+    ], lambda nombre: 95)
+    assert duplicados == 1 and validos[0]['prioridad'] == '2'
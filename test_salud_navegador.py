@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del reciclaje del navegador en sesiones largas (driver simulado)
+"""
+
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import navegador
+from buscar_expedientes import TSJExpedientesBot
+from navegador import SaludNavegador, memoria_procesos_mb
+
+
+class DriverSimulado:
+    def __init__(self, pid=1234):
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=pid))
+        self.window_handles = ['p0', 'p1']
+        self.current_window_handle = 'p0'
+
+    def quit(self):
+        pass
+
+
+def test_limites_de_salud(monkeypatch):
+    memoria = {1234: 100}
+    monkeypatch.setattr(navegador, 'memoria_procesos_mb', lambda pid: memoria[pid])
+    salud = SaludNavegador(max_paginas=50, max_memoria_mb=500, max_errores=2, medir_memoria_cada=5)
+    driver = DriverSimulado()
+    for _ in range(10):
+        salud.registrar_pagina(driver)
+    assert salud.necesita_reciclar() is None
+
+    memoria[1234] = 800
+    for _ in range(5):
+        salud.registrar_pagina(driver)
+    assert 'memoria' in salud.necesita_reciclar()
+
+    salud.reiniciar()
+    salud.registrar_error()
+    salud.registrar_exito()
+    salud.registrar_error()
+    assert salud.necesita_reciclar() is None
+    salud.registrar_error()
+    assert 'errores' in salud.necesita_reciclar()
+
+
+def test_memoria_de_procesos_hijos():
+    if sys.platform != 'linux':
+        return  # Sin psutil solo se mide con /proc
+    # Un proceso hijo con 64 MB en uso, como un renderizador de Chrome
+    hijo = subprocess.Popen([sys.executable, '-c', 'import time; x = b"1" * (64 * 1024 * 1024); time.sleep(30)'])
+    try:
+        medida = None
+        for _ in range(100):
+            medida = memoria_procesos_mb(os.getpid())
+            if medida and medida >= 64:
+                break
+            time.sleep(0.05)
+        assert medida >= 64
+    finally:
+        hijo.kill()
+        hijo.wait()
+
+
+def test_driver_sin_proceso_propio():
+    assert SaludNavegador().medir_memoria(SimpleNamespace()) is None
+
+
+def test_reciclaje_reencola_busquedas_fallidas():
+    bot = TSJExpedientesBot(max_pestanas=2, limites_navegador={'max_errores': 2, 'max_paginas': 0})
+    bot.log = lambda *a, **k: None
+    bot.driver = DriverSimulado()
+    reinicios = []
+
+    def iniciar_navegador(medir=True):
+        reinicios.append(True)
+        bot.driver = DriverSimulado()
+        bot.salud.reiniciar()
+
+    def completar(pendiente):
+        # El navegador "se degrada" desde la 2ª búsqueda hasta que se reinicia;
+        # las que ya estaban cargando en otras pestañas también fallan
+        if pendiente['numero'] != '1/2025' and not pendiente['reinicios']:
+            return None
+        return {'busqueda': pendiente['numero'], 'publicaciones': []}
+
+    bot.iniciar_navegador = iniciar_navegador
+    bot.abrir_pestanas = lambda n: None
+    bot.iniciar_busqueda = lambda exp, pestana: {'numero': exp['numero'], 'reinicios': len(reinicios)}
+    bot.completar_busqueda = completar
+    avances = []
+    bot.al_completar = lambda exp, resultado, hechos, total: avances.append(hechos)
+
+    expedientes = [{'numero': f'{i}/2025', 'juzgado': 'X'} for i in range(1, 6)]
+    completados = bot.procesar_expedientes(expedientes)
+
+    assert len(reinicios) == 1
+    assert sorted(e['numero'] for e, r in completados) == [f'{i}/2025' for i in range(1, 6)]
+    assert all(r is not None for _, r in completados)
+    # Las búsquedas reencoladas no hacen retroceder el progreso
+    assert avances == sorted(avances) and avances[-1] == 5
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la verificación del catálogo contra sidebar.php (sin red)
+"""
+
+import csv
+import json
+import shutil
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import navegador
+import sincronizar_catalogo as s
+from buscar_expedientes import TSJExpedientesBot
+from catalogo_juzgados import ARCHIVO_FUENTE, obtener_catalogo
+
+
+def menu_del_catalogo():
+    """sidebar.php tal como lo describe el catálogo actual"""
+    return [{'id': j['id'], 'area_id': j['area_id'], 'nombre': j['nombre']} for j in obtener_catalogo().juzgados]
+
+
+def menu_modificado():
+    """Sala 179 renumerada a 190 (areaId 165), areaId de la 170 cambiado, 109 eliminado y uno nuevo"""
+    organos = []
+    for o in menu_del_catalogo():
+        if o['id'] == 109:
+            continue
+        if o['id'] == 179:
+            o = dict(o, id=190, area_id=165)
+        elif o['id'] == 170:
+            o = dict(o, area_id=199)
+        organos.append(o)
+    organos.append({'id': 250, 'area_id': None, 'nombre': 'JUZGADO NUEVO DE PRUEBA'})
+    return organos
+
+
+def test_sin_diferencias():
+    diferencias = s.comparar(obtener_catalogo(), menu_del_catalogo())
+    assert not s.hay_diferencias(diferencias)
+    assert diferencias['nuevos'] == []
+
+
+def test_detecta_renumerados_inexistentes_y_nuevos():
+    catalogo = obtener_catalogo()
+    diferencias = s.comparar(catalogo, menu_modificado())
+    assert diferencias['ids'] == {179: 190}
+    assert diferencias['area_ids'] == {190: 165, 170: 199}
+    assert diferencias['inexistentes'] == {109: catalogo.por_id[109]['nombre']}
+    assert [o['id'] for o in diferencias['nuevos']] == [250]
+    lineas = s.describir(diferencias, catalogo)
+    assert len(lineas) == 4
+    assert lineas[0].endswith('ID 179 → 190, areaId 154 → 165')
+
+
+def menu_intercambiado():
+    """La Sala 179 y el juzgado 109 intercambian IDs (la Sala conserva su areaId)"""
+    organos = []
+    for o in menu_del_catalogo():
+        if o['id'] == 179:
+            o = dict(o, id=109)
+        elif o['id'] == 109:
+            o = dict(o, id=179)
+        organos.append(o)
+    return organos
+
+
+def test_ids_intercambiados():
+    catalogo = obtener_catalogo()
+    diferencias = s.comparar(catalogo, menu_intercambiado())
+    assert diferencias['ids'] == {109: 179, 179: 109}
+    assert diferencias['inexistentes'] == {}
+    assert diferencias['nuevos'] == []
+
+    area_ids = s.area_ids_vigentes(catalogo, diferencias)
+    assert area_ids[109] == catalogo.area_id(179)
+    assert 179 not in area_ids  # Ahora es el juzgado: buscador_primera.php
+
+
+def test_id_con_otro_nombre_se_sigue_buscando():
+    catalogo = obtener_catalogo()
+    organos = [o if o['id'] != 109 else dict(o, nombre='Juzgado Primero Familiar de Cancún, Q. Roo')
+               for o in menu_del_catalogo()]
+    diferencias = s.comparar(catalogo, organos)
+    assert diferencias['nombres'] == {109: 'Juzgado Primero Familiar de Cancún, Q. Roo'}
+    assert diferencias['inexistentes'] == {}
+    assert diferencias['nuevos'] == []
+    assert s.describir(diferencias, catalogo)[0].startswith(f"📝 {catalogo.por_id[109]['nombre']} (ID 109)")
+
+
+def test_id_ocupado_por_otro_juzgado_del_catalogo():
+    """El juzgado 109 desaparece y la Sala 179 pasa a usar su ID"""
+    catalogo = obtener_catalogo()
+    organos = [dict(o, id=109) if o['id'] == 179 else o for o in menu_del_catalogo() if o['id'] != 109]
+    diferencias = s.comparar(catalogo, organos)
+    assert diferencias['ids'] == {179: 109}
+    assert diferencias['inexistentes'] == {109: catalogo.por_id[109]['nombre']}
+    assert diferencias['nombres'] == {}
+
+
+def menu_con_otros_nombres():
+    """Todos los IDs del catálogo, con nombres que difieren en la forma"""
+    return [dict(o, nombre=o['nombre'].title() + ' de Q. Roo') for o in menu_del_catalogo()]
+
+
+def test_menu_no_confiable():
+    assert s.comparar(obtener_catalogo(), menu_del_catalogo()[:5]) is None
+    # Con los IDs completos pero casi ningún nombre reconocible tampoco se compara
+    assert s.comparar(obtener_catalogo(), menu_con_otros_nombres()) is None
+
+
+def test_bot_no_descarta_nada_si_los_nombres_no_coinciden(monkeypatch):
+    monkeypatch.setattr(s, 'obtener_sidebar', lambda: (menu_con_otros_nombres(), '2025-03-01T09:00:00'))
+    bot = TSJExpedientesBot()
+    bot.log = lambda *a, **k: None
+    catalogo = obtener_catalogo()
+
+    validos = bot.preparar_expedientes([
+        {'numero': f'{i}/2025', 'juzgado': j['nombre']} for i, j in enumerate(catalogo.juzgados[:10], 1)
+    ])
+    assert len(validos) == 10
+    assert bot.ids_inexistentes == {}
+
+
+def test_cache_diaria(tmp_path):
+    archivo = str(tmp_path / 'sidebar.json')
+    html = '<a href="buscador_primera.php?int=109&metodo=1">JUZGADO PRIMERO FAMILIAR ORAL CANCUN</a>'
+    descargas = []
+
+    def descargar(url):
+        descargas.append(url)
+        return html
+
+    ahora = datetime(2025, 3, 1, 9, 0)
+    organos, _ = s.obtener_sidebar(archivo, descargar=descargar, ahora=ahora)
+    assert organos == [{'id': 109, 'area_id': None, 'nombre': 'JUZGADO PRIMERO FAMILIAR ORAL CANCUN'}]
+    s.obtener_sidebar(archivo, descargar=descargar, ahora=ahora + timedelta(hours=20))
+    assert len(descargas) == 1
+    s.obtener_sidebar(archivo, descargar=descargar, ahora=ahora + timedelta(hours=25))
+    assert len(descargas) == 2
+
+    # Si la descarga falla se usa la copia vencida
+    def falla(url):
+        raise OSError('sin red')
+
+    organos, fecha = s.obtener_sidebar(archivo, descargar=falla, ahora=ahora + timedelta(days=3))
+    assert organos[0]['id'] == 109
+    with open(archivo, encoding='utf-8') as f:
+        assert json.load(f)['fecha'] == fecha
+
+
+def test_aplicar_en_csv(tmp_path):
+    archivo = str(tmp_path / 'catalogo.csv')
+    shutil.copy(ARCHIVO_FUENTE, archivo)
+    diferencias = s.comparar(obtener_catalogo(), menu_modificado())
+    assert s.aplicar(diferencias, archivo) == 2
+
+    with open(archivo, encoding='utf-8', newline='') as f:
+        filas = {int(fila['id']): fila for fila in csv.DictReader(f)}
+    assert 179 not in filas and filas[190]['area_id'] == '165'
+    assert filas[170]['area_id'] == '199'
+    assert 109 in filas  # Los inexistentes se dejan para revisión manual
+    assert s.aplicar(diferencias, archivo) == 0
+
+
+def test_bot_omite_ids_inexistentes_y_usa_los_renumerados(monkeypatch):
+    monkeypatch.setattr(s, 'obtener_sidebar', lambda: (menu_modificado(), '2025-03-01T09:00:00'))
+    bot = TSJExpedientesBot()
+    bot.log = lambda *a, **k: None
+    catalogo = obtener_catalogo()
+
+    validos = bot.preparar_expedientes([
+        {'numero': '1/2025', 'juzgado': catalogo.por_id[109]['nombre']},
+        {'numero': '2/2025', 'juzgado': catalogo.por_id[179]['nombre']},
+        {'numero': '3/2025', 'juzgado': catalogo.por_id[170]['nombre']},
+    ])
+    assert [e['id_juzgado'] for e in validos] == [190, 170]
+    assert '&int=190&areaId=165' in bot.construir_url_busqueda(190, '2/2025')
+    assert '&areaId=199' in bot.construir_url_busqueda(170, '3/2025')
+    # El mapeo compartido de la clase no cambia
+    assert TSJExpedientesBot.AREA_IDS_SALAS[170] == catalogo.area_id(170)
+
+
+def test_bot_aplica_el_intercambio_una_sola_vez(monkeypatch):
+    monkeypatch.setattr(s, 'obtener_sidebar', lambda: (menu_intercambiado(), '2025-03-01T09:00:00'))
+    bot = TSJExpedientesBot()
+    bot.log = lambda *a, **k: None
+    bot.driver = SimpleNamespace(window_handles=['p0'], switch_to=SimpleNamespace(window=lambda handle: None))
+    monkeypatch.setattr(navegador, 'navegar_sin_esperar', lambda driver, url: None)
+    catalogo = obtener_catalogo()
+
+    validos = bot.preparar_expedientes([
+        {'numero': '1/2025', 'juzgado': catalogo.por_id[109]['nombre']},
+        {'numero': '2/2025', 'juzgado': catalogo.por_id[179]['nombre']},
+    ])
+    assert [e['id_juzgado'] for e in validos] == [179, 109]
+
+    urls = [bot.iniciar_busqueda(exp, 0)['url'] for exp in validos]
+    assert 'buscador_primera.php?int=179&' in urls[0]
+    assert f'&int=109&areaId={catalogo.area_id(179)}' in urls[1]
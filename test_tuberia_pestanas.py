@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la navegación en tubería entre pestañas (sin abrir el navegador)
+"""
+
+import time
+
+from buscar_expedientes import TSJExpedientesBot
+import navegador
+
+
+class DriverSimulado:
+    """Pestañas que tardan `carga` segundos en terminar cada navegación"""
+
+    def __init__(self, pestanas, carga):
+        self.window_handles = [f'p{i}' for i in range(pestanas)]
+        self.current_window_handle = 'p0'
+        self.carga = carga
+        self.listas = {}  # pestaña -> momento en que termina su carga
+        self.eventos = []  # ('lanzar' | 'lista', pestaña)
+        self.switch_to = self
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def execute_script(self, script, *args):
+        pestana = self.current_window_handle
+        if 'location.href' in script:
+            assert self.listas.get(pestana, 0) <= time.time(), "dos peticiones en la misma pestaña"
+            self.eventos.append(('lanzar', pestana))
+            self.listas[pestana] = time.time() + self.carga
+            return None
+        lista = time.time() >= self.listas[pestana]
+        if lista:
+            self.eventos.append(('lista', pestana))
+        return lista
+
+
+def test_cada_pestana_tiene_una_peticion_en_curso():
+    bot = TSJExpedientesBot(max_pestanas=4, limites_navegador={'max_paginas': 0})
+    bot.log = lambda *a, **k: None
+    bot.abrir_pestanas = lambda n: None
+    bot.driver = DriverSimulado(4, carga=0.05)
+    bot.captura.cuerpo = lambda driver, url: '<p>No se encontraron resultados</p>'
+
+    expedientes = [{'numero': f'{i}/2025', 'juzgado': 'X', 'id_juzgado': 109} for i in range(12)]
+    inicio = time.time()
+    completados = bot.procesar_expedientes(expedientes)
+    transcurrido = time.time() - inicio
+
+    assert [e['numero'] for e, r in completados] == [e['numero'] for e in expedientes]
+    assert all(r is not None for _, r in completados)
+    # Las cuatro primeras se lanzan antes de esperar a ninguna; después, cada
+    # pestaña que termina recibe la siguiente antes de pasar a la que sigue
+    eventos = bot.driver.eventos
+    assert eventos[:4] == [('lanzar', 'p0'), ('lanzar', 'p1'), ('lanzar', 'p2'), ('lanzar', 'p3')]
+    assert eventos[4:10] == [('lista', 'p0'), ('lanzar', 'p0'), ('lista', 'p1'), ('lanzar', 'p1'),
+                             ('lista', 'p2'), ('lanzar', 'p2')]
+    # 12 búsquedas de 50 ms en 4 pestañas: unas 3 cargas, no 12
+    assert transcurrido < 12 * 0.05
+
+
+def test_esperar_carga_agota_tiempo():
+    driver = DriverSimulado(1, carga=10)
+    navegador.navegar_sin_esperar(driver, 'https://x/buscador_primera.php')
+    assert navegador.esperar_carga(driver, timeout=0.05, intervalo=0.01) is False
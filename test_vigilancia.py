@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del programador y del ciclo del modo vigilancia (sin navegador)
+"""
+
+import json
+import os
+import threading
+
+import vigilancia
+from vigilancia import ProgramadorVigilancia, clave_expediente, INTERVALO_INICIAL
+
+
+def _resultado(*ids):
+    return {'publicaciones': [{'id_acuerdo': i, 'es_nuevo': False} for i in ids]}
+
+
+def test_intervalos_adaptativos(tmp_path):
+    prog = ProgramadorVigilancia(archivo=str(tmp_path / 'estado.json'))
+    activo = {'numero': '2358/2025', 'juzgado': 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'}
+    inactivo = {'numero': '1430/2022', 'juzgado': 'JUZGADO PRIMERO FAMILIAR ORAL CANCUN'}
+    prog.sincronizar([activo, inactivo], ahora=0)
+
+    assert len(prog.vencidos(ahora=0)) == 2
+    prog.registrar(activo, _resultado('1'), ahora=0)
+    prog.registrar(inactivo, _resultado('9'), ahora=0)
+
+    # Aparece un acuerdo nuevo solo en el expediente activo
+    t = INTERVALO_INICIAL * 2
+    assert sorted(e['numero'] for e in prog.vencidos(ahora=t)) == ['1430/2022', '2358/2025']
+    assert len(prog.registrar(activo, _resultado('1', '2'), ahora=t)) == 1
+    assert prog.registrar(inactivo, _resultado('9'), ahora=t) == []
+
+    estado = prog.estado
+    assert estado[clave_expediente(activo)]['intervalo'] < estado[clave_expediente(inactivo)]['intervalo']
+    assert prog.proxima_revision() == estado[clave_expediente(activo)]['proxima_revision']
+
+
+def test_sincronizar_descarta_eliminados(tmp_path):
+    prog = ProgramadorVigilancia(archivo=str(tmp_path / 'estado.json'))
+    exp = {'nombre': 'samanta', 'juzgado': 'JUZGADO FAMILIAR ORAL PLAYA'}
+    prog.sincronizar([exp], ahora=0)
+    prog.sincronizar([], ahora=0)
+    assert prog.estado == {}
+    assert prog.proxima_revision() is None
+
+
+class BotSimulado:
+    def __init__(self):
+        self.lotes = []
+
+    def log(self, *args, **kwargs):
+        pass
+
+    def cargar_expedientes_json(self, archivo):
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return json.load(f)['expedientes']
+
+    def preparar_expedientes(self, expedientes):
+        return expedientes
+
+    def procesar_expedientes(self, expedientes):
+        self.lotes.append([e['numero'] for e in expedientes])
+        return [(e, _resultado()) for e in expedientes]
+
+    def guardar_historial(self):
+        pass
+
+
+def test_vigilar_recarga_el_archivo_durante_la_espera(tmp_path, monkeypatch):
+    archivo = tmp_path / 'expedientes.json'
+    juzgado = 'JUZGADO SEGUNDO FAMILIAR ORAL CANCUN'
+    archivo.write_text(json.dumps({'expedientes': [{'numero': '1/2025', 'juzgado': juzgado}]}), encoding='utf-8')
+    detener = threading.Event()
+    esperas = []
+
+    def dormir(segundos):
+        # Primer tramo de la espera (~2 h): el usuario agrega un expediente; después, se detiene
+        esperas.append(segundos)
+        if len(esperas) == 1:
+            archivo.write_text(json.dumps({'expedientes': [{'numero': '1/2025', 'juzgado': juzgado},
+                                                           {'numero': '2/2025', 'juzgado': juzgado}]}),
+                               encoding='utf-8')
+            mtime = os.stat(archivo).st_mtime_ns + 10**9
+            os.utime(archivo, ns=(mtime, mtime))
+        else:
+            detener.set()
+
+    monkeypatch.setattr(vigilancia.time, 'sleep', dormir)
+    bot = BotSimulado()
+    vigilancia.vigilar(bot, str(archivo), ProgramadorVigilancia(archivo=str(tmp_path / 'estado.json')), detener)
+
+    assert bot.lotes == [['1/2025'], ['2/2025']]
+    assert esperas[0] == vigilancia.TRAMO_ESPERA
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo vigilancia: revisión continua de expedientes con intervalos adaptativos
+
+Cada expediente tiene su propio intervalo de revisión dentro de una cola de
+prioridad ordenada por próxima revisión:
+- Si aparecen acuerdos nuevos, el intervalo se acorta (mínimo 30 minutos)
+- Si no hay cambios, el intervalo se alarga (máximo 24 horas)
+
+Así el número de consultas sigue a la actividad de los expedientes y no al
+tamaño de la cartera.
+"""
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime
+
+from persistencia import escribir_json_atomico
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_ESTADO = os.path.join(SCRIPT_DIR, 'estado_vigilancia.json')
+
+INTERVALO_MIN = 30 * 60          # Expedientes activos: cada 30 minutos
+INTERVALO_MAX = 24 * 60 * 60     # Expedientes inactivos: una vez al día
+INTERVALO_INICIAL = 2 * 60 * 60
+FACTOR_ACTIVO = 0.5              # Con novedades: el intervalo se reduce a la mitad
+FACTOR_INACTIVO = 1.5            # Sin novedades: el intervalo crece 50%
+TRAMO_ESPERA = 30                # Segundos entre revisiones de Ctrl+C, `detener` y cambios en el archivo
+
+
+def clave_expediente(exp):
+    """
+    Clave única de un expediente: tipo de búsqueda, término y juzgado
+
+    Ejemplo: "numero:615/2019|NOVENA SALA PENAL ORAL"
+    """
+    if 'numero' in exp:
+        tipo, termino = 'numero', exp['numero']
+    else:
+        tipo, termino = 'nombre', exp.get('nombre', '')
+    return f"{tipo}:{str(termino).strip().upper()}|{str(exp.get('juzgado', '')).strip().upper()}"
+
+
+class ProgramadorVigilancia:
+    """Cola de prioridad de expedientes con intervalos de revisión adaptativos"""
+
+    def __init__(self, archivo=ARCHIVO_ESTADO, intervalo_min=INTERVALO_MIN, intervalo_max=INTERVALO_MAX):
+        self.archivo = archivo
+        self.intervalo_min = intervalo_min
+        self.intervalo_max = intervalo_max
+        self.estado = {}        # clave -> datos de programación
+        self.expedientes = {}   # clave -> expediente
+        self.cola = []          # heap de (proxima_revision, clave)
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo):
+                with open(self.archivo, 'r', encoding='utf-8') as f:
+                    self.estado = json.load(f).get('expedientes', {})
+        except Exception as e:
+            print(f"⚠️  Error cargando estado de vigilancia: {e}")
+            self.estado = {}
+
+    def guardar(self):
+        try:
+            escribir_json_atomico(self.archivo, {'version': 1, 'expedientes': self.estado})
+        except Exception as e:
+            print(f"⚠️  Error guardando estado de vigilancia: {e}")
+
+    def sincronizar(self, expedientes, ahora=None):
+        """
+        Actualiza la cola con la lista vigente de expedientes
+
+        Los expedientes nuevos se programan de inmediato; los que ya no están
+        en la lista se descartan.
+        """
+        ahora = ahora if ahora is not None else time.time()
+        vigentes = {clave_expediente(exp): exp for exp in expedientes}
+
+        for clave in list(self.estado):
+            if clave not in vigentes:
+                del self.estado[clave]
+
+        for clave in vigentes:
+            if clave not in self.estado:
+                self.estado[clave] = {
+                    'intervalo': INTERVALO_INICIAL,
+                    'proxima_revision': ahora,
+                    'ultima_revision': None,
+                    'ultima_novedad': None,
+                    'acuerdos': [],
+                }
+
+        self.expedientes = vigentes
+        self.cola = [(datos['proxima_revision'], clave) for clave, datos in self.estado.items()]
+        heapq.heapify(self.cola)
+
+    def proxima_revision(self):
+        """Timestamp de la próxima revisión programada (None si la cola está vacía)"""
+        while self.cola:
+            proxima, clave = self.cola[0]
+            datos = self.estado.get(clave)
+            if datos is not None and datos['proxima_revision'] == proxima:
+                return proxima
+            heapq.heappop(self.cola)  # Entrada obsoleta
+        return None
+
+    def vencidos(self, ahora=None, limite=None):
+        """Extrae de la cola los expedientes cuya revisión ya venció"""
+        ahora = ahora if ahora is not None else time.time()
+        lista = []
+        while limite is None or len(lista) < limite:
+            proxima = self.proxima_revision()
+            if proxima is None or proxima > ahora:
+                break
+            _, clave = heapq.heappop(self.cola)
+            lista.append(self.expedientes[clave])
+        return lista
+
+    def registrar(self, exp, resultado, ahora=None):
+        """
+        Registra el resultado de una revisión y reprograma el expediente
+
+        Returns:
+            Lista de publicaciones nuevas (no vistas en revisiones anteriores)
+        """
+        ahora = ahora if ahora is not None else time.time()
+        clave = clave_expediente(exp)
+        datos = self.estado.get(clave)
+        if datos is None:
+            return []
+
+        if resultado is None:
+            # Error en la búsqueda: reintentar pronto sin alterar el intervalo
+            self._programar(clave, ahora + self.intervalo_min)
+            return []
+
+        vistos = set(datos['acuerdos'])
+        nuevas = [
+            p for p in resultado.get('publicaciones', [])
+            if self._id_publicacion(p) not in vistos
+        ]
+        datos['acuerdos'] = sorted(vistos | {self._id_publicacion(p) for p in nuevas})
+
+        # En la primera revisión todo es "no visto"; solo cuentan los acuerdos recientes
+        if datos['ultima_revision'] is None:
+            nuevas = [p for p in nuevas if p.get('es_nuevo')]
+
+        if nuevas:
+            datos['intervalo'] = max(self.intervalo_min, datos['intervalo'] * FACTOR_ACTIVO)
+            datos['ultima_novedad'] = ahora
+        else:
+            datos['intervalo'] = min(self.intervalo_max, datos['intervalo'] * FACTOR_INACTIVO)
+
+        datos['ultima_revision'] = ahora
+        self._programar(clave, ahora + datos['intervalo'])
+        return nuevas
+
+    def _programar(self, clave, proxima):
+        self.estado[clave]['proxima_revision'] = proxima
+        heapq.heappush(self.cola, (proxima, clave))
+
+    @staticmethod
+    def _id_publicacion(publicacion):
+        return publicacion.get('id_acuerdo') or f"{publicacion.get('fecha_publicacion', '')}|{publicacion.get('documento', '')}"
+
+
+def _huella_archivo(ruta):
+    """(mtime en ns, tamaño) del archivo, o None si no existe"""
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def vigilar(bot, archivo_expedientes, programador=None, detener=None):
+    """
+    Ciclo de vigilancia continua
+
+    Recarga la lista de expedientes en cada ciclo, procesa solo los vencidos y
+    duerme hasta la siguiente revisión programada. Si el archivo de expedientes
+    cambia durante la espera, se recarga en ese momento (los expedientes nuevos
+    se revisan de inmediato). Termina con Ctrl+C o cuando se activa el
+    threading.Event `detener`.
+    """
+    programador = programador or ProgramadorVigilancia()
+    bot.log(f"👁️  Modo vigilancia iniciado ({len(programador.estado)} expedientes con historial)")
+
+    try:
+        while detener is None or not detener.is_set():
+            huella = _huella_archivo(archivo_expedientes)
+            expedientes = bot.preparar_expedientes(bot.cargar_expedientes_json(archivo_expedientes))
+            programador.sincronizar(expedientes)
+            vencidos = programador.vencidos()
+
+            if vencidos:
+                bot.resultados = []
+                bot.duraciones = []
+                procesados = bot.procesar_expedientes(vencidos)
+
+                novedades = 0
+                for exp, resultado in procesados:
+                    nuevas = programador.registrar(exp, resultado)
+                    if nuevas:
+                        novedades += len(nuevas)
+                        termino = exp.get('numero', exp.get('nombre', 'N/A'))
+                        bot.log(f"⭐ {len(nuevas)} acuerdos nuevos: {termino} ({exp.get('juzgado')})", "OK")
+                programador.guardar()
+                bot.guardar_historial()
+
+                if novedades:
+                    marca = datetime.now().strftime('%Y%m%d_%H%M')
+                    bot.guardar_excel(f'resultados_vigilancia_{marca}.xlsx')
+
+            proxima = programador.proxima_revision()
+            if proxima is None:
+                bot.log("No hay expedientes para vigilar", "WARN")
+                espera = 60
+            else:
+                espera = max(0, proxima - time.time())
+                bot.log(f"💤 Próxima revisión: {datetime.fromtimestamp(proxima).strftime('%H:%M:%S')}")
+
+            # Dormir en tramos cortos para responder a Ctrl+C, a `detener` y a cambios en el archivo
+            fin = time.time() + espera
+            while time.time() < fin and (detener is None or not detener.is_set()):
+                time.sleep(min(TRAMO_ESPERA, max(0, fin - time.time())))
+                if _huella_archivo(archivo_expedientes) != huella:
+                    bot.log(f"📝 {os.path.basename(archivo_expedientes)} cambió; se recarga la lista")
+                    break
+
+    except KeyboardInterrupt:
+        bot.log("Vigilancia detenida por el usuario", "WARN")
+    finally:
+        programador.guardar()